@@ -0,0 +1,58 @@
+"""tz.datetime_ambiguous loop versus one-pass ambiguity detection.
+
+Usage: python benchmarks/bench_ambiguity.py [n_values]
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from dateutil import tz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetools.ambiguity import find_wall_time_problems  # noqa: E402
+
+
+def main(n):
+    rng = np.random.default_rng(0)
+    # 2017-2018, with a share of rows packed into the repeated and skipped
+    # hours so both masks have something to find
+    wall = rng.integers(1483228800, 1546300800, size=n)
+    wall[::50] = rng.integers(1509843600, 1509847200, size=len(wall[::50]))
+    wall[1::50] = rng.integers(1489284000, 1489287600, size=len(wall[1::50]))
+    et = tz.gettz('America/New_York')
+    epoch = datetime(1970, 1, 1)
+    dts = [(epoch + timedelta(seconds=s)).replace(tzinfo=et)
+           for s in wall.tolist()]
+
+    t0 = time.perf_counter()
+    ambiguous = [tz.datetime_ambiguous(d) for d in dts]
+    missing = [not tz.datetime_exists(d) for d in dts]
+    t_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    found = find_wall_time_problems(wall, 'America/New_York')
+    t_bulk = time.perf_counter() - t0
+
+    assert found.ambiguous.tolist() == ambiguous
+    assert found.nonexistent.tolist() == missing
+    # pandas hands out datetime64[ns]; it must not be read as ns integers
+    as_ns = find_wall_time_problems(wall.astype('datetime64[s]')
+                                    .astype('datetime64[ns]'),
+                                    'America/New_York')
+    assert (as_ns.ambiguous == found.ambiguous).all()
+    assert (as_ns.nonexistent == found.nonexistent).all()
+
+    print("values:                    {:>12,}".format(n))
+    print("ambiguous:                 {:>12,}".format(len(found.ambiguous_index)))
+    print("nonexistent:               {:>12,}".format(
+        len(found.nonexistent_index)))
+    print("datetime_ambiguous/exists: {:>10.3f} s".format(t_loop))
+    print("find_wall_time_problems(): {:>10.3f} s".format(t_bulk))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,60 @@
+"""Per-object calendar attributes versus calendar_fields() on ordinals.
+
+Usage: python benchmarks/bench_buckets.py [n_dates]
+"""
+
+import os
+import sys
+import time
+from datetime import date
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetools.buckets import calendar_fields, calendar_histogram  # noqa: E402
+
+
+def loop_fields(dates):
+    rows = []
+    for d in dates:
+        iso_year, iso_week, _ = d.isocalendar()
+        rows.append((d.year, d.month, d.day, d.weekday(),
+                     d.timetuple().tm_yday, iso_year, iso_week))
+    return rows
+
+
+def main(n):
+    rng = np.random.default_rng(0)
+    ordinals = rng.integers(date(1950, 1, 1).toordinal(),
+                            date(2050, 1, 1).toordinal(),
+                            size=n).astype(np.int32)
+
+    t0 = time.perf_counter()
+    dates = [date.fromordinal(o) for o in ordinals.tolist()]
+    expected = loop_fields(dates)
+    t_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    fields = calendar_fields(ordinals)
+    t_bulk = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    labels, counts = calendar_histogram(ordinals, 'month')
+    t_hist = time.perf_counter() - t0
+
+    got = list(zip(*(fields[name].tolist() for name in
+                     ('year', 'month', 'day', 'weekday', 'day_of_year',
+                      'iso_year', 'iso_week'))))
+    assert got == expected
+    assert counts.tolist() == [sum(1 for r in expected if r[1] == m)
+                               for m in labels.tolist()]
+
+    print("dates:                     {:>12,}".format(n))
+    print("fromordinal + attributes:  {:>10.3f} s".format(t_loop))
+    print("calendar_fields():         {:>10.3f} s".format(t_bulk))
+    print("calendar_histogram(month): {:>10.3f} s".format(t_hist))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
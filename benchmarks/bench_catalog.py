@@ -0,0 +1,58 @@
+"""Startup cost of pickle.load versus open_catalog.
+
+Usage: python benchmarks/bench_catalog.py [n_dates ...]
+"""
+
+import os
+import pickle
+import sys
+import tempfile
+import time
+from datetime import date
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetools.catalog import convert_pickle, open_catalog  # noqa: E402
+
+
+def best_of(func, repeat=5):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main(sizes):
+    rng = np.random.default_rng(0)
+    first = date(1950, 1, 1).toordinal()
+    print("{:>12}  {:>12}  {:>12}  {:>12}".format(
+        'dates', 'pickle.load', 'open_catalog', 'file bytes'))
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            dates = [date.fromordinal(int(o))
+                     for o in rng.integers(first, first + 68 * 365, size=n)]
+            pkl = os.path.join(tmp, 'dates.pkl')
+            cat = os.path.join(tmp, 'dates.dtcat')
+            with open(pkl, 'wb') as f:
+                pickle.dump(dates, f)
+            convert_pickle(pkl, cat)
+
+            def load_pickle():
+                with open(pkl, 'rb') as f:
+                    return pickle.load(f)
+
+            def load_catalog():
+                with open_catalog(cat) as catalog:
+                    return len(catalog)
+
+            print("{:>12,}  {:>10.4f} s  {:>10.6f} s  {:>12,}".format(
+                n, best_of(load_pickle), best_of(load_catalog),
+                os.path.getsize(cat)))
+
+
+if __name__ == '__main__':
+    main([int(a) for a in sys.argv[1:]] or [235, 100000, 10000000])
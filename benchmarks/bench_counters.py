@@ -0,0 +1,86 @@
+"""Recounting hurricanes_each_month versus updating a CalendarCounter.
+
+Usage: python benchmarks/bench_counters.py [n_dates]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import date
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetools.counters import CalendarCounter  # noqa: E402
+
+
+def loop_counts(dates):
+    hurricanes_each_month = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0,
+                             7: 0, 8: 0, 9: 0, 10: 0, 11: 0, 12: 0}
+    early_hurricanes = 0
+    for hurricane in dates:
+        hurricanes_each_month[hurricane.month] += 1
+        if hurricane.month < 6:
+            early_hurricanes += 1
+    return hurricanes_each_month, early_hurricanes
+
+
+def check_merge_and_state(ordinals, dates, counter):
+    # Two halves counted apart, saved, loaded and merged give the same
+    # counts as one pass over every date
+    half = len(ordinals) // 2
+    first = CalendarCounter().update(ordinals[:half])
+    second = CalendarCounter().update(ordinals[half:])
+    second.update(dates[len(ordinals):])
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, name) for name in ('a.json', 'b.json')]
+        first.save(paths[0])
+        second.save(paths[1])
+        merged = CalendarCounter.load(paths[0]).merge(
+            CalendarCounter.load(paths[1]))
+    assert merged.total == counter.total == len(dates)
+    assert merged.months() == counter.months()
+    assert merged.years() == counter.years() == dict(
+        sorted(Counter(d.year for d in dates).items()))
+    days = np.zeros(367, dtype=np.int64)
+    for d in dates:
+        days[d.timetuple().tm_yday] += 1
+    assert np.array_equal(merged.days_of_year(), days)
+    assert np.array_equal(counter.days_of_year(), days)
+    assert (first + second).to_dict() == merged.to_dict()
+
+
+def main(n):
+    rng = np.random.default_rng(0)
+    first = date(1918, 1, 1).toordinal()
+    ordinals = np.sort(rng.integers(first, first + 36500, size=n))
+    dates = [date.fromordinal(o) for o in ordinals.tolist()]
+    new_day = [date(2018, 1, 2)] * 5
+
+    t0 = time.perf_counter()
+    counter = CalendarCounter().update(ordinals)
+    t_build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    expected = loop_counts(dates + new_day)
+    t_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    counter.update(new_day)
+    t_add = time.perf_counter() - t0
+
+    assert counter.months() == expected[0]
+    assert counter.before_month(6) == expected[1]
+    check_merge_and_state(ordinals, dates + new_day, counter)
+
+    print("dates:                     {:>12,}".format(n))
+    print("full recount loop:         {:>10.3f} s".format(t_loop))
+    print("CalendarCounter build:     {:>10.3f} s".format(t_build))
+    print("add one day's events:      {:>10.6f} s".format(t_add))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
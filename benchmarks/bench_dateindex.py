@@ -0,0 +1,68 @@
+"""Full scans of a date list versus DateIndex range queries.
+
+Usage: python benchmarks/bench_dateindex.py [n_dates] [n_queries]
+"""
+
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetools.dateindex import DateIndex  # noqa: E402
+
+
+def main(n, n_queries):
+    rng = np.random.default_rng(0)
+    first = date(1850, 1, 1).toordinal()
+    ordinals = rng.integers(first, first + 60000, size=n)
+    florida_hurricane_dates = [date.fromordinal(o) for o in ordinals.tolist()]
+    starts = rng.integers(first, first + 60000, size=n_queries)
+    stops = starts + rng.integers(1, 3650, size=n_queries)
+    windows = [(date.fromordinal(a), date.fromordinal(b))
+               for a, b in zip(starts.tolist(), stops.tolist())]
+
+    t0 = time.perf_counter()
+    expected = [sum(1 for d in florida_hurricane_dates if a <= d < b)
+                for a, b in windows]
+    early = sum(1 for d in florida_hurricane_dates if d.month < 6)
+    first_last = min(florida_hurricane_dates), max(florida_hurricane_dates)
+    t_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    index = DateIndex(ordinals)
+    t_build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    counts = [index.count_between(a, b) for a, b in windows]
+    t_single = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    bulk = index.count_between(starts, stops)
+    t_bulk = time.perf_counter() - t0
+
+    assert counts == expected == bulk.tolist()
+    assert index.count_season((1, 1), (6, 1)) == early
+    # A batch of seasons, one wrapping around the new year
+    months = np.array([1, 3, 11])
+    seasons = index.count_season((months, 1), ((months + 1) % 12 + 1, 1))
+    assert seasons.tolist() == [
+        sum(1 for d in florida_hurricane_dates
+            if (d.month - m) % 12 < 2) for m in months.tolist()]
+    assert (index.first(), index.last()) == first_last
+    assert index.nearest(first_last[0] - timedelta(days=1)) == first_last[0]
+
+    print("dates / queries:           {:>12,} / {:,}".format(n, n_queries))
+    print("scans of the list:         {:>10.3f} s".format(t_loop))
+    print("DateIndex build:           {:>10.3f} s".format(t_build))
+    print("count_between() each:      {:>10.3f} s  ({:,.0f} queries/s)".format(
+        t_single, n_queries / t_single))
+    print("count_between() batch:     {:>10.3f} s".format(t_bulk))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 200)
@@ -0,0 +1,75 @@
+"""The notebook's enfold/astimezone loop versus trip_durations().
+
+Usage: python benchmarks/bench_durations.py [n_trips]
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from dateutil import tz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetools.durations import trip_durations  # noqa: E402
+
+# 2017-11-05 01:00 wall time, the start of the repeated hour in Washington
+FALL_BACK = 1509843600
+
+
+def make_trips(n, seed=0):
+    """October-December 2017 trips, like capital_onebike.csv, with some
+    packed around the fall-back change."""
+    rng = np.random.default_rng(seed)
+    start = np.sort(rng.integers(1506816000, 1514764800, size=n))
+    end = start + rng.integers(60, 7200, size=n)
+    near = np.arange(0, n, 100)
+    start[near] = FALL_BACK + rng.integers(-1800, 3600, size=len(near))
+    end[near] = start[near] + rng.integers(60, 3600, size=len(near))
+    # Trips that cross back into the repeated hour, as in the sample data
+    cross = near[(start[near] >= FALL_BACK) & (end[near] >= FALL_BACK + 3600)]
+    end[cross] -= 3600
+    return start, end
+
+
+def loop_durations(start, end):
+    et = tz.gettz('America/New_York')
+    epoch = datetime(1970, 1, 1)
+    trip_durations = []
+    for s, e in zip(start.tolist(), end.tolist()):
+        trip = {'start': (epoch + timedelta(seconds=s)).replace(tzinfo=et),
+                'end': (epoch + timedelta(seconds=e)).replace(tzinfo=et)}
+        if trip['start'] > trip['end']:
+            trip['end'] = tz.enfold(trip['end'])
+        start_utc = trip['start'].astimezone(tz.UTC)
+        end_utc = trip['end'].astimezone(tz.UTC)
+        trip_durations.append((end_utc - start_utc).total_seconds())
+    return trip_durations
+
+
+def main(n):
+    start, end = make_trips(n)
+
+    t0 = time.perf_counter()
+    expected = loop_durations(start, end)
+    t_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    result = trip_durations(start, end, 'America/New_York')
+    t_bulk = time.perf_counter() - t0
+
+    assert result.duration.tolist() == expected
+
+    print("trips:                     {:>12,}".format(n))
+    print("ambiguous / invalid:       {:>12,} / {:,}".format(
+        int(result.ambiguous.sum()), int(result.invalid.sum())))
+    print("shortest trip:             {:>12,} s".format(
+        int(result.duration.min())))
+    print("enfold/astimezone loop:    {:>10.3f} s".format(t_loop))
+    print("trip_durations():          {:>10.3f} s".format(t_bulk))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
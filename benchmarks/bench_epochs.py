@@ -0,0 +1,64 @@
+"""datetime.fromtimestamp(ts, tz) loop versus epochs_to_local.
+
+Usage: python benchmarks/bench_epochs.py [n_epochs] [zone]
+"""
+
+import os
+import sys
+import pickle
+import time
+import zoneinfo
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from dateutil import tz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetools.epochs import epochs_to_local, fromtimestamps  # noqa: E402
+from datetools.zones import compile_zone  # noqa: E402
+
+
+def check_fromtimestamps():
+    """Fixed offsets keep their offset even when their name (from
+    ``tzname()``) is also a tzdata zone with DST."""
+    ts = 1500000000   # 2017-07-14, summer time in Europe
+    for name in ('CET', 'EET', 'EST5EDT'):
+        fixed = timezone(timedelta(hours=1), name)
+        got, = fromtimestamps([ts], fixed)
+        assert got == datetime.fromtimestamp(ts, fixed)
+        assert got.utcoffset() == timedelta(hours=1)
+    got, = fromtimestamps([ts], 'CET')
+    assert got.tzinfo == zoneinfo.ZoneInfo('CET')
+    assert got.utcoffset() == timedelta(hours=2)
+    table = pickle.loads(pickle.dumps(compile_zone('Europe/Paris')))
+    assert table.key == 'Europe/Paris'
+
+
+def main(n, zone):
+    rng = np.random.default_rng(0)
+    epochs = rng.integers(1483228800, 1546300800, size=n)
+    dtz = tz.gettz(zone)
+
+    t0 = time.perf_counter()
+    expected = [datetime.fromtimestamp(ts, dtz) for ts in epochs.tolist()]
+    t_loop = time.perf_counter() - t0
+
+    compile_zone(zone)
+    t0 = time.perf_counter()
+    local = epochs_to_local(epochs, zone)
+    t_bulk = time.perf_counter() - t0
+
+    wall = local.wall.astype('datetime64[s]').astype(object).tolist()
+    assert wall == [d.replace(tzinfo=None) for d in expected]
+    check_fromtimestamps()
+
+    print("epochs:                  {:>12,}  ({})".format(n, zone))
+    print("fromtimestamp loop:      {:>10.3f} s".format(t_loop))
+    print("epochs_to_local:         {:>10.3f} s  ({:,.0f} epochs/s)".format(
+        t_bulk, n / t_bulk))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000,
+         sys.argv[2] if len(sys.argv) > 2 else 'America/New_York')
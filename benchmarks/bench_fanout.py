@@ -0,0 +1,77 @@
+"""Rendering one column in many zones: ``fan_out`` against one
+``to_local`` / ``abbreviations`` lookup per zone and, on a sample, the
+notebook's ``astimezone`` loop.
+
+Usage: python benchmarks/bench_fanout.py [n_values] [n_zones]
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+from dateutil import tz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetools.fanout import fan_out  # noqa: E402
+from datetools.zones import compile_zone  # noqa: E402
+
+ZONES = ['Europe/London', 'Asia/Kolkata', 'Pacific/Apia', 'America/New_York',
+         'America/Chicago', 'America/Denver', 'America/Los_Angeles',
+         'America/Sao_Paulo', 'Europe/Paris', 'Europe/Berlin', 'Africa/Cairo',
+         'Asia/Shanghai', 'Asia/Tokyo', 'Australia/Sydney',
+         'Pacific/Auckland', 'America/Halifax', 'Asia/Tehran',
+         'America/Santiago', 'Europe/Moscow', 'Asia/Dubai']
+
+
+def per_zone(utc, tables):
+    return [(t.to_local(utc), t.utc_offsets(utc), t.abbr_codes[t._index(utc)])
+            for t in tables]
+
+
+def timed(func, *args):
+    t0 = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - t0
+
+
+def main(n, n_zones):
+    zones = ZONES[:n_zones]
+    tables = [compile_zone(zone) for zone in zones]
+    rng = np.random.default_rng(0)
+    # Two years of trip starts
+    utc = rng.integers(1483228800, 1546300800, n)
+
+    loop_n = min(n, 20000)
+    sample = [datetime.fromtimestamp(int(t), timezone.utc)
+              for t in utc[:loop_n]]
+    gettz = [tz.gettz(zone) for zone in zones]
+    t0 = time.perf_counter()
+    for value in sample:
+        for zone in gettz:
+            local = value.astimezone(zone)
+            local.utcoffset()
+            local.tzname()
+    loop = (time.perf_counter() - t0) * n / loop_n
+
+    looked_up, separate = timed(per_zone, utc, tables)
+    wide, fanned = timed(fan_out, utc, zones)
+    for row, (wall, offset, codes) in enumerate(looked_up):
+        assert np.array_equal(wide.wall[row], wall)
+        assert np.array_equal(wide.offset[row], offset)
+        assert np.array_equal(wide.abbr_codes[row], codes)
+    _, one = timed(tables[0].to_local, utc)
+
+    print("values: {:,}  zones: {}".format(n, len(zones)))
+    print("astimezone loop:     {:>9.3f} s  (from {:,} values)".format(
+        loop, loop_n))
+    print("lookup per zone:     {:>9.3f} s".format(separate))
+    print("fan_out:             {:>9.3f} s  ({:.1f}x one to_local)".format(
+        fanned, fanned / one))
+
+
+if __name__ == '__main__':
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 1000000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 15)
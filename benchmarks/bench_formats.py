@@ -0,0 +1,103 @@
+"""Check CompiledFormat against datetime.strptime and time both.
+
+Every (string, format) pair in CORPUS must give the same datetime, or the
+same ValueError message, through both paths.
+
+Usage: python benchmarks/bench_formats.py [n_rows]
+"""
+
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetools import (NAT, compile_format, infer_format,  # noqa: E402
+                       parse_timestamps)
+
+FORMATS = [
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d',
+    '%m/%d/%Y %H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S.%f',
+    '%d.%m.%y %H:%M',
+    '%Y-%j',
+    '%Y%m%d',
+    '%H:%M',
+    '%m-%d',
+    '%Y-%m-%dT%H:%M:%S%z',
+    '%B (%Y)',
+    '100%% %Y',
+]
+
+STRINGS = [
+    '2017-02-03 00:00:01', '2030-10-15', '12/15/1986 08:00:00',
+    '2017-10-01 15:23:25', '2017-1-5 3:4:5', '2017-10-01  15:23:25',
+    '2017-10-01\t15:23:25', '2017-02-29 00:00:00', '2016-02-29 12:00:00',
+    '2017-13-01 00:00:00', '2017-10-01 24:00:00', '2017-10-01 23:59:60',
+    '2017-10-01 15:23:25 ', ' 2017-10-01 15:23:25', '2017-10-01',
+    '2017-10-01T15:23:25.5', '2017-10-01T15:23:25.123456',
+    '2017-10-01T15:23:25.1234567', '01.10.17 15:23', '01.10.69 15:23',
+    '1992-237', '2017-366', '2016-366', '2017-000', '20171001', '2017101',
+    '9:05', '23:59', '02-29', '2-29', ' 5-1', '2017-10-01T15:23:25+0200',
+    'August (1992)', '100% 1992', '100% 1992x', '', 'garbage',
+    '0000-01-01', '9999-12-31 23:59:59', '1-01-01',
+]
+
+
+def outcome(func, text, fmt):
+    try:
+        return func(text, fmt)
+    except ValueError as exc:
+        return 'ValueError: %s' % exc
+
+
+def check_corpus():
+    checked = 0
+    for fmt in FORMATS:
+        compiled = compile_format(fmt)
+        for text in STRINGS:
+            expected = outcome(datetime.strptime, text, fmt)
+            actual = outcome(lambda t, f: compiled.parse(t), text, fmt)
+            assert expected == actual, (text, fmt, expected, actual)
+            checked += 1
+    assert infer_format(['2017-10-01 15:23:25']) == '%Y-%m-%d %H:%M:%S'
+    assert infer_format(['12/15/1986 08:00:00']) == '%m/%d/%Y %H:%M:%S'
+    assert infer_format(['15/12/1986 08:00:00']) == '%d/%m/%Y %H:%M:%S'
+    mixed = ['2017-10-01 15:23:25', 'bad', float('nan'), None, '']
+    assert infer_format(mixed, errors='coerce') == '%Y-%m-%d %H:%M:%S'
+    assert parse_timestamps(mixed, errors='coerce').tolist() == \
+        [1506871405] + [NAT] * 4
+    return checked
+
+
+def main(n):
+    print("corpus pairs matching strptime: {}".format(check_corpus()))
+
+    fmt = '%m/%d/%Y %H:%M:%S'
+    strings = ['%d/%d/2017 %d:05:09' % (1 + i % 12, 1 + i % 28, i % 24)
+               for i in range(n)]
+
+    t0 = time.perf_counter()
+    expected = [datetime.strptime(s, fmt) for s in strings]
+    t_std = time.perf_counter() - t0
+
+    compiled = compile_format(fmt)
+    t0 = time.perf_counter()
+    actual = [compiled.parse(s) for s in strings]
+    t_compiled = time.perf_counter() - t0
+    assert actual == expected
+
+    t0 = time.perf_counter()
+    parse_timestamps(strings)
+    t_inferred = time.perf_counter() - t0
+
+    print("rows:                 {:>10,}".format(n))
+    print("datetime.strptime:    {:>10.3f} s".format(t_std))
+    print("CompiledFormat.parse: {:>10.3f} s".format(t_compiled))
+    print("parse_timestamps:     {:>10.3f} s  (format inferred)".format(t_inferred))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,52 @@
+"""Per-object isoformat()/strftime() versus the batch formatter.
+
+Usage: python benchmarks/bench_formatting.py [n_rows]
+"""
+
+import io
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetools.formatting import (format_isoformat, format_timestamps,  # noqa: E402
+                                  write_timestamps)
+
+
+def timed(func, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - t0
+
+
+def main(n):
+    rng = np.random.default_rng(0)
+    seconds = rng.integers(1483228800, 1514764800, size=n)
+    epoch = datetime(1970, 1, 1)
+    dts = [epoch + timedelta(seconds=s) for s in seconds.tolist()]
+
+    iso, t_iso = timed(lambda: [d.isoformat() for d in dts])
+    us, t_us = timed(lambda: [d.strftime("%m/%d/%Y") for d in dts])
+    batch_iso, t_batch_iso = timed(format_isoformat, seconds)
+    batch_us, t_batch_us = timed(format_timestamps, seconds, "%m/%d/%Y")
+    assert batch_iso.astype(str).tolist() == iso
+    assert batch_us.astype(str).tolist() == us
+
+    sink = io.BytesIO()
+    written, t_write = timed(write_timestamps, sink, seconds)
+
+    print("rows:                     {:>12,}".format(n))
+    print("isoformat() loop:         {:>10.3f} s".format(t_iso))
+    print("format_isoformat:         {:>10.3f} s".format(t_batch_iso))
+    print("strftime('%m/%d/%Y') loop:{:>10.3f} s".format(t_us))
+    print("format_timestamps:        {:>10.3f} s".format(t_batch_us))
+    print("write_timestamps:         {:>10.3f} s  ({:.0f} MB/s)".format(
+        t_write, written / t_write / 1e6))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
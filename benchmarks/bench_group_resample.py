@@ -0,0 +1,117 @@
+"""pandas groupby().resample() versus datetools.group_resample.
+
+Checks that ``group_resample(...).to_frame()`` matches pandas' ``size()``,
+``mean()`` and ``median()`` per member type and month, and ``shares()``
+the notebook's ``value_counts() / size()``, on unsorted rides with NaN
+durations and a sparse member type that has empty months between its
+rides, and on a ``TripTable`` whose missing ends give ``NAT`` durations;
+then times both.
+
+Usage: python benchmarks/bench_group_resample.py [n_rides]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetools.resampling import group_resample  # noqa: E402
+from datetools.trips import TripTable  # noqa: E402
+
+
+def make_rides(n, seed=0):
+    rng = np.random.default_rng(seed)
+    start = rng.integers(1483228800, 1546300800, size=n)
+    member = np.where(rng.random(n) < 0.7, 'Member', 'Casual').astype(object)
+    # A handful of 'Staff' rides in three months, far apart
+    staff = rng.choice(n, size=min(n, 9), replace=False)
+    member[staff] = 'Staff'
+    start[staff] = np.repeat([1485000000, 1500000000, 1540000000], 3)[
+        :len(staff)]
+    duration = rng.exponential(900, size=n).round()
+    duration[rng.random(n) < 0.05] = np.nan
+    return pd.DataFrame({'Start date': start.view('datetime64[s]'),
+                         'Member type': member, 'Duration': duration})
+
+
+def with_pandas(rides):
+    grouped = rides.groupby('Member type').resample('ME', on='Start date')
+    monthly = rides.resample('ME', on='Start date')['Member type']
+    return (grouped.size(), grouped['Duration'].mean(),
+            grouped['Duration'].median(),
+            monthly.value_counts() / monthly.size())
+
+
+def with_datetools(rides):
+    return group_resample(rides['Member type'].to_numpy(),
+                          rides['Start date'].to_numpy(), 'M',
+                          rides['Duration'].to_numpy())
+
+
+def check(rides):
+    size, mean, median, share = with_pandas(rides)
+    result = with_datetools(rides)
+    frame = result.to_frame(names=('Member type', 'Start date'))
+    assert frame.index.equals(size.index)
+    assert np.array_equal(frame['count'].to_numpy(), size.to_numpy())
+    assert np.allclose(frame['mean'].to_numpy(), mean.to_numpy(),
+                       equal_nan=True)
+    assert np.allclose(frame['median'].to_numpy(), median.to_numpy(),
+                       equal_nan=True)
+    # value_counts() lists only the (month, member type) pairs with rides
+    shares = result.shares().stack()
+    shares = shares[shares > 0].sort_index()
+    share = share.sort_index()
+    assert np.array_equal(shares.index.get_level_values(0),
+                          share.index.get_level_values(0))
+    assert list(shares.index.get_level_values(1)) == \
+        list(share.index.get_level_values(1))
+    assert np.allclose(shares.to_numpy(), share.to_numpy())
+    staff = frame.loc['Staff']
+    assert (staff['count'] == 0).sum() > 0 and staff['median'].isna().any()
+
+
+def check_trip_table(rides):
+    """The docstring's TripTable recipe: a trip with no end has a NAT
+    duration, which must count as missing like pandas' NaN."""
+    start = rides['Start date'].to_numpy().view(np.int64)
+    end = start + rides['Duration'].fillna(0).to_numpy().astype(np.int64)
+    end[rides['Duration'].isna().to_numpy()] = np.iinfo(np.int64).min
+    trips = TripTable(start, end,
+                      member_type=rides['Member type'].to_numpy())
+    codes, labels = trips.codes('member_type')
+    result = group_resample(codes, trips.start, 'M', trips.durations(),
+                            labels)
+    frame = result.to_frame(names=('Member type', 'Start date'))
+    size, mean, median, _ = with_pandas(rides)
+    assert np.array_equal(frame['count'].to_numpy(), size.to_numpy())
+    assert np.allclose(frame['mean'].to_numpy(), mean.to_numpy(),
+                       equal_nan=True)
+    assert np.allclose(frame['median'].to_numpy(), median.to_numpy(),
+                       equal_nan=True)
+
+
+def timed(func, *args):
+    t0 = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - t0
+
+
+def main(n):
+    check(make_rides(20000, seed=1))
+    check_trip_table(make_rides(20000, seed=2))
+    rides = make_rides(n)
+    t_pd = timed(with_pandas, rides)
+    t_dt = timed(with_datetools, rides)
+    print("rides:                  {:>12,}".format(n))
+    print("pandas groupby/resample:{:>10.3f} s".format(t_pd))
+    print("group_resample:         {:>10.3f} s  ({:.1f}x)".format(
+        t_dt, t_pd / t_dt))
+
+
+if __name__ == '__main__':
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 1000000)
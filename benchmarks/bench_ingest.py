@@ -0,0 +1,88 @@
+"""Throughput of ingest_files as the worker count grows.
+
+Usage: python benchmarks/bench_ingest.py [n_files] [rows_per_file]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetools import NAT  # noqa: E402
+from datetools.ingest import ingest_files  # noqa: E402
+from datetools.rides import RideSummary, iter_rides  # noqa: E402
+
+HEADER = ('Start date,End date,Start station number,Start station,'
+          'End station number,End station,Bike number,Member type\n')
+
+
+def write_month(path, n, month, seed):
+    rng = np.random.default_rng(seed)
+    first = np.datetime64('2017-01-01', 's') + np.timedelta64(31 * month, 'D')
+    start = np.sort(first + rng.integers(0, 28 * 86400, size=n))
+    end = start + rng.integers(60, 3600, size=n)
+    members = np.where(rng.random(n) < 0.7, 'Member', 'Casual')
+    with open(path, 'w') as f:
+        f.write(HEADER)
+        f.writelines(
+            '%s,%s,31038,Glebe Rd & 11th St N,31036,'
+            'George Mason Dr & Wilson Blvd,W20529,%s\n'
+            % (str(a).replace('T', ' '), str(b).replace('T', ' '), m)
+            for a, b, m in zip(start, end, members))
+
+
+def check_missing_dates(tmp):
+    # Empty date cells within the rows the format is inferred from
+    path = os.path.join(tmp, 'missing.csv')
+    with open(path, 'w') as f:
+        f.write(HEADER)
+        f.write(',2017-10-01 15:26:26,31038,A,31036,B,W20529,Member\n')
+        f.write('2017-10-01 15:23:25,,31038,A,31036,B,W20529,Casual\n')
+        f.write('2017-10-02 08:00:00,2017-10-02 08:10:00,31038,A,31036,B,'
+                'W20529,Member\n')
+    for chunksize in (100, 1):
+        # With one row per chunk, the first chunk has no start date at all
+        chunks = list(iter_rides(path, chunksize))
+        starts = [v for c in chunks for v in c['Start date'].isna()]
+        ends = [v for c in chunks for v in c['End date'].isna()]
+        assert starts == [True, False, False]
+        assert ends == [False, True, False]
+        summary = RideSummary()
+        for chunk in chunks:
+            summary.update(chunk)
+        assert summary.rides == 1 and summary.total_duration == 600
+    table = ingest_files([path], workers=1)
+    assert sorted(table.durations().tolist()) == [NAT, NAT, 600]
+    assert table.am_pm_counts() == {'AM': 1, 'PM': 0}
+    os.remove(path)
+
+
+def main(n_files, rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        check_missing_dates(tmp)
+        for i in range(n_files):
+            write_month(os.path.join(tmp, 'rides_%02d.csv' % i), rows, i % 12, i)
+        pattern = os.path.join(tmp, '*.csv')
+        total = n_files * rows
+        workers = 1
+        baseline = None
+        while workers <= min(os.cpu_count() or 1, n_files):
+            t0 = time.perf_counter()
+            table = ingest_files(pattern, workers=workers)
+            elapsed = time.perf_counter() - t0
+            assert len(table) == total
+            assert np.all(table.start[1:] >= table.start[:-1])
+            baseline = baseline or elapsed
+            print("workers {:>3}: {:>8.2f} s  {:>12,.0f} rows/s  "
+                  "speed-up {:>5.2f}x".format(
+                      workers, elapsed, total / elapsed, baseline / elapsed))
+            workers *= 2
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:]]
+    main(*(args + [8, 200000][len(args):]))
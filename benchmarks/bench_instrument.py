@@ -0,0 +1,88 @@
+"""Cost of the stage instrumentation, disabled and enabled.
+
+Runs a parse / zone / durations / resample pipeline over chunks of
+synthetic rides three ways -- recording disabled, timers only, and timers
+plus tracemalloc -- and reports the slowdown of each against disabled,
+plus the per-call cost of a wrapped function while disabled.
+
+Usage: python benchmarks/bench_instrument.py [n_rows] [chunk_rows]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetools import instrument  # noqa: E402
+from datetools.durations import trip_durations  # noqa: E402
+from datetools.formatting import format_timestamps  # noqa: E402
+from datetools.parsing import parse_timestamps  # noqa: E402
+from datetools.resampling import resample  # noqa: E402
+from datetools.synthetic import generate_trips  # noqa: E402
+from datetools.trips import TripTable  # noqa: E402
+from datetools.zones import localize  # noqa: E402
+
+FORMAT = '%Y-%m-%d %H:%M:%S'
+ZONE = 'America/New_York'
+
+
+def pipeline(chunks):
+    for start, end in chunks:
+        start = parse_timestamps(start, FORMAT)
+        end = parse_timestamps(end, FORMAT)
+        localize(start, ZONE)
+        trip_durations(start, end, ZONE)
+        resample(start, 'D')
+
+
+def best_of(func, repeat=3):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main(n, chunk):
+    trips = TripTable.concat(generate_trips(n))
+    chunks = [(format_timestamps(trips.start[i:i + chunk], FORMAT),
+               format_timestamps(trips.end[i:i + chunk], FORMAT))
+              for i in range(0, n, chunk)]
+
+    disabled = best_of(lambda: pipeline(chunks))
+    with instrument.recording() as run:
+        timers = best_of(lambda: pipeline(chunks))
+    with instrument.recording(memory=True):
+        memory = best_of(lambda: pipeline(chunks))
+
+    def noop(values):
+        return values
+
+    wrapped_noop = instrument.instrumented('noop')(noop)
+    calls = 1000000
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        wrapped_noop(chunks)
+    wrapped = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        noop(chunks)
+    bare = time.perf_counter() - t0
+
+    print(run.text())
+    print()
+    print("rows: {:,} in chunks of {:,}".format(n, chunk))
+    print("disabled:               {:>8.3f} s".format(disabled))
+    print("timers:                 {:>8.3f} s  ({:+.1%})".format(
+        timers, timers / disabled - 1))
+    print("timers + tracemalloc:   {:>8.3f} s  ({:+.1%})".format(
+        memory, memory / disabled - 1))
+    print("disabled wrapper:       {:>8.0f} ns per call".format(
+        (wrapped - bare) / calls * 1e9))
+
+
+if __name__ == '__main__':
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 1000000,
+         int(float(sys.argv[2])) if len(sys.argv) > 2 else 100000)
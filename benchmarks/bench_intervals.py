@@ -0,0 +1,75 @@
+"""Scanning every trip versus IntervalIndex for "in progress at" queries.
+
+Usage: python benchmarks/bench_intervals.py [n_trips] [n_queries]
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetools.intervals import IntervalIndex  # noqa: E402
+
+
+def make_trips(n, seed=0):
+    rng = np.random.default_rng(seed)
+    start = rng.integers(1506816000, 1514764800, size=n)
+    duration = rng.integers(60, 3600, size=n)
+    # A few trips left open for days, as happens with unreturned bikes
+    open_ended = duration[::1000]
+    open_ended[:] = rng.integers(86400, 10 * 86400, size=len(open_ended))
+    return start, start + duration
+
+
+def main(n, n_queries):
+    start, end = make_trips(n)
+    rng = np.random.default_rng(1)
+    times = rng.integers(1506816000, 1514764800, size=n_queries)
+
+    epoch = datetime(1970, 1, 1)
+    onebike_datetimes = [{'start': epoch + timedelta(seconds=s),
+                          'end': epoch + timedelta(seconds=e)}
+                         for s, e in zip(start.tolist(), end.tolist())]
+    queries = [epoch + timedelta(seconds=t) for t in times.tolist()]
+
+    t0 = time.perf_counter()
+    expected = [[i for i, trip in enumerate(onebike_datetimes)
+                 if trip['start'] <= t < trip['end']] for t in queries]
+    t_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    scanned = [np.flatnonzero((start <= t) & (t < end)) for t in times]
+    t_scan = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    index = IntervalIndex(start, end)
+    t_build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    found = [index.stab(t) for t in times]
+    t_stab = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    query, row = index.stab_many(times)
+    t_bulk = time.perf_counter() - t0
+
+    for i in range(n_queries):
+        assert found[i].tolist() == expected[i] == scanned[i].tolist()
+        assert row[query == i].tolist() == expected[i]
+    assert index.count_active(times).tolist() == [len(e) for e in expected]
+
+    print("trips / queries:           {:>12,} / {:,}".format(n, n_queries))
+    print("loop over dicts:           {:>10.3f} s".format(t_loop))
+    print("numpy full scan:           {:>10.3f} s".format(t_scan))
+    print("IntervalIndex build:       {:>10.3f} s".format(t_build))
+    print("stab() per query:          {:>10.3f} s".format(t_stab))
+    print("stab_many():               {:>10.3f} s".format(t_bulk))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 100)
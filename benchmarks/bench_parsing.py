@@ -0,0 +1,60 @@
+"""Compare the per-row strptime loop with parse_timestamps.
+
+Usage: python benchmarks/bench_parsing.py [n_rows]
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetools import parse_timestamps  # noqa: E402
+
+FMT = "%Y-%m-%d %H:%M:%S"
+
+
+def make_strings(n, seed=0):
+    rng = np.random.default_rng(seed)
+    base = datetime(2017, 10, 1)
+    offsets = rng.integers(0, 92 * 86400, size=n)
+    return [(base + timedelta(seconds=int(s))).strftime(FMT) for s in offsets]
+
+
+def loop(strings):
+    # The notebook's approach: one strptime call per string
+    return [datetime.strptime(s, FMT) for s in strings]
+
+
+def main(n):
+    strings = make_strings(n)
+
+    t0 = time.perf_counter()
+    expected = loop(strings)
+    t_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    parsed = parse_timestamps(strings, FMT)
+    t_batch = time.perf_counter() - t0
+
+    assert parsed.view('datetime64[s]').astype(object).tolist() == expected
+
+    # A later read_csv chunk: the index does not start at 0, and the
+    # unpadded last row misses the fast path
+    chunk = pd.Series(strings[:2] + ['2017-10-1 15:23:26'],
+                      index=[100, 101, 102])
+    assert np.array_equal(parse_timestamps(chunk, FMT),
+                          parse_timestamps(list(chunk), FMT))
+
+    print("rows:           {:>12,}".format(n))
+    print("strptime loop:  {:>12.3f} s  ({:,.0f} rows/s)".format(t_loop, n / t_loop))
+    print("batch parser:   {:>12.3f} s  ({:,.0f} rows/s)".format(t_batch, n / t_batch))
+    print("speed-up:       {:>12.1f}x".format(t_loop / t_batch))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,84 @@
+"""Zone setup cost in worker processes: compiling tzdata versus attaching
+to tables published in shared memory.
+
+Starts a spawn-context pool whose workers either compile the notebook's
+zones from tzdata or attach to a shared block published by the parent,
+and reports the per-worker setup time of each. Also checks that attached
+tables convert exactly like freshly compiled ones.
+
+Usage: python benchmarks/bench_registry.py [n_workers] [n_zones]
+"""
+
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetools.registry import (NOTEBOOK_ZONES, ZoneRegistry,  # noqa: E402
+                                attach_zones, publish_zones)
+from datetools.zones import _compile_zone, available_zones  # noqa: E402
+
+
+def compile_job(names):
+    t0 = time.perf_counter()
+    ZoneRegistry(preload=names)
+    return time.perf_counter() - t0
+
+
+def attach_job(shared_name):
+    t0 = time.perf_counter()
+    names = attach_zones(shared_name)
+    return time.perf_counter() - t0, len(names)
+
+
+def convert_job(name):
+    from datetools.zones import compile_zone
+    utc = np.arange(-10**9, 4 * 10**9, 3599, dtype=np.int64)
+    table = compile_zone(name)
+    return table.to_local(utc), table.abbreviations(utc)
+
+
+def run(workers, initializer, initargs, job, args):
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(workers, mp_context=context,
+                             initializer=initializer,
+                             initargs=initargs) as pool:
+        return list(pool.map(job, args))
+
+
+def main(workers, n_zones):
+    names = list(NOTEBOOK_ZONES)
+    names += [n for n in available_zones() if n not in names]
+    names = names[:n_zones]
+
+    compiled = run(workers, None, (), compile_job, [names] * workers)
+    with publish_zones(names) as shared:
+        attached = run(workers, None, (), attach_job,
+                       [shared.name] * workers)
+        converted = run(workers, attach_zones, (shared.name,),
+                        convert_job, NOTEBOOK_ZONES)
+        print(shared)
+
+    utc = np.arange(-10**9, 4 * 10**9, 3599, dtype=np.int64)
+    for name, (wall, abbrevs) in zip(NOTEBOOK_ZONES, converted):
+        table = _compile_zone(name)
+        assert np.array_equal(wall, table.to_local(utc))
+        assert np.array_equal(abbrevs, table.abbreviations(utc))
+
+    compile_s = min(compiled)
+    attach_s = min(t for t, _ in attached)
+    print("workers: {}  zones: {}".format(workers, len(names)))
+    print("compile from tzdata: {:>9.2f} ms per worker".format(
+        compile_s * 1e3))
+    print("attach shared:       {:>9.2f} ms per worker  ({:.0f}x)".format(
+        attach_s * 1e3, compile_s / attach_s))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 40)
@@ -0,0 +1,83 @@
+"""pandas resample versus datetools.resample on epoch seconds.
+
+Usage: python benchmarks/bench_resample.py [n_rides]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetools.resampling import Resampler, resample  # noqa: E402
+from datetools.trips import TripTable  # noqa: E402
+
+
+def traced(func, *args):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def with_pandas(rides, freq):
+    grouped = rides.resample(freq, on='Start date')
+    return grouped.size(), grouped['Duration'].mean()
+
+
+def check_missing_end():
+    """The README's resample(start, 'M', durations) with one trip that has
+    no end: its NAT duration is counted as a ride but not averaged."""
+    start = np.array([1506816000, 1506819600, 1509494400])
+    trips = TripTable(start, start + [600, 1200, 900])
+    trips.end[1] = np.iinfo(np.int64).min
+    result = resample(trips.start, 'M', trips.durations())
+    assert result.count.tolist() == [2, 1]
+    assert result.sum.tolist() == [600, 900]
+    assert result.mean.tolist() == [600, 900]
+
+
+def check_chunks(start, duration):
+    """Resampler fed sorted chunks, which widen its bins at every update,
+    gives resample's result."""
+    whole = resample(start, 'W', duration)
+    order = np.argsort(start)
+    resampler = Resampler('W', weighted=True)
+    for chunk in np.array_split(order, 7):
+        resampler.update(start[chunk], duration[chunk])
+    chunked = resampler.result()
+    assert np.array_equal(chunked.labels, whole.labels)
+    assert np.array_equal(chunked.count, whole.count)
+    assert np.allclose(chunked.sum, whole.sum)
+
+
+def main(n):
+    rng = np.random.default_rng(0)
+    start = rng.integers(1483228800, 1546300800, size=n)
+    duration = rng.integers(60, 7200, size=n).astype(np.float64)
+    rides = pd.DataFrame({'Start date': start.view('datetime64[s]'),
+                          'Duration': duration})
+
+    check_missing_end()
+    check_chunks(start[:10000], duration[:10000])
+    print("rides:                     {:>12,}".format(n))
+    for freq, pandas_freq in (('D', 'D'), ('h', 'h'), ('W', 'W'), ('M', 'ME')):
+        (size, mean), t_pd, m_pd = traced(with_pandas, rides, pandas_freq)
+        result, t_dt, m_dt = traced(resample, start, freq, duration)
+        assert np.array_equal(result.labels,
+                              size.index.values.astype('datetime64[s]'))
+        assert np.array_equal(result.count, size.to_numpy())
+        assert np.allclose(result.mean, mean.to_numpy(), equal_nan=True)
+        print("{:<2} pandas {:>7.3f} s {:>8.1f} MB | resample {:>7.3f} s "
+              "{:>8.1f} MB".format(freq, t_pd, m_pd / 1e6, t_dt, m_dt / 1e6))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000000)
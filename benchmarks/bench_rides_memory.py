@@ -0,0 +1,76 @@
+"""Peak RSS of pd.read_csv versus iter_rides + RideSummary.
+
+Writes bike_share-style files of increasing size to a temporary directory
+and reads each one in a fresh subprocess, so ru_maxrss is per-run.
+
+Usage: python benchmarks/bench_rides_memory.py [rows ...]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+HEADER = ('Start date,End date,Start station number,Start station,'
+          'End station number,End station,Bike number,Member type\n')
+
+READERS = {
+    'read_csv': (
+        "import pandas as pd\n"
+        "rides = pd.read_csv(PATH, parse_dates=['Start date', 'End date'])\n"
+        "(rides['End date'] - rides['Start date']).dt.total_seconds().mean()\n"
+        "rides.resample('D', on='Start date').size()\n"
+    ),
+    'iter_rides': (
+        "from datetools.rides import iter_rides, RideSummary\n"
+        "summary = RideSummary()\n"
+        "for chunk in iter_rides(PATH, chunksize=50000):\n"
+        "    summary.update(chunk)\n"
+        "summary.daily_counts()\n"
+    ),
+}
+
+
+def write_file(path, n):
+    import numpy as np
+    rng = np.random.default_rng(0)
+    start = np.sort(rng.integers(1483228800, 1514764800, size=n))
+    end = start + rng.integers(60, 3600, size=n)
+    with open(path, 'w') as f:
+        f.write(HEADER)
+        step = 100000
+        for i in range(0, n, step):
+            s = start[i:i + step].astype('datetime64[s]').astype(str)
+            e = end[i:i + step].astype('datetime64[s]').astype(str)
+            f.writelines(
+                '%s,%s,31038,Glebe Rd & 11th St N,31036,'
+                'George Mason Dr & Wilson Blvd,W20529,Member\n'
+                % (a.replace('T', ' '), b.replace('T', ' '))
+                for a, b in zip(s, e))
+
+
+def peak_rss_mb(code, path):
+    script = ("import resource, sys\nsys.path.insert(0, %r)\nPATH = %r\n%s"
+              "print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)\n"
+              % (ROOT, path, code))
+    out = subprocess.run([sys.executable, '-c', script], check=True,
+                         capture_output=True, text=True).stdout
+    return int(out.split()[-1]) / 1024
+
+
+def main(sizes):
+    with tempfile.TemporaryDirectory() as tmp:
+        print("{:>12}  {:>14}  {:>14}".format('rows', *READERS))
+        for n in sizes:
+            path = os.path.join(tmp, 'bike_share_%d.csv' % n)
+            write_file(path, n)
+            peaks = [peak_rss_mb(code, path) for code in READERS.values()]
+            print("{:>12,}  {:>11.0f} MB  {:>11.0f} MB".format(n, *peaks))
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main([int(a) for a in sys.argv[1:]] or [100000, 1000000, 3000000])
@@ -0,0 +1,85 @@
+"""sorted() on date objects versus radix argsort_dates() on ordinals.
+
+Usage: python benchmarks/bench_sorting.py [n_dates]
+"""
+
+import os
+import sys
+import time
+from datetime import date
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetools.sorting import SortedDates, argsort_dates  # noqa: E402
+
+
+def single_inserts(epochs, late):
+    """Insert ``late`` one value at a time; returns the seconds taken."""
+    index = SortedDates(epochs)
+    t0 = time.perf_counter()
+    for value in late.tolist():
+        index.add(value)
+    elapsed = time.perf_counter() - t0
+    low, high = late.min(), late.max() + 1
+    assert index.count_between(low, high) == len(late) + np.count_nonzero(
+        (epochs >= low) & (epochs < high))
+    return elapsed
+
+
+def main(n):
+    rng = np.random.default_rng(0)
+    ordinals = rng.integers(date(1950, 1, 1).toordinal(),
+                            date(2018, 1, 1).toordinal(),
+                            size=n).astype(np.int32)
+    epochs = rng.integers(1483228800, 1514764800, size=n)
+    dates_scrambled = [date.fromordinal(o) for o in ordinals.tolist()]
+
+    t0 = time.perf_counter()
+    dates_ordered = sorted(dates_scrambled)
+    t_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    perm = argsort_dates(ordinals)
+    t_days = time.perf_counter() - t0
+    assert [date.fromordinal(o) for o in ordinals[perm].tolist()] \
+        == dates_ordered
+
+    t0 = time.perf_counter()
+    expected = np.argsort(epochs, kind='stable')
+    t_stable = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    perm = argsort_dates(epochs)
+    t_epochs = time.perf_counter() - t0
+    assert np.array_equal(perm, expected)
+
+    # Late arrivals: 1000 batches of 10 inserted into the sorted epochs
+    index = SortedDates(epochs)
+    late = rng.integers(1483228800, 1514764800, size=(1000, 10))
+    t0 = time.perf_counter()
+    for batch in late:
+        index.add(batch)
+    t_insert = time.perf_counter() - t0
+    assert np.array_equal(index.values,
+                          np.sort(np.concatenate([epochs, late.ravel()])))
+
+    # One value per add: the cost per insert must not grow with the count
+    single = [(k, single_inserts(epochs, rng.integers(1483228800, 1514764800,
+                                                      size=k)))
+              for k in (25000, 50000, 100000)]
+
+    print("values:                      {:>12,}".format(n))
+    print("sorted(dates):               {:>10.3f} s".format(t_loop))
+    print("argsort_dates(ordinals):     {:>10.3f} s".format(t_days))
+    print("np.argsort(epochs, stable):  {:>10.3f} s".format(t_stable))
+    print("argsort_dates(epochs):       {:>10.3f} s".format(t_epochs))
+    print("10,000 late inserts:         {:>10.3f} s".format(t_insert))
+    for k, elapsed in single:
+        print("{:>7,} single inserts:       {:>10.3f} s  ({:.2f} us each)"
+              .format(k, elapsed, elapsed / k * 1e6))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
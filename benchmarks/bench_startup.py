@@ -0,0 +1,70 @@
+"""Start-up time of the command line, light commands versus heavy imports.
+
+Runs each command several times in a fresh interpreter and reports the
+median wall time. The light commands -- help and ``months`` on a pickled
+date list -- must stay under LIMIT; the script exits non-zero if they do
+not.
+
+Usage: python benchmarks/bench_startup.py [runs]
+"""
+
+import os
+import pickle
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LIMIT = 0.100
+
+
+def timed(argv, runs):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        done = subprocess.run(argv, env=env, stdout=subprocess.DEVNULL,
+                              stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times), done.returncode
+
+
+def main(runs):
+    tmp = tempfile.mkdtemp()
+    dates_path = os.path.join(tmp, 'florida_hurricane_dates.pkl')
+    with open(dates_path, 'wb') as f:
+        pickle.dump([date(1950, 1, 1) + timedelta(days=17 * i)
+                     for i in range(235)], f)
+
+    py = sys.executable
+    light = [
+        ('python -c pass', [py, '-c', 'pass']),
+        ('datetools --help', [py, '-m', 'datetools', '--help']),
+        ('datetools months <pkl>', [py, '-m', 'datetools', 'months',
+                                    dates_path]),
+    ]
+    heavy = [
+        ('import numpy', [py, '-c', 'import numpy']),
+        ('import pandas', [py, '-c', 'import pandas']),
+        ('import pandas, matplotlib', [py, '-c',
+                                       'import pandas, matplotlib.pyplot']),
+    ]
+
+    failed = False
+    for name, argv in light + heavy:
+        seconds, status = timed(argv, runs)
+        note = ''
+        if status:
+            note = '  (exit status %d)' % status
+        elif (name, argv) in light[1:] and seconds > LIMIT:
+            note = '  OVER %d ms' % (LIMIT * 1000)
+            failed = True
+        print('{:<28} {:>8.1f} ms{}'.format(name, seconds * 1000, note))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 7))
@@ -0,0 +1,85 @@
+"""List-based duration statistics versus streaming DurationStats.
+
+Usage: python benchmarks/bench_stats.py [n_durations] [chunk_size]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetools.stats import DurationStats  # noqa: E402
+from datetools.trips import TripTable  # noqa: E402
+
+
+def chunks(n, size, seed=0):
+    rng = np.random.default_rng(seed)
+    for i in range(0, n, size):
+        yield rng.lognormal(7, 1, size=min(size, n - i)).round()
+
+
+def loop_stats(n, size):
+    onebike_durations = []
+    for chunk in chunks(n, size):
+        for trip_length_seconds in chunk.tolist():
+            onebike_durations.append(trip_length_seconds)
+    average = sum(onebike_durations) / len(onebike_durations)
+    return (average, min(onebike_durations), max(onebike_durations),
+            float(np.median(onebike_durations)))
+
+
+def streaming_stats(n, size):
+    stats = DurationStats()
+    for chunk in chunks(n, size):
+        stats.update(chunk)
+    return stats
+
+
+def check_missing_end():
+    """A trip with no end has a NAT duration, which must not be counted."""
+    start = np.array([1506816000, 1506819600, 1506823200])
+    trips = TripTable(start, start + [600, 1200, 0])
+    trips.end[2] = np.iinfo(np.int64).min
+    stats = DurationStats().update(trips.durations())
+    assert (stats.count, stats.min, stats.max) == (2, 600, 1200)
+    assert stats.mean == 900 and stats.negative == 0
+    stats.add(trips.durations()[2])
+    assert stats.count == 2
+
+
+def traced(func, *args):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main(n, size):
+    (mean, low, high, median), t_loop, m_loop = traced(loop_stats, n, size)
+    stats, t_stream, m_stream = traced(streaming_stats, n, size)
+
+    assert stats.count == n
+    assert abs(stats.mean - mean) <= 1e-9 * abs(mean)
+    assert (stats.min, stats.max) == (low, high)
+    assert abs(stats.median() / median - 1) < 0.1
+    check_missing_end()
+
+    print("durations:                 {:>12,}".format(n))
+    print("list + sum/min/max:        {:>10.3f} s  peak {:>8.1f} MB".format(
+        t_loop, m_loop / 1e6))
+    print("DurationStats:             {:>10.3f} s  peak {:>8.1f} MB".format(
+        t_stream, m_stream / 1e6))
+    print("median exact / estimated:  {:>10.1f} / {:.1f}".format(
+        median, stats.median()))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 100000)
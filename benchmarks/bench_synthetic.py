@@ -0,0 +1,70 @@
+"""Write speed of the synthetic ride and catalog generators.
+
+Checks that a generated ride file reads back with ``pd.read_csv`` the same
+as the ``generate_trips`` tables, then reports MB/s for rides and for
+unsorted and sorted date catalogs.
+
+Usage: python benchmarks/bench_synthetic.py [n_rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetools.ambiguity import audit_trips  # noqa: E402
+from datetools.synthetic import (generate_trips, write_date_catalog,  # noqa: E402
+                                 write_rides)
+from datetools.trips import TripTable  # noqa: E402
+
+
+def timed(func, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - t0
+
+
+def check(path):
+    result = write_rides(path, 20000, seed=7)
+    rides = pd.read_csv(path, parse_dates=['Start date', 'End date'])
+    read = TripTable.from_frame(rides)
+    made = TripTable.concat(generate_trips(20000, seed=7))
+    assert len(rides) == result['rows'] == 20000
+    assert np.array_equal(read.start, made.start)
+    assert np.array_equal(read.end, made.end)
+    for name in ('start_station', 'end_station', 'member_type'):
+        assert np.array_equal(read.column(name), made.column(name))
+    found = audit_trips(read, 'America/New_York')
+    assert len(found['ambiguous_end']) >= result['fall_back']
+    assert len(found['nonexistent_start']) >= result['spring_forward']
+    assert (read.end < read.start).sum() >= result['end_before_start']
+
+
+def main(n):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'rides.csv')
+        check(path)
+        os.remove(path)
+
+        result, seconds = timed(write_rides, path, n)
+        print("rows:               {:>12,}".format(n))
+        print("write_rides:        {:>10.3f} s  ({:.0f} MB/s)".format(
+            seconds, result['bytes'] / seconds / 1e6))
+        os.remove(path)
+
+        cat = os.path.join(tmp, 'dates.dtcat')
+        for sort in (False, True):
+            _, seconds = timed(write_date_catalog, cat, n, sort=sort)
+            print("write_date_catalog: {:>10.3f} s  ({:.0f} MB/s{})".format(
+                seconds, os.path.getsize(cat) / seconds / 1e6,
+                ', sorted' if sort else ''))
+            os.remove(cat)
+
+
+if __name__ == '__main__':
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 10000000)
@@ -0,0 +1,78 @@
+"""Memory and speed of TripTable versus the list of start/end dicts.
+
+Usage: python benchmarks/bench_trips.py [n_trips]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetools.trips import TripTable  # noqa: E402
+
+
+def make_seconds(n, seed=0):
+    rng = np.random.default_rng(seed)
+    start = np.sort(rng.integers(1506816000, 1514764800, size=n))
+    return start, start + rng.integers(60, 7200, size=n)
+
+
+def build_records(start, end):
+    epoch = datetime(1970, 1, 1)
+    return [{'start': epoch + timedelta(seconds=s),
+             'end': epoch + timedelta(seconds=e)}
+            for s, e in zip(start.tolist(), end.tolist())]
+
+
+def loop_analyses(records):
+    trip_counts = {'AM': 0, 'PM': 0}
+    for trip in records:
+        if trip['start'].hour < 12:
+            trip_counts['AM'] += 1
+        else:
+            trip_counts['PM'] += 1
+    durations = []
+    for trip in records:
+        durations.append((trip['end'] - trip['start']).total_seconds())
+    return trip_counts, durations
+
+
+def traced_bytes(func, *args):
+    tracemalloc.start()
+    result = func(*args)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main(n):
+    start, end = make_seconds(n)
+    records, dict_bytes = traced_bytes(build_records, start, end)
+    table = TripTable(start, end)
+    table_bytes = table.nbytes
+
+    t0 = time.perf_counter()
+    counts, durations = loop_analyses(records)
+    t_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    table_counts, table_durations = table.am_pm_counts(), table.durations()
+    t_table = time.perf_counter() - t0
+
+    assert counts == table_counts
+    assert np.array_equal(np.array(durations), table_durations)
+
+    print("trips:                {:>12,}".format(n))
+    print("list of dicts:        {:>9.1f} bytes/trip".format(dict_bytes / n))
+    print("TripTable:            {:>9.1f} bytes/trip".format(table_bytes / n))
+    print("loop analyses:        {:>12.4f} s".format(t_loop))
+    print("TripTable analyses:   {:>12.4f} s".format(t_table))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,73 @@
+"""dateutil astimezone loop versus ZoneTable conversion of whole arrays.
+
+Usage: python benchmarks/bench_zones.py [n_values]
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from dateutil import tz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetools.zones import (compile_zone, convert, localize,  # noqa: E402
+                             to_local)
+
+
+def check_datetime64(wall):
+    """datetime64 input of any unit (pandas gives [ns]) is read as the
+    instants it holds, not as integers in its own unit."""
+    for unit in ('s', 'ms', 'ns'):
+        times = wall.astype('datetime64[s]').astype('datetime64[%s]' % unit)
+        assert (localize(times, 'America/New_York', fold=1)
+                == localize(wall, 'America/New_York', fold=1)).all()
+        assert (to_local(times, 'Asia/Kolkata')
+                == to_local(wall, 'Asia/Kolkata')).all()
+        assert (convert(times, 'America/New_York', 'Europe/London')
+                == convert(wall, 'America/New_York', 'Europe/London')).all()
+    # 2017-11-05 01:30 happens twice in New York
+    nat = np.array(['2017-11-05T01:30', 'NaT'], dtype='datetime64[ns]')
+    assert localize(nat, 'America/New_York', fold=1)[0] == 1509863400
+    assert compile_zone('America/New_York').abbreviations(nat[:1])[0] == 'EDT'
+
+
+def main(n):
+    rng = np.random.default_rng(0)
+    wall = rng.integers(1483228800, 1546300800, size=n)
+    et, uk = tz.gettz('America/New_York'), tz.gettz('Europe/London')
+    epoch = datetime(1970, 1, 1)
+    dts = [epoch + timedelta(seconds=s) for s in wall.tolist()]
+
+    t0 = time.perf_counter()
+    expected = [d.replace(tzinfo=et).astimezone(uk).replace(tzinfo=None)
+                for d in dts]
+    t_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    compile_zone('America/New_York')
+    compile_zone('Europe/London')
+    t_compile = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    converted = convert(wall, 'America/New_York', 'Europe/London')
+    t_bulk = time.perf_counter() - t0
+
+    # Wall times skipped by spring-forward are resolved differently by
+    # dateutil (see check_zones.py); compare everything else
+    table = compile_zone('America/New_York')
+    real = table.to_local(table.to_utc(wall)) == wall
+    got = converted.astype('datetime64[s]').astype(object)
+    assert got[real].tolist() == [e for e, r in zip(expected, real) if r]
+    check_datetime64(wall[:1000])
+
+    print("values:                    {:>12,}".format(n))
+    print("replace/astimezone loop:   {:>10.3f} s".format(t_loop))
+    print("compile two zones:         {:>10.3f} s".format(t_compile))
+    print("convert():                 {:>10.3f} s".format(t_bulk))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
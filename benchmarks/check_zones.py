@@ -0,0 +1,110 @@
+"""Check compiled zone tables against dateutil around every transition.
+
+For each zone and each transition between FIRST_YEAR and LAST_YEAR, wall
+times on both sides of the change (including repeated and skipped ones)
+are localized with fold 0 and 1, and the resulting instants converted back,
+through ZoneTable, dateutil.tz.gettz and zoneinfo. Every comparison is made
+against zoneinfo; the ones dateutil can answer are also made against
+dateutil. That excludes two groups:
+
+- times after LAST_DATEUTIL_YEAR: dateutil only reads the 32-bit part of a
+  TZif file, which stops in 2037;
+- skipped wall times (spring-forward gaps): dateutil reads them with the
+  offset after a DST change but before any other change, whereas ZoneTable
+  and zoneinfo follow PEP 495 and let ``fold`` choose.
+
+The remaining dateutil differences (about 50 zones, none of the notebook's
+four) come from how dateutil places transitions that change the standard
+offset and from negative DST (Europe/Dublin); zoneinfo agrees with
+ZoneTable there. The exit status is non-zero only for zoneinfo mismatches.
+
+Usage: python benchmarks/check_zones.py [zone ...]
+"""
+
+import os
+import sys
+import time
+import zoneinfo
+from datetime import datetime, timedelta
+
+import numpy as np
+from dateutil import tz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetools.zones import available_zones, compile_zone  # noqa: E402
+
+FIRST_YEAR = 1970
+LAST_YEAR = 2040
+LAST_DATEUTIL_YEAR = 2037
+STEPS = np.array([-7201, -3601, -3600, -1801, -1, 0, 1, 1799, 1800, 3599,
+                  3600, 7199])
+
+_EPOCH = datetime(1970, 1, 1)
+_FIRST = int((datetime(FIRST_YEAR, 1, 1) - _EPOCH).total_seconds())
+_LAST = int((datetime(LAST_YEAR + 1, 1, 1) - _EPOCH).total_seconds())
+_DATEUTIL_END = int((datetime(LAST_DATEUTIL_YEAR, 1, 1) - _EPOCH)
+                    .total_seconds())
+
+
+def reference_utc(wall, fold, zone):
+    dt = (_EPOCH + timedelta(seconds=int(wall))).replace(tzinfo=zone,
+                                                         fold=fold)
+    return int((dt.astimezone(tz.UTC).replace(tzinfo=None) - _EPOCH)
+               .total_seconds())
+
+
+def reference_wall(utc, zone):
+    dt = datetime.fromtimestamp(int(utc), zone)
+    return int((dt.replace(tzinfo=None) - _EPOCH).total_seconds())
+
+
+def check_zone(name):
+    table = compile_zone(name)
+    inside = (table.transitions >= _FIRST) & (table.transitions < _LAST)
+    transitions = table.transitions[inside]
+    before = table.offsets[np.flatnonzero(inside) - 1]
+    walls = (transitions + before)[:, None] + STEPS[None, :]
+    walls = walls.ravel()
+    checked = 0
+    failed = [0, 0]
+    dateutil_zone = tz.gettz(name)
+    stdlib_zone = zoneinfo.ZoneInfo(name)
+    gaps = np.zeros(len(walls), dtype=bool)
+    for fold in (0, 1):
+        gaps |= table.to_local(table.to_utc(walls, fold)) != walls
+    for fold in (0, 1):
+        utc = table.to_utc(walls, fold)
+        local = table.to_local(utc)
+        for w, u, back, gap in zip(walls.tolist(), utc.tolist(),
+                                   local.tolist(), gaps.tolist()):
+            zones = [stdlib_zone]
+            if w < _DATEUTIL_END and not gap:
+                zones.append(dateutil_zone)
+            for zone in zones:
+                checked += 2
+                failed[zone is dateutil_zone] += (
+                    (reference_utc(w, fold, zone) != u)
+                    + (reference_wall(u, zone) != back))
+    return checked, failed
+
+
+def main(names):
+    t0 = time.perf_counter()
+    total = 0
+    bad = [0, 0]
+    for name in names:
+        checked, failed = check_zone(name)
+        total += checked
+        bad[0] += failed[0]
+        bad[1] += failed[1]
+        if any(failed):
+            print("{:<32} zoneinfo {:>5}  dateutil {:>5}".format(name, *failed))
+    print("{} zones, {:,} comparisons, mismatches: zoneinfo {:,}, "
+          "dateutil {:,} ({:.1f} s)".format(len(names), total, bad[0], bad[1],
+                                           time.perf_counter() - t0))
+    return 1 if bad[0] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:] or available_zones()))
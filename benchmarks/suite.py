@@ -0,0 +1,323 @@
+"""Benchmark suite: every stage of the notebook at several sizes.
+
+Each stage is timed twice where it makes sense: the notebook's way (a loop
+over ``datetime`` objects, or pandas) and the ``datetools`` way. For every
+stage, implementation and size the suite records wall time, throughput and
+peak traced memory. The time is the best of ``--repeat`` runs; the memory
+comes from one more run under ``tracemalloc``, so tracing does not distort
+the timing. Per-object loops are skipped above ``--loop-limit`` rows, where
+they would take minutes.
+
+Results are written as JSON. Given ``--baseline``, each ``datetools``
+result is compared with the same stage and size in an earlier results
+file, and anything slower by more than ``--tolerance`` (and by more than
+``NOISE_FLOOR`` seconds) is reported as a regression (exit status 1).
+The reference implementations (loops, strptime, dateutil, pandas) are
+timed for comparison only; ``--check-references`` gates them too.
+
+Usage: python benchmarks/suite.py [--sizes 1000,100000,10000000]
+           [--stages parse,durations,...] [--loop-limit 100000]
+           [--repeat 3] [--output results.json] [--baseline old.json]
+           [--tolerance 0.25] [--check-references] [--no-memory]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+from dateutil import tz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetools.ambiguity import find_wall_time_problems  # noqa: E402
+from datetools.durations import trip_durations  # noqa: E402
+from datetools.parsing import parse_timestamps  # noqa: E402
+from datetools.resampling import group_resample, resample  # noqa: E402
+from datetools.trips import TripTable  # noqa: E402
+from datetools.zones import fixed_zone, localize  # noqa: E402
+
+FORMAT = '%Y-%m-%d %H:%M:%S'
+ZONE = 'America/New_York'
+MEMBER_TYPES = np.array(['Member', 'Casual'], dtype=object)
+_EPOCH = datetime(1970, 1, 1)
+# Slowdowns smaller than this many seconds are timer noise, not regressions
+NOISE_FLOOR = 0.001
+
+
+class Data:
+    """Synthetic October-December 2017 rides, built lazily per form."""
+
+    def __init__(self, n, seed=0):
+        rng = np.random.default_rng(seed)
+        self.n = n
+        self.start = np.sort(rng.integers(1506816000, 1514764800, size=n))
+        self.end = self.start + rng.integers(60, 7200, size=n)
+        self.member = rng.integers(0, 2, size=n).astype(np.int8)
+        self._cache = {}
+
+    def get(self, name):
+        if name not in self._cache:
+            self._cache[name] = getattr(self, '_make_' + name)()
+        return self._cache[name]
+
+    def _make_strings(self):
+        return pd.Series(self.start.view('datetime64[s]')).dt.strftime(
+            FORMAT).tolist()
+
+    def _make_records(self):
+        return [{'start': _EPOCH + timedelta(seconds=s),
+                 'end': _EPOCH + timedelta(seconds=e)}
+                for s, e in zip(self.start.tolist(), self.end.tolist())]
+
+    def _make_frame(self):
+        return pd.DataFrame({
+            'Start date': self.start.view('datetime64[s]'),
+            'Member type': MEMBER_TYPES[self.member],
+            'Duration': (self.end - self.start).astype(np.float64),
+        })
+
+
+def parse_strptime(data):
+    return [datetime.strptime(s, FORMAT) for s in data.get('strings')]
+
+
+def parse_datetools(data):
+    return parse_timestamps(data.get('strings'), FORMAT)
+
+
+def durations_loop(data):
+    return [(t['end'] - t['start']).total_seconds()
+            for t in data.get('records')]
+
+
+def durations_datetools(data):
+    return TripTable(data.start, data.end).durations()
+
+
+_FIXED = timezone(timedelta(hours=-5))
+
+
+def fixed_offset_loop(data):
+    return [t['start'].replace(tzinfo=_FIXED).astimezone(timezone.utc)
+            for t in data.get('records')]
+
+
+def fixed_offset_datetools(data):
+    return localize(data.start, fixed_zone(-5 * 3600))
+
+
+def dateutil_loop(data):
+    et = tz.gettz(ZONE)
+    return [t['start'].replace(tzinfo=et).astimezone(tz.UTC)
+            for t in data.get('records')]
+
+
+def dateutil_datetools(data):
+    return localize(data.start, ZONE)
+
+
+def ambiguity_loop(data):
+    et = tz.gettz(ZONE)
+    return [(tz.datetime_ambiguous(t['start'], et),
+             tz.datetime_ambiguous(t['end'], et))
+            for t in data.get('records')]
+
+
+def ambiguity_datetools(data):
+    return (find_wall_time_problems(data.start, ZONE),
+            find_wall_time_problems(data.end, ZONE))
+
+
+def enfold_loop(data):
+    et = tz.gettz(ZONE)
+    trip_lengths = []
+    for trip in data.get('records'):
+        start = trip['start'].replace(tzinfo=et)
+        end = trip['end'].replace(tzinfo=et)
+        if start > end:
+            end = tz.enfold(end)
+        trip_lengths.append((end.astimezone(tz.UTC)
+                             - start.astimezone(tz.UTC)).total_seconds())
+    return trip_lengths
+
+
+def enfold_datetools(data):
+    return trip_durations(data.start, data.end, ZONE)
+
+
+def resample_pandas(data):
+    rides = data.get('frame')
+    return (rides.resample('D', on='Start date').size(),
+            rides.resample('ME', on='Start date')['Duration'].mean())
+
+
+def resample_datetools(data):
+    duration = data.end - data.start
+    return (resample(data.start, 'D'), resample(data.start, 'M', duration))
+
+
+def groupby_resample_pandas(data):
+    rides = data.get('frame')
+    grouped = rides.groupby('Member type').resample('ME', on='Start date')
+    return grouped['Duration'].median()
+
+
+def groupby_resample_datetools(data):
+    return group_resample(data.member, data.start, 'M',
+                          data.end - data.start, MEMBER_TYPES).median
+
+
+# stage -> {implementation: (function, is a per-object loop)}
+STAGES = {
+    'parse': {'strptime': (parse_strptime, True),
+              'datetools': (parse_datetools, False)},
+    'durations': {'loop': (durations_loop, True),
+                  'datetools': (durations_datetools, False)},
+    'fixed_offset': {'loop': (fixed_offset_loop, True),
+                     'datetools': (fixed_offset_datetools, False)},
+    'dateutil_zone': {'loop': (dateutil_loop, True),
+                      'datetools': (dateutil_datetools, False)},
+    'ambiguity': {'loop': (ambiguity_loop, True),
+                  'datetools': (ambiguity_datetools, False)},
+    'enfold': {'loop': (enfold_loop, True),
+               'datetools': (enfold_datetools, False)},
+    'resample': {'pandas': (resample_pandas, False),
+                 'datetools': (resample_datetools, False)},
+    'groupby_resample': {'pandas': (groupby_resample_pandas, False),
+                         'datetools': (groupby_resample_datetools, False)},
+}
+
+# Inputs a stage reads, built before it is timed
+NEEDS = {
+    parse_strptime: ('strings',), parse_datetools: ('strings',),
+    durations_loop: ('records',), fixed_offset_loop: ('records',),
+    dateutil_loop: ('records',), ambiguity_loop: ('records',),
+    enfold_loop: ('records',), resample_pandas: ('frame',),
+    groupby_resample_pandas: ('frame',),
+}
+
+
+def measure(func, data, repeat, memory):
+    seconds = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func(data)
+        seconds = min(seconds, time.perf_counter() - t0)
+    peak = None
+    if memory:
+        tracemalloc.start()
+        func(data)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return seconds, peak
+
+
+def run(sizes, stages, loop_limit, repeat, memory):
+    results = []
+    for n in sizes:
+        data = Data(n)
+        for stage in stages:
+            for impl, (func, is_loop) in STAGES[stage].items():
+                if is_loop and n > loop_limit:
+                    continue
+                for name in NEEDS.get(func, ()):
+                    data.get(name)
+                seconds, peak = measure(func, data, repeat, memory)
+                results.append({
+                    'stage': stage,
+                    'impl': impl,
+                    'rows': n,
+                    'seconds': seconds,
+                    'rows_per_second': n / seconds if seconds else None,
+                    'peak_bytes': peak,
+                })
+                print('{:<17} {:<10} {:>11,} rows {:>9.4f} s {:>12} rows/s'
+                      '{}'.format(stage, impl, n, seconds,
+                                  '{:,.0f}'.format(n / seconds),
+                                  '' if peak is None else
+                                  ' {:>9.1f} MB'.format(peak / 1e6)),
+                      flush=True)
+        del data
+    return results
+
+
+def compare(results, baseline, tolerance, impls=('datetools',)):
+    """Results of ``impls`` (every implementation if None) slower than the
+    baseline by more than ``tolerance``."""
+    before = {(r['stage'], r['impl'], r['rows']): r
+              for r in baseline['results']}
+    regressions = []
+    for r in results:
+        if impls is not None and r['impl'] not in impls:
+            continue
+        old = before.get((r['stage'], r['impl'], r['rows']))
+        if (old and r['seconds'] > old['seconds'] * (1 + tolerance)
+                and r['seconds'] - old['seconds'] > NOISE_FLOOR):
+            regressions.append((r, old))
+    return regressions
+
+
+def metadata():
+    return {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='1000,100000,10000000')
+    parser.add_argument('--stages', default=','.join(STAGES))
+    parser.add_argument('--loop-limit', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--check-references', action='store_true',
+                        help='also report regressions of the loop, '
+                             'dateutil and pandas reference timings')
+    parser.add_argument('--no-memory', action='store_true')
+    args = parser.parse_args(argv)
+
+    sizes = [int(float(s)) for s in args.sizes.split(',')]
+    stages = args.stages.split(',')
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error('unknown stage(s): %s' % ', '.join(sorted(unknown)))
+
+    results = run(sizes, stages, args.loop_limit, args.repeat,
+                  not args.no_memory)
+    with open(args.output, 'w') as f:
+        json.dump({'meta': metadata(), 'results': results}, f, indent=1)
+    print('wrote', args.output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance,
+                              None if args.check_references
+                              else ('datetools',))
+        for new, old in regressions:
+            print('REGRESSION {stage} {impl} {rows:,} rows: '.format(**new)
+                  + '{:.4f} s -> {:.4f} s ({:+.0%})'.format(
+                      old['seconds'], new['seconds'],
+                      new['seconds'] / old['seconds'] - 1))
+        if regressions:
+            return 1
+        print('no regressions against', args.baseline)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
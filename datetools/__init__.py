@@ -0,0 +1,99 @@
+"""Array-oriented helpers for the date and time analyses in the notebook.
+
+The notebook works one ``date``/``datetime`` object at a time, which is the
+clearest way to learn the API but does not scale to fleet-sized data. The
+functions here operate on whole columns held as numpy integer arrays (epoch
+seconds or day counts) and agree with the standard library results.
+
+Names are imported from their submodules on first use, so ``import
+datetools`` (and the command line, ``python -m datetools``) does not load
+numpy, pandas or tzdata until something needs them.
+"""
+
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'NAT': '_civil',
+    'WallTimeProblems': 'ambiguity',
+    'audit_trips': 'ambiguity',
+    'find_wall_time_problems': 'ambiguity',
+    'is_ambiguous': 'ambiguity',
+    'is_nonexistent': 'ambiguity',
+    'calendar_fields': 'buckets',
+    'calendar_histogram': 'buckets',
+    'DateCatalog': 'catalog',
+    'convert_pickle': 'catalog',
+    'open_catalog': 'catalog',
+    'write_catalog': 'catalog',
+    'write_catalog_blocks': 'catalog',
+    'CompiledFormat': 'formats',
+    'compile_format': 'formats',
+    'infer_format': 'formats',
+    'register_format': 'formats',
+    'CalendarCounter': 'counters',
+    'DateIndex': 'dateindex',
+    'TripDurations': 'durations',
+    'trip_durations': 'durations',
+    'LocalTimes': 'epochs',
+    'epochs_to_local': 'epochs',
+    'fromtimestamps': 'epochs',
+    'local_fields': 'epochs',
+    'ZoneFanout': 'fanout',
+    'fan_out': 'fanout',
+    'format_isoformat': 'formatting',
+    'format_timestamps': 'formatting',
+    'write_timestamps': 'formatting',
+    'instrumented': 'instrument',
+    'recording': 'instrument',
+    'IntervalIndex': 'intervals',
+    'ingest_files': 'ingest',
+    'read_trip_file': 'ingest',
+    'parse_timestamps': 'parsing',
+    'ZoneRegistry': 'registry',
+    'attach_zones': 'registry',
+    'preload_zones': 'registry',
+    'publish_zones': 'registry',
+    'GroupedResampled': 'resampling',
+    'Resampled': 'resampling',
+    'Resampler': 'resampling',
+    'group_resample': 'resampling',
+    'resample': 'resampling',
+    'RideSummary': 'rides',
+    'iter_rides': 'rides',
+    'SortedDates': 'sorting',
+    'argsort_dates': 'sorting',
+    'DurationStats': 'stats',
+    'generate_dates': 'synthetic',
+    'generate_trips': 'synthetic',
+    'write_date_catalog': 'synthetic',
+    'write_rides': 'synthetic',
+    'write_start_times': 'synthetic',
+    'TripTable': 'trips',
+    'ZoneTable': 'zones',
+    'available_zones': 'zones',
+    'compile_all': 'zones',
+    'compile_zone': 'zones',
+    'convert': 'zones',
+    'fixed_zone': 'zones',
+    'get_zone': 'zones',
+    'localize': 'zones',
+    'to_local': 'zones',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError("module %r has no attribute %r"
+                             % (__name__, name)) from None
+    value = getattr(importlib.import_module('.' + module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,102 @@
+"""Vectorized proleptic Gregorian calendar arithmetic.
+
+These are the array versions of ``date.toordinal()`` and ``date.fromordinal()``
+that the rest of the package builds on. Days are counted from the Unix epoch
+(1970-01-01 is day 0) so that a day count times 86400 is an epoch second.
+"""
+
+import numpy as np
+
+# Sentinel for missing values; it is the bit pattern numpy uses for NaT, so
+# ``values.view('datetime64[s]')`` turns it into NaT for free.
+NAT = np.iinfo(np.int64).min
+
+# date(1970, 1, 1).toordinal()
+EPOCH_ORDINAL = 719163
+
+SECONDS_PER_DAY = 86400
+
+
+def as_seconds(values):
+    """int64 epoch seconds for epoch seconds or ``datetime64`` values.
+
+    ``datetime64`` of any unit (pandas hands out ``[ns]``) is floored to
+    whole seconds, and NaT becomes ``NAT``; anything else is read as
+    seconds already.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind == 'M':
+        return values.astype('datetime64[s]').view(np.int64)
+    return values.astype(np.int64, copy=False)
+
+
+def as_float(values):
+    """float64 values with ``NAT`` read as NaN.
+
+    Integer columns mark missing values with ``NAT`` (``TripTable.durations``
+    does), which a plain float cast turns into -9.2e18; consumers that
+    skip NaN use this instead.
+    """
+    values = np.asarray(values)
+    result = values.astype(np.float64, copy=False)
+    missing = values == NAT
+    if missing.any():
+        result = np.where(missing, np.nan, result)
+    return result
+
+
+def as_days(values, unit='D'):
+    """Days since 1970-01-01 for ``date.toordinal()`` values (``unit='D'``),
+    epoch seconds (``unit='s'``) or ``datetime64`` values of any unit."""
+    values = np.asarray(values)
+    if values.dtype.kind == 'M':
+        return values.astype('datetime64[D]').view(np.int64)
+    values = values.astype(np.int64, copy=False)
+    if unit == 'D':
+        return values - EPOCH_ORDINAL
+    if unit == 's':
+        return values // SECONDS_PER_DAY
+    raise ValueError("unit must be 'D' (ordinals) or 's' (epoch seconds)")
+
+
+def days_from_civil(year, month, day):
+    """Return days since 1970-01-01 for arrays of year, month and day."""
+    y = np.asarray(year, dtype=np.int64)
+    m = np.asarray(month, dtype=np.int64)
+    d = np.asarray(day, dtype=np.int64)
+    y = y - (m <= 2)
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * np.where(m > 2, m - 3, m + 9) + 2) // 5 + d - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def civil_from_days(days):
+    """Return ``(year, month, day)`` arrays for days since 1970-01-01."""
+    z = np.asarray(days, dtype=np.int64) + 719468
+    era = z // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = np.where(mp < 10, mp + 3, mp - 9)
+    year = yoe + era * 400 + (month <= 2)
+    return year, month, day
+
+
+def is_leap(year):
+    """Return a boolean array that is True for Gregorian leap years."""
+    y = np.asarray(year, dtype=np.int64)
+    return (y % 4 == 0) & ((y % 100 != 0) | (y % 400 == 0))
+
+
+_DAYS_IN_MONTH = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31],
+                          dtype=np.int64)
+
+
+def days_in_month(year, month):
+    """Return the number of days in each (year, month) pair."""
+    m = np.asarray(month, dtype=np.int64)
+    return _DAYS_IN_MONTH[np.clip(m, 0, 12)] + ((m == 2) & is_leap(year))
@@ -0,0 +1,92 @@
+"""Bulk detection of ambiguous and nonexistent wall-clock times.
+
+The notebook's "Finding ambiguous datetimes" step calls
+``tz.datetime_ambiguous`` on the start and the end of every trip. Every
+offset change of a zone produces one interval of wall-clock time that is
+either repeated (the clocks went back, so the times are ambiguous) or
+skipped (the clocks went forward, so the times never existed). Those
+intervals are sorted and disjoint, so one ``searchsorted`` classifies a
+whole array of wall times.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from ._civil import as_seconds
+from .instrument import instrumented
+from .zones import get_zone
+
+
+class WallTimeProblems(NamedTuple):
+    """Boolean masks over the input wall times."""
+    ambiguous: np.ndarray      # repeated by a fall-back change
+    nonexistent: np.ndarray    # skipped by a spring-forward change
+
+    @property
+    def ambiguous_index(self):
+        return np.flatnonzero(self.ambiguous)
+
+    @property
+    def nonexistent_index(self):
+        return np.flatnonzero(self.nonexistent)
+
+
+def problem_intervals(zone):
+    """Return ``(starts, ends, repeated)`` wall-time intervals for ``zone``.
+
+    ``[starts[i], ends[i])`` is repeated (``repeated[i]`` True) or skipped
+    wall time around one transition.
+    """
+    table = get_zone(zone)
+    cache = table.__dict__.setdefault('_wall_cache', {})
+    if 'problems' not in cache:
+        starts = table.wall_transitions(1)[1:]
+        ends = table.wall_transitions(0)[1:]
+        changed = starts < ends
+        repeated = table.offsets[1:] < table.offsets[:-1]
+        cache['problems'] = (starts[changed], ends[changed], repeated[changed])
+    return cache['problems']
+
+
+@instrumented('ambiguity')
+def find_wall_time_problems(wall, zone):
+    """Classify wall-clock epoch seconds (or ``datetime64`` values) in
+    ``zone`` in a single pass."""
+    wall = as_seconds(wall)
+    starts, ends, repeated = problem_intervals(zone)
+    if not len(starts):
+        none = np.zeros(wall.shape, dtype=bool)
+        return WallTimeProblems(none, none.copy())
+    index = np.searchsorted(starts, wall, side='right') - 1
+    safe = np.maximum(index, 0)
+    inside = (index >= 0) & (wall < ends[safe])
+    return WallTimeProblems(inside & repeated[safe], inside & ~repeated[safe])
+
+
+def is_ambiguous(wall, zone):
+    """Array form of ``tz.datetime_ambiguous`` for naive wall times."""
+    return find_wall_time_problems(wall, zone).ambiguous
+
+
+def is_nonexistent(wall, zone):
+    """Array form of ``not tz.datetime_exists`` for naive wall times."""
+    return find_wall_time_problems(wall, zone).nonexistent
+
+
+def audit_trips(trips, zone):
+    """Indices of trips whose start or end is ambiguous or nonexistent.
+
+    ``trips`` is a ``TripTable`` (or anything with ``start``/``end``
+    wall-clock arrays). Returns a dict of index arrays keyed by
+    ``'ambiguous_start'``, ``'ambiguous_end'``, ``'nonexistent_start'`` and
+    ``'nonexistent_end'``.
+    """
+    start = find_wall_time_problems(trips.start, zone)
+    end = find_wall_time_problems(trips.end, zone)
+    return {
+        'ambiguous_start': start.ambiguous_index,
+        'ambiguous_end': end.ambiguous_index,
+        'nonexistent_start': start.nonexistent_index,
+        'nonexistent_end': end.nonexistent_index,
+    }
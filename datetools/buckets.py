@@ -0,0 +1,124 @@
+"""Calendar fields and histograms for whole arrays of dates.
+
+The notebook reads calendar fields off one object at a time:
+``hurricane.month``, ``hurricane_andrew.weekday()``, ``strftime("%Y-%j")``.
+``calendar_fields`` computes the same fields -- plus the ISO year and week
+of ``date.isocalendar()`` -- for an array of day ordinals or epoch seconds,
+working through it in fixed-size blocks and storing each field in the
+smallest integer type that holds it. ``calendar_histogram`` counts events
+per value of one field with ``np.bincount``, again block by block, so even
+very large arrays are counted without materializing any field.
+"""
+
+import numpy as np
+
+from ._civil import as_days, civil_from_days, days_from_civil, is_leap
+
+FIELDS = ('year', 'month', 'day', 'weekday', 'day_of_year', 'iso_year',
+          'iso_week')
+
+_DTYPES = {
+    'year': np.int32,
+    'month': np.int8,
+    'day': np.int8,
+    'weekday': np.int8,
+    'day_of_year': np.int16,
+    'iso_year': np.int32,
+    'iso_week': np.int8,
+}
+
+# Smallest and largest value of each field with a fixed range
+_RANGES = {
+    'month': (1, 12),
+    'day': (1, 31),
+    'weekday': (0, 6),
+    'day_of_year': (1, 366),
+    'iso_week': (1, 53),
+}
+
+_BLOCK = 1 << 20
+
+
+def _compute(days, wanted):
+    """The ``wanted`` fields for a block of day counts."""
+    out = {}
+    iso = wanted & {'iso_year', 'iso_week'}
+    if iso or wanted & {'year', 'month', 'day', 'day_of_year'}:
+        year, month, day = civil_from_days(days)
+        day_of_year = days - days_from_civil(year, 1, 1) + 1
+        out.update(year=year, month=month, day=day, day_of_year=day_of_year)
+    weekday = (days + 3) % 7
+    out['weekday'] = weekday
+    if iso:
+        # The ISO year is the year of the Thursday in the same week, which
+        # is at most three days away
+        thursday = day_of_year - weekday + 3
+        year_length = 365 + is_leap(year)
+        before = thursday < 1
+        after = thursday > year_length
+        out['iso_year'] = year - before + after
+        thursday = np.where(before, thursday + 365 + is_leap(year - 1),
+                            np.where(after, thursday - year_length, thursday))
+        out['iso_week'] = (thursday - 1) // 7 + 1
+    return out
+
+
+def _check_fields(fields):
+    if isinstance(fields, str):
+        fields = (fields,)
+    unknown = set(fields) - set(FIELDS)
+    if unknown:
+        raise ValueError("unknown calendar field(s): %s"
+                         % ', '.join(sorted(unknown)))
+    return tuple(fields)
+
+
+def calendar_fields(values, unit='D', fields=FIELDS):
+    """Calendar fields of an array of dates as a dict of arrays.
+
+    ``values`` are ``date.toordinal()`` ordinals (``unit='D'``, as in a date
+    catalog), epoch seconds (``unit='s'``, as in a ``TripTable``) or a
+    ``datetime64`` array. ``weekday`` is Monday=0 as in ``date.weekday()``;
+    ``iso_year`` and ``iso_week`` match ``date.isocalendar()``.
+    """
+    fields = _check_fields(fields)
+    n = len(values)
+    out = {name: np.empty(n, dtype=_DTYPES[name]) for name in fields}
+    wanted = set(fields)
+    for i in range(0, n, _BLOCK):
+        block = _compute(as_days(values[i:i + _BLOCK], unit), wanted)
+        for name in fields:
+            out[name][i:i + _BLOCK] = block[name]
+    return out
+
+
+def calendar_histogram(values, field, unit='D'):
+    """Count dates per value of ``field``.
+
+    Returns ``(labels, counts)``: every value of the field's range (months
+    1-12, weekdays 0-6, ...) or, for ``year`` and ``iso_year``, every year
+    from the first to the last, with zero counts where there are no dates.
+    """
+    field, = _check_fields(field)
+    low, high = _RANGES.get(field, (None, None))
+    counts = np.zeros(0 if low is None else high - low + 1, dtype=np.int64)
+    for i in range(0, len(values), _BLOCK):
+        block = _compute(as_days(values[i:i + _BLOCK], unit), {field})[field]
+        if low is None:
+            if not len(block):
+                continue
+            first = int(block.min())
+            if not len(counts):
+                low = first
+            elif first < low:
+                counts = np.concatenate(
+                    [np.zeros(low - first, dtype=np.int64), counts])
+                low = first
+        part = np.bincount(block - low)
+        if len(part) > len(counts):
+            counts = np.concatenate(
+                [counts, np.zeros(len(part) - len(counts), dtype=np.int64)])
+        counts[:len(part)] += part
+    if low is None:
+        low = 0
+    return np.arange(low, low + len(counts)), counts
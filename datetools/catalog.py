@@ -0,0 +1,155 @@
+"""Memory-mapped binary catalogs of dates.
+
+The notebook loads ``florida_hurricane_dates`` with ``pickle.load``, which
+builds one ``datetime.date`` object per event every time a process starts.
+A date catalog stores the same dates as a fixed 32-byte header followed by a
+little-endian int32 array of proleptic Gregorian ordinals
+(``date.toordinal()``). ``open_catalog`` maps the file instead of reading
+it, so opening is constant-time and processes that open the same catalog
+share its pages through the OS page cache.
+
+Header layout (little-endian)::
+
+    8s  magic     b'DTCATLG1'
+    I   version   1
+    I   flags     bit 0 set if the ordinals are sorted
+    Q   count     number of dates
+    8x  reserved
+"""
+
+import mmap
+import os
+import pickle
+import struct
+from datetime import date
+
+import numpy as np
+
+from ._civil import EPOCH_ORDINAL
+
+MAGIC = b'DTCATLG1'
+VERSION = 1
+FLAG_SORTED = 1
+
+_HEADER = struct.Struct('<8sIIQ8x')
+HEADER_SIZE = _HEADER.size
+
+
+def _as_ordinals(dates):
+    if isinstance(dates, np.ndarray) and dates.dtype.kind in 'iu':
+        return dates.astype('<i4')
+    return np.fromiter((d.toordinal() for d in dates), dtype='<i4')
+
+
+def write_catalog(path, dates):
+    """Write ``dates`` (``date`` objects or an array of ordinals) to ``path``.
+
+    The file is written next to ``path`` and renamed into place, so readers
+    never see a half-written catalog.
+    """
+    return write_catalog_blocks(path, [_as_ordinals(dates)])
+
+
+def write_catalog_blocks(path, blocks):
+    """Write a catalog from an iterable of ordinal arrays, one at a time.
+
+    Only one block is held in memory, so catalogs larger than memory can be
+    written. The sorted flag and count are filled in once the last block is
+    written. Returns the number of dates.
+    """
+    tmp = '%s.tmp%d' % (path, os.getpid())
+    count = 0
+    is_sorted = True
+    previous = None
+    with open(tmp, 'wb') as f:
+        f.write(bytes(HEADER_SIZE))
+        for block in blocks:
+            ordinals = np.asarray(block).astype('<i4', copy=False)
+            if not len(ordinals):
+                continue
+            if is_sorted:
+                is_sorted = bool(np.all(ordinals[1:] >= ordinals[:-1])) and (
+                    previous is None or ordinals[0] >= previous)
+                previous = ordinals[-1]
+            f.write(ordinals.tobytes())
+            count += len(ordinals)
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, VERSION, FLAG_SORTED if is_sorted else 0,
+                             count))
+    os.replace(tmp, path)
+    return count
+
+
+def convert_pickle(pickle_path, catalog_path):
+    """Convert a pickled list of dates (such as
+    ``florida_hurricane_dates.pkl``) into a catalog file."""
+    with open(pickle_path, 'rb') as f:
+        dates = pickle.load(f)
+    write_catalog(catalog_path, dates)
+    return len(dates)
+
+
+class DateCatalog:
+    """A read-only, memory-mapped date catalog.
+
+    ``ordinals`` is an int32 numpy view straight onto the mapped file.
+    Indexing and iteration produce ``datetime.date`` objects for code that
+    expects the pickled list.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < HEADER_SIZE:
+            self.close()
+            raise ValueError("%s is too short to be a date catalog" % path)
+        magic, version, flags, count = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError("%s is not a version %d date catalog"
+                             % (path, VERSION))
+        if len(self._mmap) < HEADER_SIZE + 4 * count:
+            self.close()
+            raise ValueError("%s is truncated" % path)
+        self.path = path
+        self.is_sorted = bool(flags & FLAG_SORTED)
+        self.ordinals = np.frombuffer(self._mmap, dtype='<i4', count=count,
+                                      offset=HEADER_SIZE)
+
+    def __len__(self):
+        return len(self.ordinals)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [date.fromordinal(o) for o in self.ordinals[index].tolist()]
+        return date.fromordinal(int(self.ordinals[index]))
+
+    def __iter__(self):
+        return map(date.fromordinal, self.ordinals.tolist())
+
+    def __repr__(self):
+        return '<DateCatalog %r: %d dates>' % (self.path, len(self))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def dates(self):
+        """All dates as a list, like the unpickled ``florida_hurricane_dates``."""
+        return list(self)
+
+    def days(self):
+        """Dates as int64 days since 1970-01-01."""
+        return self.ordinals.astype(np.int64) - EPOCH_ORDINAL
+
+    def close(self):
+        # Drop the numpy view first; mmap refuses to close while exported
+        self.ordinals = None
+        self._mmap.close()
+
+
+def open_catalog(path):
+    """Open the catalog at ``path`` without reading its contents."""
+    return DateCatalog(path)
@@ -0,0 +1,272 @@
+"""Command-line entry point: ``python -m datetools <command> ...``.
+
+Each command imports what it needs when it runs, so the cheap ones -- the
+help text and ``months`` on a pickled date list -- start without loading
+numpy, pandas or matplotlib.
+
+Commands:
+
+    parse      parse timestamp strings to epoch seconds or ISO 8601
+    durations  duration statistics of a bike_share.csv-style file
+    resample   ride counts and mean durations per hour/day/week/month
+    ambiguity  trips that start or end in a repeated or skipped hour
+    plot       plot ride counts per day or month to an image file
+    months     events per calendar month of a date list or catalog
+    generate   write synthetic rides, start times or a date catalog
+"""
+
+import argparse
+import sys
+
+DEFAULT_ZONE = 'America/New_York'
+
+
+def _lines(path):
+    stream = sys.stdin if path == '-' else open(path)
+    with stream:
+        return [line.rstrip('\r\n') for line in stream if line.strip()]
+
+
+def cmd_parse(args):
+    from ._civil import NAT
+    from .formatting import format_isoformat
+    from .parsing import parse_timestamps
+
+    values = _lines(args.file)
+    seconds = parse_timestamps(values, args.format, errors=args.errors)
+    missing = seconds == NAT
+    if args.iso:
+        text = [t.decode('ascii') for t in
+                format_isoformat(seconds[~missing]).tolist()]
+    else:
+        text = [str(s) for s in seconds[~missing].tolist()]
+    text = iter(text)
+    for is_missing in missing.tolist():
+        print('NaT' if is_missing else next(text))
+
+
+def _tables(path, chunksize):
+    from .rides import iter_rides
+    from .trips import TripTable
+
+    for chunk in iter_rides(path, chunksize):
+        yield TripTable.from_frame(chunk)
+
+
+def cmd_durations(args):
+    from ._civil import NAT
+    from .durations import trip_durations
+    from .stats import DurationStats
+
+    stats = DurationStats()
+    ambiguous = invalid = 0
+    for table in _tables(args.file, args.chunksize):
+        keep = (table.start != NAT) & (table.end != NAT)
+        if args.zone:
+            result = trip_durations(table.start, table.end, args.zone)
+            ambiguous += int(result.ambiguous.sum())
+            invalid += int(result.invalid.sum())
+            duration = result.duration
+            # Reported below as invalid, so not summarized as durations
+            keep &= ~result.invalid
+        else:
+            duration = table.durations()
+        stats.update(duration[keep])
+    for key, value in stats.summary().items():
+        print('{:<10} {}'.format(key, value))
+    if args.zone:
+        print('{:<10} {}'.format('ambiguous', ambiguous))
+        print('{:<10} {}'.format('invalid', invalid))
+
+
+def _resampled(args):
+    """Resample the file chunk by chunk; only per-bin totals are kept."""
+    from .resampling import Resampler
+
+    resampler = Resampler(args.freq, weighted=True)
+    for table in _tables(args.file, args.chunksize):
+        resampler.update(table.start, table.durations())
+    return resampler.result()
+
+
+def cmd_resample(args):
+    result = _resampled(args)
+    print('label,count,mean_duration')
+    for label, count, mean in zip(result.labels.astype(str).tolist(),
+                                  result.count.tolist(),
+                                  result.mean.tolist()):
+        print('%s,%d,%s' % (label, count, '' if mean != mean else
+                            '%.2f' % mean))
+
+
+def cmd_ambiguity(args):
+    from .ambiguity import audit_trips
+    from .formatting import format_timestamps
+
+    offset = 0
+    counts = dict.fromkeys(('ambiguous', 'nonexistent'), 0)
+    for table in _tables(args.file, args.chunksize):
+        found = audit_trips(table, args.zone)
+        for kind in counts:
+            for end in ('start', 'end'):
+                rows = found['%s_%s' % (kind, end)]
+                counts[kind] += len(rows)
+                times = format_timestamps(getattr(table, end)[rows],
+                                          '%Y-%m-%d %H:%M:%S')
+                for row, text in zip(rows.tolist(), times.tolist()):
+                    print('%s %s at %s (row %d)' % (
+                        kind.capitalize(), end, text.decode('ascii'),
+                        offset + row))
+        offset += len(table)
+    print('%d ambiguous, %d nonexistent' % (counts['ambiguous'],
+                                            counts['nonexistent']))
+
+
+def cmd_plot(args):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    result = _resampled(args)
+    fig, ax = plt.subplots()
+    ax.plot(result.labels, result.count)
+    ax.set_ylim(bottom=0)
+    ax.set_xlabel('Start date')
+    ax.set_ylabel('Rides')
+    fig.autofmt_xdate()
+    fig.savefig(args.output)
+    print(args.output)
+
+
+def _read_dates(path):
+    """A list of ``date`` objects from a pickle or a date catalog."""
+    with open(path, 'rb') as f:
+        magic = f.read(8)
+    if magic.startswith(b'DTCATLG'):
+        from .catalog import open_catalog
+        with open_catalog(path) as catalog:
+            return catalog.dates()
+    import pickle
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def cmd_months(args):
+    dates = _read_dates(args.file)
+    hurricanes_each_month = dict.fromkeys(range(1, 13), 0)
+    for day in dates:
+        hurricanes_each_month[day.month] += 1
+    print(hurricanes_each_month)
+    early = sum(hurricanes_each_month[m] for m in range(1, args.before))
+    print('before month %d: %d' % (args.before, early))
+
+
+def cmd_generate(args):
+    from . import synthetic
+
+    if args.kind == 'rides':
+        result = synthetic.write_rides(args.file, args.rows, args.seed,
+                                       zone=args.zone)
+        for key, value in result.items():
+            print('{:<16} {}'.format(key, value))
+    elif args.kind == 'times':
+        written = synthetic.write_start_times(args.file, args.rows, args.seed,
+                                              zone=args.zone)
+        print('{:<16} {}'.format('bytes', written))
+    else:
+        count = synthetic.write_date_catalog(args.file, args.rows, args.seed,
+                                             sort=args.sort)
+        print('{:<16} {}'.format('dates', count))
+
+
+def _count(text):
+    """Row counts such as ``1000000`` or ``1e6``."""
+    return int(float(text))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m datetools',
+        description='Array-based date and time analyses.')
+    parser.add_argument('--profile', metavar='PREFIX',
+                        help='time each stage and write PREFIX.json and '
+                        'PREFIX.txt')
+    parser.add_argument('--profile-memory', action='store_true',
+                        help='with --profile, also track peak memory per '
+                        'stage (much slower)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    p = commands.add_parser('parse', help='parse timestamp strings')
+    p.add_argument('file', nargs='?', default='-',
+                   help='one timestamp per line (default: stdin)')
+    p.add_argument('-f', '--format', help='strptime format (default: '
+                   'inferred)')
+    p.add_argument('--iso', action='store_true',
+                   help='print ISO 8601 instead of epoch seconds')
+    p.add_argument('--errors', choices=('raise', 'coerce'), default='raise',
+                   help="'coerce' prints NaT for unparseable lines")
+    p.set_defaults(func=cmd_parse)
+
+    def rides_command(name, func, help):
+        p = commands.add_parser(name, help=help)
+        p.add_argument('file', help='bike_share.csv-style file')
+        p.add_argument('--chunksize', type=int, default=100000)
+        p.set_defaults(func=func)
+        return p
+
+    p = rides_command('durations', cmd_durations, 'duration statistics')
+    p.add_argument('--zone', help='time zone of the wall-clock times, for '
+                   'daylight-saving-correct durations')
+
+    for name, func, help in (
+            ('resample', cmd_resample, 'counts and mean durations per bin'),
+            ('plot', cmd_plot, 'plot ride counts per bin')):
+        p = rides_command(name, func, help)
+        p.add_argument('--freq', default='D',
+                       help='h, D, W or M (default: D)')
+        if name == 'plot':
+            p.add_argument('-o', '--output', default='rides.png')
+
+    p = rides_command('ambiguity', cmd_ambiguity,
+                      'trips in repeated or skipped hours')
+    p.add_argument('--zone', default=DEFAULT_ZONE,
+                   help='time zone (default: %s)' % DEFAULT_ZONE)
+
+    p = commands.add_parser('months', help='events per calendar month')
+    p.add_argument('file', help='pickled list of dates or a date catalog')
+    p.add_argument('--before', type=int, default=6,
+                   help='also count events before this month (default: 6)')
+    p.set_defaults(func=cmd_months)
+
+    p = commands.add_parser('generate', help='write synthetic test data')
+    p.add_argument('kind', choices=('rides', 'times', 'catalog'),
+                   help='a bike_share.csv-style file, one start time per '
+                   'line, or a date catalog')
+    p.add_argument('file')
+    p.add_argument('-n', '--rows', type=_count, default=1000,
+                   help='number of rows or dates (default: 1000)')
+    p.add_argument('--seed', type=int, default=0)
+    p.add_argument('--zone', default=DEFAULT_ZONE,
+                   help='time zone of the wall-clock times (default: %s)'
+                   % DEFAULT_ZONE)
+    p.add_argument('--sort', action='store_true',
+                   help='write catalog dates in date order')
+    p.set_defaults(func=cmd_generate)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        if args.profile:
+            from .instrument import recording
+            with recording(memory=args.profile_memory) as run:
+                args.func(args)
+            run.write(args.profile)
+            print(run.text(), file=sys.stderr)
+        else:
+            args.func(args)
+    except (ImportError, OSError, ValueError) as exc:
+        print('datetools %s: error: %s' % (args.command, exc), file=sys.stderr)
+        return 1
+    return 0
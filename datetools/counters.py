@@ -0,0 +1,144 @@
+"""Incremental calendar counts of dated events.
+
+The notebook counts ``hurricanes_each_month`` and ``early_hurricanes`` by
+looping over the whole of ``florida_hurricane_dates``, and has to loop again
+whenever a date is added. ``CalendarCounter`` keeps per-month, per-year and
+per-day-of-year counts as running totals: adding events costs time in
+proportion to the new events only, two counters built from different parts
+of a catalog (e.g. in different processes) can be merged, and the state
+can be saved to a small JSON file and loaded back.
+"""
+
+import json
+import os
+from datetime import date
+
+import numpy as np
+
+from ._civil import EPOCH_ORDINAL, NAT, as_days
+from .buckets import _compute
+
+STATE_VERSION = 1
+
+
+def _as_days(values, unit):
+    """Days since 1970-01-01 for dates, ordinals, epochs or datetime64."""
+    if isinstance(values, date):
+        values = [values]
+    if hasattr(values, 'ordinals'):
+        # A DateCatalog: count its mapped ordinals without building dates
+        values, unit = values.ordinals, 'D'
+    if not isinstance(values, np.ndarray):
+        values = list(values)
+        if values and isinstance(values[0], date):
+            return np.fromiter((d.toordinal() for d in values), dtype=np.int64,
+                               count=len(values)) - EPOCH_ORDINAL
+        values = np.asarray(values)
+    days = as_days(values, unit)
+    if values.dtype.kind == 'M':
+        days = days[days != NAT]
+    return days
+
+
+class CalendarCounter:
+    """Event counts per calendar month, year and day of year.
+
+    ``update`` takes a batch of ``date`` objects, a ``DateCatalog``,
+    ``date.toordinal()`` values (``unit='D'``), epoch seconds (``unit='s'``)
+    or a ``datetime64`` array; ``add`` takes a single date.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self._months = np.zeros(13, dtype=np.int64)        # index 1-12
+        self._days_of_year = np.zeros(367, dtype=np.int64)  # index 1-366
+        self._years = {}
+
+    def __repr__(self):
+        return '<CalendarCounter: %d events in %d years>' % (self.total,
+                                                             len(self._years))
+
+    def __len__(self):
+        return self.total
+
+    def add(self, day):
+        """Count one event."""
+        return self.update([day])
+
+    def update(self, values, unit='D'):
+        """Count a batch of events."""
+        days = _as_days(values, unit)
+        if not len(days):
+            return self
+        fields = _compute(days, {'year', 'month', 'day_of_year'})
+        year, month = fields['year'], fields['month']
+        day_of_year = fields['day_of_year']
+        self.total += len(days)
+        self._months += np.bincount(month, minlength=13)
+        self._days_of_year += np.bincount(day_of_year, minlength=367)
+        years, counts = np.unique(year, return_counts=True)
+        for y, n in zip(years.tolist(), counts.tolist()):
+            self._years[y] = self._years.get(y, 0) + n
+        return self
+
+    def merge(self, other):
+        """Add the counts of another counter to this one."""
+        self.total += other.total
+        self._months += other._months
+        self._days_of_year += other._days_of_year
+        for y, n in other._years.items():
+            self._years[y] = self._years.get(y, 0) + n
+        return self
+
+    def __add__(self, other):
+        return CalendarCounter().merge(self).merge(other)
+
+    def months(self):
+        """Counts for months 1-12, like ``hurricanes_each_month``."""
+        return dict(zip(range(1, 13), self._months[1:].tolist()))
+
+    def years(self):
+        """Counts per year, for the years that have events."""
+        return dict(sorted(self._years.items()))
+
+    def days_of_year(self):
+        """Counts for days of the year 1-366 as an array (index 0 unused)."""
+        return self._days_of_year.copy()
+
+    def before_month(self, month):
+        """Events in months before ``month``: ``before_month(6)`` is the
+        notebook's ``early_hurricanes``."""
+        return int(self._months[1:month].sum())
+
+    def to_dict(self):
+        return {
+            'version': STATE_VERSION,
+            'total': self.total,
+            'months': self._months[1:].tolist(),
+            'days_of_year': self._days_of_year[1:].tolist(),
+            'years': {str(y): n for y, n in sorted(self._years.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        if state.get('version') != STATE_VERSION:
+            raise ValueError("unsupported counter state version %r"
+                             % state.get('version'))
+        counter = cls()
+        counter.total = int(state['total'])
+        counter._months[1:] = state['months']
+        counter._days_of_year[1:] = state['days_of_year']
+        counter._years = {int(y): int(n) for y, n in state['years'].items()}
+        return counter
+
+    def save(self, path):
+        """Write the counts to ``path`` as JSON, replacing it atomically."""
+        tmp = '%s.tmp%d' % (path, os.getpid())
+        with open(tmp, 'w') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,147 @@
+"""Sorted index for range queries on a date catalog.
+
+The notebook answers questions about ``florida_hurricane_dates`` with full
+scans: ``min()`` and ``max()`` for the first and last hurricane, a loop for
+how many came before June. ``DateIndex`` sorts the catalog's ordinals once
+and answers each such question with binary searches. Every query also takes
+arrays, so a batch of questions is one vectorized call.
+
+Dates can be given as ``date`` objects, ``date.toordinal()`` ordinals or
+``datetime64[D]`` values. A scalar question gets a scalar answer (a ``date``
+for ``nearest``); an array of questions gets an array of answers (ordinals
+for ``nearest``).
+"""
+
+from datetime import date
+
+import numpy as np
+
+from ._civil import EPOCH_ORDINAL, as_days
+from .buckets import calendar_fields
+from .sorting import argsort_dates
+
+
+def _ordinals(values):
+    """Ordinals for a date, an ordinal or an array of either."""
+    if isinstance(values, date):
+        return values.toordinal()
+    if isinstance(values, (list, tuple)) and values \
+            and isinstance(values[0], date):
+        return np.fromiter((d.toordinal() for d in values), dtype=np.int64,
+                           count=len(values))
+    values = np.asarray(values)
+    if values.dtype.kind == 'M':
+        return as_days(values) + EPOCH_ORDINAL
+    return values.astype(np.int64)
+
+
+def _scalar(result):
+    return result.item() if np.ndim(result) == 0 else result
+
+
+class DateIndex:
+    """Sorted ordinals of an event catalog with O(log n) queries."""
+
+    def __init__(self, ordinals, is_sorted=False):
+        ordinals = np.array(ordinals, dtype=np.int32)
+        if not is_sorted:
+            ordinals = ordinals[argsort_dates(ordinals)]
+        self.ordinals = ordinals
+        # Sorted day-of-year and month/day keys for windows across years
+        fields = calendar_fields(ordinals, fields=('month', 'day',
+                                                   'day_of_year'))
+        self._days_of_year = np.sort(fields['day_of_year'])
+        self._month_days = np.sort(fields['month'].astype(np.int16) * 32
+                                   + fields['day'])
+
+    @classmethod
+    def from_dates(cls, dates):
+        """Index a list of ``date`` objects such as the unpickled catalog."""
+        return cls(_ordinals(list(dates)))
+
+    @classmethod
+    def from_catalog(cls, catalog):
+        """Index a ``DateCatalog``; a sorted catalog is copied, not sorted."""
+        return cls(catalog.ordinals, is_sorted=catalog.is_sorted)
+
+    def __len__(self):
+        return len(self.ordinals)
+
+    def __repr__(self):
+        if not len(self):
+            return '<DateIndex: empty>'
+        return '<DateIndex: %d dates from %s to %s>' % (
+            len(self), self.first(), self.last())
+
+    def first(self):
+        """Earliest date, like ``min(florida_hurricane_dates)``."""
+        return date.fromordinal(int(self.ordinals[0]))
+
+    def last(self):
+        """Latest date, like ``max(florida_hurricane_dates)``."""
+        return date.fromordinal(int(self.ordinals[-1]))
+
+    def _bounds(self, start, stop):
+        lo = np.searchsorted(self.ordinals, _ordinals(start), side='left')
+        hi = np.searchsorted(self.ordinals, _ordinals(stop), side='left')
+        return lo, np.maximum(hi, lo)
+
+    def count_between(self, start, stop):
+        """Number of dates ``d`` with ``start <= d < stop``."""
+        lo, hi = self._bounds(start, stop)
+        return _scalar(hi - lo)
+
+    def count_before(self, stop):
+        """Number of dates before ``stop``."""
+        return _scalar(np.searchsorted(self.ordinals, _ordinals(stop)))
+
+    def between(self, start, stop):
+        """Ordinals of the dates in ``[start, stop)``, as a view."""
+        lo, hi = self._bounds(start, stop)
+        return self.ordinals[int(lo):int(hi)]
+
+    def dates_between(self, start, stop):
+        """The dates in ``[start, stop)`` as ``date`` objects."""
+        return [date.fromordinal(o) for o in self.between(start, stop).tolist()]
+
+    def nearest(self, day):
+        """The event closest to ``day``; ties go to the earlier event."""
+        if not len(self):
+            raise ValueError("nearest() on an empty index")
+        target = _ordinals(day)
+        at = np.searchsorted(self.ordinals, target)
+        before = self.ordinals[np.maximum(at - 1, 0)]
+        after = self.ordinals[np.minimum(at, len(self) - 1)]
+        pick = np.where((at > 0) & (target - before <= after - target),
+                        before, after)
+        if isinstance(day, date):
+            return date.fromordinal(int(pick))
+        return _scalar(pick)
+
+    def count_day_of_year(self, first, last):
+        """Number of dates, in any year, whose day of the year (1-366) is in
+        ``first..last``; a window with ``first > last`` wraps around the
+        new year."""
+        first = np.asarray(first)
+        last = np.asarray(last)
+        keys = self._days_of_year
+        lo = np.searchsorted(keys, first, side='left')
+        hi = np.searchsorted(keys, last, side='right')
+        wrapped = len(keys) - lo + hi
+        return _scalar(np.where(first <= last, np.maximum(hi - lo, 0),
+                                wrapped))
+
+    def count_season(self, start, stop):
+        """Number of dates, in any year, from ``start`` up to but not
+        including ``stop``, both ``(month, day)`` pairs:
+        ``count_season((1, 1), (6, 1))`` is the notebook's
+        ``early_hurricanes``. Wraps around the new year if ``start`` is
+        after ``stop``. Months and days may be arrays, e.g.
+        ``count_season((months, 1), (months, 15))`` for the first half of
+        each month in ``months``."""
+        keys = self._month_days
+        lo = np.searchsorted(keys, np.asarray(start[0]) * 32
+                             + np.asarray(start[1]))
+        hi = np.searchsorted(keys, np.asarray(stop[0]) * 32
+                             + np.asarray(stop[1]))
+        return _scalar(np.where(hi >= lo, hi - lo, len(keys) - lo + hi))
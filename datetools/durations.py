@@ -0,0 +1,103 @@
+"""Trip durations that are correct across daylight saving changes.
+
+The notebook's "Cleaning daylight saving data with fold" loop sets
+``tz.enfold`` on the end of every trip whose start is later than its end,
+converts both ends to UTC with ``astimezone`` and subtracts. ``trip_durations``
+does the same for whole arrays of wall-clock times: the fold of each end is
+picked so that the trip does not end before it starts, and rows where the
+wall times alone do not settle the duration are reported instead of being
+silently guessed.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from ._civil import NAT, as_seconds
+from .ambiguity import find_wall_time_problems
+from .instrument import instrumented
+from .zones import get_zone
+
+_NS_PER_SECOND = 1000000000
+
+
+class TripDurations(NamedTuple):
+    """Durations plus the rows whose duration is not certain."""
+    duration: np.ndarray    # int64; NAT where an end is missing
+    ambiguous: np.ndarray   # more than one non-negative reading exists
+    invalid: np.ndarray     # no non-negative reading, or a skipped wall time
+
+    @property
+    def unresolved(self):
+        return self.ambiguous | self.invalid
+
+    @property
+    def unresolved_index(self):
+        return np.flatnonzero(self.unresolved)
+
+
+def _split_wall(values):
+    """Return ``(seconds, nanoseconds)`` for epoch seconds or datetime64."""
+    values = np.asarray(values)
+    seconds = as_seconds(values)
+    if values.dtype.kind == 'M':
+        ns = values.astype('datetime64[ns]').view(np.int64)
+        return seconds, ns % _NS_PER_SECOND
+    return seconds, np.zeros(len(values), dtype=np.int64)
+
+
+@instrumented('trip_durations')
+def trip_durations(start, end, zone, unit='s'):
+    """Elapsed time of trips given as wall-clock times in ``zone``.
+
+    ``start`` and ``end`` are int64 wall-clock epoch seconds (as in
+    ``TripTable``) or ``datetime64`` arrays. ``unit`` is ``'s'`` for whole
+    seconds or ``'ns'`` for nanoseconds, which keeps sub-second parts of
+    ``datetime64`` input.
+
+    Each end is read as its first occurrence, except that the end of a trip
+    whose start is later than its end is read as the second occurrence --
+    the notebook's ``enfold`` rule -- so its results are reproduced. Trips
+    that touch a repeated hour and still allow more than one non-negative
+    duration are flagged ``ambiguous``; trips left with a negative duration
+    or with an end in a skipped hour are flagged ``invalid``.
+    """
+    if unit not in ('s', 'ns'):
+        raise ValueError("unit must be 's' or 'ns'")
+    table = get_zone(zone)
+    start, start_ns = _split_wall(start)
+    end, end_ns = _split_wall(end)
+    if start.shape != end.shape:
+        raise ValueError("start and end must have the same length")
+    missing = (start == NAT) | (end == NAT)
+    scale = _NS_PER_SECOND if unit == 'ns' else 1
+    extra = end_ns - start_ns if unit == 'ns' else 0
+
+    start_problems = find_wall_time_problems(start, table)
+    end_problems = find_wall_time_problems(end, table)
+    enfold = start > end
+    utc_start = table.to_utc(start, 0)
+    utc_end = table.to_utc(end, enfold)
+    duration = (utc_end - utc_start) * scale + extra
+
+    invalid = (duration < 0) | start_problems.nonexistent \
+        | end_problems.nonexistent
+    # Trips touching a repeated hour: try all four fold combinations
+    rows = np.flatnonzero((start_problems.ambiguous | end_problems.ambiguous)
+                          & ~missing)
+    ambiguous = np.zeros(len(start), dtype=bool)
+    if len(rows):
+        starts = np.stack([table.to_utc(start[rows], 0),
+                           table.to_utc(start[rows], 1)])
+        ends = np.stack([table.to_utc(end[rows], 0),
+                         table.to_utc(end[rows], 1)])
+        readings = ((ends[:, None, :] - starts[None, :, :]) * scale
+                    + (extra[rows] if unit == 'ns' else 0)).reshape(4, -1)
+        valid = readings >= 0
+        lowest = np.where(valid, readings, np.iinfo(np.int64).max).min(axis=0)
+        highest = np.where(valid, readings, -1).max(axis=0)
+        ambiguous[rows] = valid.any(axis=0) & (lowest != highest)
+
+    duration[missing] = NAT
+    invalid &= ~missing
+    return TripDurations(duration, ambiguous & ~invalid, invalid)
@@ -0,0 +1,105 @@
+"""Bulk conversion of Unix epochs to local wall-clock time.
+
+The notebook's ``timestamps`` example calls ``datetime.fromtimestamp(ts)``
+once per value, which uses whatever zone the host happens to be in. These
+functions take a whole array of Unix seconds, milliseconds or microseconds
+and an explicit zone, look up every offset with one binary search over the
+zone's compiled transitions (``datetools.zones``), and return wall-clock
+fields as arrays -- or, when objects are really needed, aware datetimes.
+"""
+
+import zoneinfo
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
+
+import numpy as np
+
+from ._civil import SECONDS_PER_DAY, civil_from_days
+from .zones import get_zone
+
+_SCALES = {'s': 1, 'ms': 1000, 'us': 1000000}
+
+
+class LocalTimes(NamedTuple):
+    """Wall-clock seconds plus what is needed to rebuild each instant."""
+    wall: np.ndarray          # local epoch seconds
+    microsecond: np.ndarray   # sub-second part, 0 for unit='s'
+    utc_offset: np.ndarray    # seconds east of UTC
+    fold: np.ndarray          # 1 for the second occurrence of a repeated time
+
+
+def split_epochs(values, unit='s'):
+    """Return ``(seconds, microseconds)`` for epochs in ``unit``."""
+    if unit not in _SCALES:
+        raise ValueError("unit must be one of %s" % ', '.join(_SCALES))
+    values = np.asarray(values, dtype=np.int64)
+    scale = _SCALES[unit]
+    if scale == 1:
+        return values, np.zeros(len(values), dtype=np.int64)
+    seconds, rest = np.divmod(values, scale)
+    return seconds, rest * (1000000 // scale)
+
+
+def epochs_to_local(values, zone, unit='s'):
+    """Convert Unix epochs to wall-clock time in ``zone``.
+
+    ``zone`` is anything ``datetools.zones.get_zone`` accepts: an IANA name,
+    a ``ZoneTable`` or a ``tzinfo``.
+    """
+    table = get_zone(zone)
+    utc, micro = split_epochs(values, unit)
+    index = table._index(utc)
+    offset = table.offsets[index]
+    # The second pass through a repeated hour: the offset just dropped and
+    # the wall time is still before where the old offset put the change
+    prev = table.offsets[np.maximum(index - 1, 0)]
+    fold = ((index > 0) & (offset < prev)
+            & (utc + offset < table.transitions[index] + prev))
+    return LocalTimes(utc + offset, micro, offset, fold.astype(np.int8))
+
+
+def local_fields(values, zone, unit='s'):
+    """Wall-clock fields of Unix epochs in ``zone`` as a dict of arrays.
+
+    Keys: year, month, day, hour, minute, second, microsecond, weekday
+    (Monday is 0, as in ``date.weekday()``), utc_offset and fold.
+    """
+    local = epochs_to_local(values, zone, unit)
+    days = local.wall // SECONDS_PER_DAY
+    secs = local.wall - days * SECONDS_PER_DAY
+    year, month, day = civil_from_days(days)
+    return {
+        'year': year,
+        'month': month,
+        'day': day,
+        'hour': secs // 3600,
+        'minute': secs // 60 % 60,
+        'second': secs % 60,
+        'microsecond': local.microsecond,
+        'weekday': (days + 3) % 7,
+        'utc_offset': local.utc_offset,
+        'fold': local.fold,
+    }
+
+
+def fromtimestamps(values, zone, unit='s', tzinfo=None):
+    """Aware datetimes for Unix epochs, like ``datetime.fromtimestamp(ts, tz)``.
+
+    The offsets are computed in bulk; only the final objects are built one
+    by one. They carry ``tzinfo`` if given, else ``zoneinfo.ZoneInfo`` for a
+    zone compiled from tzdata (``ZoneTable.key``) or a fixed ``timezone``
+    for a fixed offset, with ``fold`` set for repeated wall times.
+    """
+    table = get_zone(zone)
+    fields = local_fields(values, table, unit)
+    if tzinfo is None:
+        if table.key is not None:
+            tzinfo = zoneinfo.ZoneInfo(table.key)
+        else:
+            tzinfo = timezone(timedelta(seconds=int(table.offsets[-1])),
+                              table.name)
+    columns = [fields[k].tolist() for k in
+               ('year', 'month', 'day', 'hour', 'minute', 'second',
+                'microsecond', 'fold')]
+    return [datetime(y, mo, d, h, mi, s, us, tzinfo=tzinfo, fold=f)
+            for y, mo, d, h, mi, s, us, f in zip(*columns)]
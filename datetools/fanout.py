@@ -0,0 +1,151 @@
+"""One column of instants rendered in many time zones at once.
+
+The notebook converts ``onebike_datetimes[0]['start']`` into London,
+Kolkata and Apia time with one ``astimezone`` call per zone, and
+``ZoneTable.to_local`` would still binary-search each zone's transitions
+once per row per zone. ``fan_out`` normalizes the column to UTC once, then
+cuts the range it spans at every transition of every target zone. Within
+one cut segment no zone changes its offset, so a single ``searchsorted``
+over the cuts gives each row a segment number, and each zone's wall time,
+offset and abbreviation are lookups in a table with one entry per segment.
+Over a year or two of data that table has a few dozen entries, so the
+per-zone work is an add and two small gathers.
+
+Rows are handled in cache-sized blocks, and abbreviations are kept as
+codes into each zone's list of abbreviations, so no per-row objects are
+created until ``abbreviations`` or ``to_frame`` asks for them.
+"""
+
+import numpy as np
+
+from ._civil import NAT, as_seconds
+from .instrument import instrumented
+from .zones import get_zone
+
+_BLOCK = 1 << 16
+
+
+class ZoneFanout:
+    """Wall times, offsets and abbreviations of one column in many zones.
+
+    Row ``j`` of ``wall``, ``offset`` and ``abbr_codes`` belongs to zone
+    ``zones[j]``; ``abbrevs[j][abbr_codes[j]]`` is the abbreviation. Rows
+    whose instant is ``NAT`` have a ``NAT`` wall time, an offset of 0 and
+    an abbreviation code of -1.
+    """
+
+    def __init__(self, utc, zones, wall, offset, abbr_codes, abbrevs):
+        self.utc = utc
+        self.zones = zones
+        self.wall = wall
+        self.offset = offset
+        self.abbr_codes = abbr_codes
+        self.abbrevs = abbrevs
+
+    def __repr__(self):
+        return '<ZoneFanout: %d rows in %d zones>' % (len(self),
+                                                      len(self.zones))
+
+    def __len__(self):
+        return len(self.utc)
+
+    def _row(self, zone):
+        try:
+            return self.zones.index(zone)
+        except ValueError:
+            raise KeyError(zone) from None
+
+    def local(self, zone):
+        """Wall-clock epoch seconds in ``zone``."""
+        return self.wall[self._row(zone)]
+
+    def offsets(self, zone):
+        """UTC offsets in seconds in ``zone``."""
+        return self.offset[self._row(zone)]
+
+    def abbreviations(self, zone):
+        """Abbreviations in ``zone`` as an object array (``None`` for
+        ``NAT``)."""
+        row = self._row(zone)
+        names = np.append(self.abbrevs[row], None)
+        return names[self.abbr_codes[row]]
+
+    def to_frame(self):
+        """A wide pandas DataFrame with a ``(zone, field)`` column for each
+        zone's ``wall`` (datetime64), ``offset`` and ``abbr`` (categorical)
+        values."""
+        import pandas as pd
+        columns = {}
+        for row, zone in enumerate(self.zones):
+            columns[zone, 'wall'] = self.wall[row].view('datetime64[s]')
+            columns[zone, 'offset'] = self.offset[row]
+            columns[zone, 'abbr'] = pd.Categorical.from_codes(
+                self.abbr_codes[row], categories=list(self.abbrevs[row]))
+        return pd.DataFrame(columns, index=pd.DatetimeIndex(
+            self.utc.view('datetime64[s]'), name='utc'))
+
+
+@instrumented('fan_out')
+def fan_out(times, zones, source='UTC', fold=0):
+    """Render ``times`` in every zone of ``zones``; returns a ``ZoneFanout``.
+
+    ``times`` are epoch seconds or ``datetime64`` values: UTC instants by
+    default, or wall-clock times in ``source`` (read with ``fold`` as in
+    ``localize``), which are converted to UTC once. ``zones`` are anything
+    ``get_zone`` accepts; results are labelled with the table names.
+    """
+    times = as_seconds(times)
+    tables = [get_zone(zone) for zone in zones]
+    source = get_zone(source)
+    missing = times == NAT
+    any_missing = bool(missing.any())
+    utc = times if source.name == 'UTC' else source.to_utc(times, fold)
+    if any_missing:
+        utc = np.where(missing, NAT, utc)
+
+    valid = utc[~missing] if any_missing else utc
+    n, k = len(utc), len(tables)
+    if len(valid):
+        lo, hi = int(valid.min()), int(valid.max())
+    else:
+        lo = hi = 0
+    # Every instant in (lo, hi] at which some target zone changes offset;
+    # segment s starts at starts[s]
+    cuts = np.unique(np.concatenate(
+        [t.transitions[(t.transitions > lo) & (t.transitions <= hi)]
+         for t in tables] + [np.empty(0, np.int64)]))
+    starts = np.concatenate([[lo], cuts])
+    index = [t._index(starts) for t in tables]
+    seg_offset = np.array([t.offsets[i] for t, i in zip(tables, index)],
+                          dtype=np.int64).reshape(k, len(starts))
+    seg_codes = np.array([t.abbr_codes[i] for t, i in zip(tables, index)],
+                         dtype=np.int16).reshape(k, len(starts))
+
+    wall = np.empty((k, n), dtype=np.int64)
+    offset = np.empty((k, n), dtype=np.int32)
+    codes = np.empty((k, n), dtype=np.int16)
+    # Zones that do not change over the range need no lookups
+    constant = ((seg_offset == seg_offset[:, :1]).all(axis=1)
+                & (seg_codes == seg_codes[:, :1]).all(axis=1))
+    for first in range(0, n, _BLOCK):
+        block = utc[first:first + _BLOCK]
+        last = first + len(block)
+        segment = None
+        for row in range(k):
+            if constant[row]:
+                np.add(block, seg_offset[row, 0], out=wall[row, first:last])
+                offset[row, first:last] = seg_offset[row, 0]
+                codes[row, first:last] = seg_codes[row, 0]
+                continue
+            if segment is None:
+                segment = np.searchsorted(cuts, block, side='right')
+            off = seg_offset[row].take(segment)
+            np.add(block, off, out=wall[row, first:last])
+            offset[row, first:last] = off
+            codes[row, first:last] = seg_codes[row].take(segment)
+    if any_missing:
+        wall[:, missing] = NAT
+        offset[:, missing] = 0
+        codes[:, missing] = -1
+    return ZoneFanout(utc, [t.name for t in tables], wall, offset, codes,
+                      [t.abbrevs for t in tables])
@@ -0,0 +1,243 @@
+"""Compiled strptime formats and format inference.
+
+``datetime.strptime`` looks its format up in a small regex cache on every
+call, takes a lock and re-checks the locale before it matches anything. A
+``CompiledFormat`` does that work once: it holds the same regular expression
+the standard library would build, the directive handling for the numeric
+fields, and (for fixed-width formats) the byte layout used by the batch
+parser in ``datetools.parsing``. Formats with directives it does not handle
+natively (locale names, ``%z``, week numbers, ...) still get a
+``CompiledFormat``; it simply delegates every row to ``strptime``.
+
+``compile_format`` is memoized with an LRU cache, and ``infer_format`` picks
+the first of a list of candidate formats that parses every value of a small
+sample, so the full column is parsed once with a known format.
+"""
+
+import re
+from datetime import date, datetime
+from functools import lru_cache
+
+# The same sub-patterns _strptime.TimeRE uses for these directives
+_DIRECTIVE_PATTERNS = {
+    'd': r"(?P<d>3[0-1]|[1-2]\d|0[1-9]|[1-9]| [1-9])",
+    'f': r"(?P<f>[0-9]{1,6})",
+    'H': r"(?P<H>2[0-3]|[0-1]\d|\d)",
+    'j': (r"(?P<j>36[0-6]|3[0-5]\d|[1-2]\d\d|0[1-9]\d|00[1-9]|[1-9]\d"
+          r"|0[1-9]|[1-9])"),
+    'm': r"(?P<m>1[0-2]|0[1-9]|[1-9])",
+    'M': r"(?P<M>[0-5]\d|\d)",
+    'S': r"(?P<S>6[0-1]|[0-5]\d|\d)",
+    'y': r"(?P<y>\d\d)",
+    'Y': r"(?P<Y>\d\d\d\d)",
+    '%': '%',
+}
+
+# Directives the batch parser can read at fixed byte offsets
+_FIXED_WIDTHS = {'Y': 4, 'm': 2, 'd': 2, 'H': 2, 'M': 2, 'S': 2}
+
+# Tried in order by infer_format; month-first before day-first, as in the
+# notebook's '%m/%d/%Y %H:%M:%S' example
+COMMON_FORMATS = [
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d %H:%M:%S.%f',
+    '%Y-%m-%dT%H:%M:%S.%f',
+    '%Y-%m-%d %H:%M',
+    '%Y-%m-%d',
+    '%m/%d/%Y %H:%M:%S',
+    '%m/%d/%Y %H:%M',
+    '%m/%d/%Y',
+    '%d/%m/%Y %H:%M:%S',
+    '%d/%m/%Y %H:%M',
+    '%d/%m/%Y',
+    '%Y/%m/%d %H:%M:%S',
+    '%Y/%m/%d',
+    '%Y%m%d%H%M%S',
+    '%Y%m%d',
+]
+
+
+def register_format(fmt, first=False):
+    """Add ``fmt`` to the candidates tried by ``infer_format``."""
+    if fmt in COMMON_FORMATS:
+        COMMON_FORMATS.remove(fmt)
+    if first:
+        COMMON_FORMATS.insert(0, fmt)
+    else:
+        COMMON_FORMATS.append(fmt)
+
+
+def _split(fmt):
+    """Return ``('lit', text)``/``('dir', letter)`` tokens, or None."""
+    tokens = []
+    i = 0
+    while i < len(fmt):
+        if fmt[i] == '%':
+            if i + 1 >= len(fmt):
+                return None
+            tokens.append(('dir', fmt[i + 1]))
+            i += 2
+        else:
+            j = fmt.find('%', i)
+            j = len(fmt) if j < 0 else j
+            tokens.append(('lit', fmt[i:j]))
+            i = j
+    return tokens
+
+
+def _regex(tokens):
+    """Build the pattern _strptime.TimeRE.pattern() would produce."""
+    parts = []
+    for kind, value in tokens:
+        if kind == 'dir':
+            parts.append(_DIRECTIVE_PATTERNS[value])
+        else:
+            value = re.sub(r"([\\.^$*+?\(\){}\[\]|])", r"\\\1", value)
+            parts.append(re.sub(r'\s+', r'\\s+', value))
+    return re.compile(''.join(parts), re.IGNORECASE)
+
+
+def _layout(tokens):
+    """Byte layout for the batch parser, or None if not fixed-width."""
+    fields = {}
+    literals = []
+    pos = 0
+    for kind, value in tokens:
+        if kind == 'dir' and value == '%':
+            kind, value = 'lit', '%'
+        if kind == 'dir':
+            if value not in _FIXED_WIDTHS:
+                return None
+            fields[value] = (pos, _FIXED_WIDTHS[value])
+            pos += _FIXED_WIDTHS[value]
+        else:
+            # strptime is looser than a byte comparison (whitespace runs,
+            # case-insensitive letters), but rows it would still accept just
+            # fall back to it, so only non-ASCII literals are ruled out
+            if not value.isascii():
+                return None
+            for char in value:
+                literals.append((pos, ord(char)))
+                pos += 1
+    return pos, fields, literals
+
+
+class CompiledFormat:
+    """A strptime format prepared once for repeated parsing.
+
+    ``parse(text)`` returns exactly what ``datetime.strptime(text, fmt)``
+    returns and raises the same ``ValueError`` on bad input. ``layout`` is
+    the fixed byte layout used by the batch parser, or None.
+    """
+
+    def __init__(self, fmt):
+        self.format = fmt
+        self.regex = None
+        self.layout = None
+        tokens = _split(fmt)
+        if tokens is None:
+            return
+        directives = [v for k, v in tokens if k == 'dir' and v != '%']
+        if (any(d not in _DIRECTIVE_PATTERNS for d in directives)
+                or len(set(directives)) != len(directives)
+                or {'y', 'Y'} <= set(directives)
+                or 'j' in directives and {'m', 'd'} & set(directives)):
+            return
+        self.regex = _regex(tokens)
+        self.layout = _layout(tokens)
+
+    def __repr__(self):
+        return 'CompiledFormat(%r)' % self.format
+
+    def parse(self, text):
+        """Parse one string into a ``datetime``."""
+        if self.regex is None or not isinstance(text, str):
+            return datetime.strptime(text, self.format)
+        found = self.regex.match(text)
+        if found is None or found.end() != len(text):
+            # Let the standard library produce its own error message
+            return datetime.strptime(text, self.format)
+        return self._build(found.groupdict())
+
+    def _build(self, groups):
+        year = None
+        month = day = 1
+        hour = minute = second = fraction = 0
+        julian = None
+        for key, value in groups.items():
+            if key == 'Y':
+                year = int(value)
+            elif key == 'y':
+                year = int(value)
+                year += 2000 if year <= 68 else 1900
+            elif key == 'm':
+                month = int(value)
+            elif key == 'd':
+                day = int(value)
+            elif key == 'H':
+                hour = int(value)
+            elif key == 'M':
+                minute = int(value)
+            elif key == 'S':
+                second = int(value)
+            elif key == 'f':
+                fraction = int(value + '0' * (6 - len(value)))
+            elif key == 'j':
+                julian = int(value)
+        if julian is not None:
+            result = date.fromordinal(
+                (julian - 1) + date(1900 if year is None else year, 1, 1).toordinal())
+            year, month, day = result.year, result.month, result.day
+        elif year is None:
+            year = 1900
+        return datetime(year, month, day, hour, minute, second, fraction)
+
+    def matches(self, text):
+        """True if ``parse(text)`` would succeed."""
+        try:
+            self.parse(text)
+        except (ValueError, TypeError):
+            return False
+        return True
+
+
+@lru_cache(maxsize=128)
+def compile_format(fmt):
+    """Return the cached ``CompiledFormat`` for ``fmt``."""
+    return CompiledFormat(fmt)
+
+
+def infer_format(sample, candidates=None, errors='raise'):
+    """Return the first candidate format that parses every value in ``sample``.
+
+    Only non-empty strings (and bytes) are looked at; None, NaN and other
+    missing markers are ignored. With ``errors='coerce'`` the sample may
+    hold bad values: the candidate that parses the most of it wins (the
+    earlier one on a tie). Raises ``ValueError`` if no candidate parses any
+    value; pass a short sample (a few dozen rows), not a column.
+    """
+    values = [v.decode('ascii', 'replace') if isinstance(v, bytes) else v
+              for v in sample if isinstance(v, (str, bytes)) and v]
+    if not values:
+        raise ValueError("cannot infer a format from an empty sample")
+    candidates = candidates or COMMON_FORMATS
+    best, best_count = None, 0
+    for fmt in candidates:
+        compiled = compile_format(fmt)
+        if errors != 'coerce':
+            if all(compiled.matches(v) for v in values):
+                return fmt
+            continue
+        count = sum(compiled.matches(v) for v in values)
+        if count == len(values):
+            return fmt
+        if count > best_count:
+            best, best_count = fmt, count
+    if best is not None:
+        return best
+    compiled = [compile_format(fmt) for fmt in candidates]
+    for v in values:
+        if not any(c.matches(v) for c in compiled):
+            raise ValueError("no known format matches sample value %r" % v)
+    raise ValueError("no known format matches every sample value")
@@ -0,0 +1,207 @@
+"""Batch formatting of epoch and ordinal arrays as text.
+
+The notebook formats values one object at a time with ``isoformat()`` and
+``strftime()``. Here a whole array is formatted at once: every row of a
+fixed-width format has its fields at the same byte offsets, so the output is
+built as an ``(n, width)`` matrix of ASCII digits and literals and can be
+returned as a numpy bytes array, written into a caller's buffer, or
+streamed to a file without creating any ``datetime`` objects.
+
+Supported directives are the fixed-width numeric ones: ``%Y %m %d %H %M %S
+%j %y`` and ``%z``, plus ``%%`` and literal ASCII text. ``%Y`` is always
+four digits, as in ``isoformat()``.
+"""
+
+from datetime import timedelta
+
+import numpy as np
+
+from ._civil import (EPOCH_ORDINAL, SECONDS_PER_DAY, civil_from_days,
+                     days_from_civil)
+from .formats import _split
+from .instrument import instrumented
+
+ISO_FORMAT = '%Y-%m-%dT%H:%M:%S'
+ISO_DATE_FORMAT = '%Y-%m-%d'
+
+_WIDTHS = {'Y': 4, 'm': 2, 'd': 2, 'H': 2, 'M': 2, 'S': 2, 'j': 3, 'y': 2,
+           'z': 5}
+
+_ROWS_PER_WRITE = 1 << 20
+
+
+def _plan(fmt, iso_offset=False):
+    """Return ``(width, fields, literals)`` for a fixed-width format."""
+    tokens = _split(fmt)
+    if tokens is None:
+        raise ValueError("stray %% in format %r" % fmt)
+    fields = []
+    literals = []
+    pos = 0
+    for kind, value in tokens:
+        if kind == 'dir' and value == '%':
+            kind = 'lit'
+        if kind == 'dir':
+            if value not in _WIDTHS:
+                raise ValueError("directive %%%s cannot be formatted in bulk"
+                                 % value)
+            width = 6 if value == 'z' and iso_offset else _WIDTHS[value]
+            fields.append((value, pos, width))
+            pos += width
+        else:
+            if not value.isascii():
+                raise ValueError("only ASCII literals are supported")
+            literals.append((pos, value.encode('ascii')))
+            pos += len(value)
+    if not pos:
+        raise ValueError("format %r is empty" % fmt)
+    return pos, fields, literals
+
+
+def _offset_seconds(utc_offset, n):
+    if utc_offset is None:
+        return None
+    if isinstance(utc_offset, timedelta):
+        utc_offset = utc_offset // timedelta(seconds=1)
+    offset = np.asarray(utc_offset, dtype=np.int64)
+    return np.broadcast_to(offset, (n,))
+
+
+def _put(matrix, pos, width, value):
+    for k in range(width):
+        matrix[:, pos + width - 1 - k] = value % 10 + 48
+        value = value // 10
+
+
+def _render(matrix, seconds, fields, literals, offset):
+    for pos, text in literals:
+        matrix[:, pos:pos + len(text)] = np.frombuffer(text, dtype=np.uint8)
+
+    days = seconds // SECONDS_PER_DAY
+    secs = seconds - days * SECONDS_PER_DAY
+    need_date = any(f[0] in 'Ymdjy' for f in fields)
+    if need_date:
+        year, month, day = civil_from_days(days)
+        if np.any((year < 1) | (year > 9999)):
+            raise ValueError("year is out of range for formatting")
+    for directive, pos, width in fields:
+        if directive == 'Y':
+            _put(matrix, pos, width, year)
+        elif directive == 'y':
+            _put(matrix, pos, width, year % 100)
+        elif directive == 'm':
+            _put(matrix, pos, width, month)
+        elif directive == 'd':
+            _put(matrix, pos, width, day)
+        elif directive == 'j':
+            _put(matrix, pos, width, days - days_from_civil(year, 1, 1) + 1)
+        elif directive == 'H':
+            _put(matrix, pos, width, secs // 3600)
+        elif directive == 'M':
+            _put(matrix, pos, width, secs // 60 % 60)
+        elif directive == 'S':
+            _put(matrix, pos, width, secs % 60)
+        elif directive == 'z':
+            if offset is None:
+                raise ValueError("%z needs a utc_offset")
+            if np.any(offset % 60):
+                raise ValueError("only whole-minute offsets can be formatted")
+            matrix[:, pos] = np.where(offset < 0, ord('-'), ord('+'))
+            minutes = np.abs(offset) // 60
+            _put(matrix, pos + 1, 2, minutes // 60)
+            if width == 6:
+                matrix[:, pos + 3] = ord(':')
+            _put(matrix, pos + width - 2, 2, minutes % 60)
+
+
+def _prepare(values, unit, utc_offset):
+    values = np.asarray(values, dtype=np.int64)
+    if unit == 'D':
+        # Day ordinals as from date.toordinal(), as in a date catalog
+        seconds = (values - EPOCH_ORDINAL) * SECONDS_PER_DAY
+    elif unit == 's':
+        seconds = values
+    else:
+        raise ValueError("unit must be 's' (epoch seconds) or 'D' (ordinals)")
+    offset = _offset_seconds(utc_offset, len(values))
+    if offset is not None:
+        seconds = seconds + offset
+    return seconds, offset
+
+
+@instrumented('format')
+def format_timestamps(values, fmt=ISO_FORMAT, unit='s', utc_offset=None,
+                      out=None):
+    """Format an array of epoch seconds (or day ordinals) as text.
+
+    With ``utc_offset`` (seconds, a ``timedelta`` or a per-row array) the
+    values are taken as UTC, shifted to local time and the offset is
+    available to ``%z``; without it they are formatted as they are.
+    ``unit='D'`` takes ``date.toordinal()`` values instead of seconds.
+
+    Returns a numpy ``S<width>`` array, or fills ``out`` -- any writable
+    buffer of ``len(values) * width`` bytes -- and returns it.
+    """
+    width, fields, literals = _plan(fmt)
+    seconds, offset = _prepare(values, unit, utc_offset)
+    if out is None:
+        matrix = np.empty((len(seconds), width), dtype=np.uint8)
+    else:
+        matrix = np.frombuffer(out, dtype=np.uint8)
+        if matrix.size != len(seconds) * width:
+            raise ValueError("out must hold exactly %d bytes"
+                             % (len(seconds) * width))
+        matrix = matrix.reshape(len(seconds), width)
+    _render(matrix, seconds, fields, literals, offset)
+    if out is not None:
+        return out
+    return matrix.view('S%d' % width).reshape(-1)
+
+
+def _iso_format(unit, utc_offset):
+    if unit == 'D':
+        return ISO_DATE_FORMAT
+    return ISO_FORMAT if utc_offset is None else ISO_FORMAT + '%z'
+
+
+@instrumented('format')
+def format_isoformat(values, unit='s', utc_offset=None):
+    """Vectorized ``isoformat()``: ``YYYY-MM-DDTHH:MM:SS[+HH:MM]`` for
+    seconds, ``YYYY-MM-DD`` for ``unit='D'``."""
+    width, fields, literals = _plan(_iso_format(unit, utc_offset),
+                                    iso_offset=True)
+    seconds, offset = _prepare(values, unit, utc_offset)
+    matrix = np.empty((len(seconds), width), dtype=np.uint8)
+    _render(matrix, seconds, fields, literals, offset)
+    return matrix.view('S%d' % width).reshape(-1)
+
+
+@instrumented('format', rows=1)
+def write_timestamps(file, values, fmt=None, unit='s', utc_offset=None,
+                     newline=b'\n'):
+    """Write one formatted value per line to a binary file object.
+
+    ``fmt=None`` writes ``isoformat()`` text. Rows are rendered in blocks
+    into one reusable buffer, so memory use is bounded regardless of the
+    number of values. Returns the number of bytes written.
+    """
+    if fmt is None:
+        width, fields, literals = _plan(_iso_format(unit, utc_offset),
+                                        iso_offset=True)
+    else:
+        width, fields, literals = _plan(fmt)
+    literals = literals + [(width, newline)]
+    values = np.asarray(values, dtype=np.int64)
+    offsets = _offset_seconds(utc_offset, len(values))
+    buffer = np.empty((min(len(values), _ROWS_PER_WRITE), width + len(newline)),
+                      dtype=np.uint8)
+    written = 0
+    for i in range(0, len(values), _ROWS_PER_WRITE):
+        block = values[i:i + _ROWS_PER_WRITE]
+        offset = None if offsets is None else offsets[i:i + len(block)]
+        seconds, offset = _prepare(block, unit, offset)
+        matrix = buffer[:len(block)]
+        _render(matrix, seconds, fields, literals, offset)
+        file.write(memoryview(matrix).cast('B'))
+        written += matrix.nbytes
+    return written
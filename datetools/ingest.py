@@ -0,0 +1,55 @@
+"""Parallel ingestion of many bike_share-style CSV files.
+
+Production data arrives as one CSV per month per region. ``ingest_files``
+expands a glob, reads each file in its own worker process with the chunked
+reader from ``datetools.rides``, and merges the per-file ``TripTable``
+results into one table ordered by start time.
+"""
+
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .rides import iter_rides
+from .sorting import argsort_dates
+from .trips import TripTable
+
+
+def read_trip_file(path, chunksize=100000, fmt=None):
+    """Read one CSV file into a ``TripTable``, ``chunksize`` rows at a time."""
+    return TripTable.concat(TripTable.from_frame(chunk)
+                            for chunk in iter_rides(path, chunksize, fmt=fmt))
+
+
+def _read_job(job):
+    path, chunksize, fmt = job
+    return read_trip_file(path, chunksize, fmt)
+
+
+def ingest_files(pattern, workers=None, chunksize=100000, fmt=None):
+    """Read every file matching ``pattern`` and return one merged TripTable.
+
+    ``pattern`` is a glob string or a list of paths. Files are parsed by up
+    to ``workers`` processes (default: one per CPU, never more than the
+    number of files); ``chunksize`` is the number of rows each worker parses
+    at a time. The result is sorted by start time; trips with equal start
+    times keep file order, which is sorted path order for a glob and the
+    order given for a list of paths.
+    """
+    if isinstance(pattern, (str, os.PathLike)):
+        paths = sorted(glob.glob(os.fspath(pattern)))
+    else:
+        paths = list(pattern)
+    if not paths:
+        raise FileNotFoundError("no files match %r" % (pattern,))
+
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    jobs = [(path, chunksize, fmt) for path in paths]
+    if workers == 1:
+        tables = [_read_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            tables = list(pool.map(_read_job, jobs))
+
+    merged = TripTable.concat(tables)
+    return merged[argsort_dates(merged.start)]
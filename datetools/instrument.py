@@ -0,0 +1,267 @@
+"""Opt-in per-stage timing and memory instrumentation.
+
+The notebook is one flat sequence of cells, so when a run slows down there
+is no telling whether parsing, zone conversion, ambiguity repair or
+resampling is to blame. The pipeline functions of this package (reading,
+``parse_timestamps``, ``localize``/``to_local``/``convert``,
+``find_wall_time_problems``, ``trip_durations``, ``resample``, formatting)
+are wrapped as named stages. While recording is enabled every call adds
+its wall time, CPU time and row count to its stage, and with ``memory=True``
+the peak of ``tracemalloc``-traced memory above what was allocated when the
+stage began. While it is disabled (the default) a wrapped call costs one
+flag check.
+
+Timers and row counts cost a few microseconds per call, which is noise
+next to the array work of a stage. ``tracemalloc`` is another matter: it
+hooks every allocation and slows object-heavy code such as
+``pandas.read_csv`` severalfold, so memory tracking is a separate opt-in.
+
+    with recording() as run:
+        ...
+    run.write('profile')      # profile.json and profile.txt
+
+Times are inclusive: a stage that calls another stage includes it.
+Recording is process-wide and not meant for use from several threads.
+"""
+
+import functools
+import json
+import time
+import tracemalloc
+
+_enabled = False
+_memory = False
+_stack = []
+_stages = {}
+
+
+class StageStats:
+    """Totals for one named stage."""
+
+    __slots__ = ('name', 'calls', 'rows', 'wall', 'cpu', 'peak')
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.rows = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak = None
+
+    def to_dict(self):
+        return {
+            'stage': self.name,
+            'calls': self.calls,
+            'rows': self.rows,
+            'wall_seconds': self.wall,
+            'cpu_seconds': self.cpu,
+            'rows_per_second': self.rows / self.wall if self.wall else None,
+            'peak_bytes': self.peak,
+        }
+
+
+class _Stage:
+    """One running stage; see ``stage``."""
+
+    __slots__ = ('name', 'rows', 'wall', 'cpu', 'base', 'high')
+
+    def __init__(self, name, rows):
+        self.name = name
+        self.rows = rows or 0
+
+    def add_rows(self, n):
+        self.rows += n
+
+    def __enter__(self):
+        if _memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if _stack:
+                _stack[-1].high = max(_stack[-1].high, peak)
+            tracemalloc.reset_peak()
+            self.base = self.high = current
+        _stack.append(self)
+        self.cpu = time.process_time()
+        self.wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+        _stack.pop()
+        stats = _stages.get(self.name)
+        if stats is None:
+            stats = _stages[self.name] = StageStats(self.name)
+        stats.calls += 1
+        stats.rows += self.rows
+        stats.wall += wall
+        stats.cpu += cpu
+        if _memory:
+            self.high = max(self.high, tracemalloc.get_traced_memory()[1])
+            if _stack:
+                _stack[-1].high = max(_stack[-1].high, self.high)
+            stats.peak = max(stats.peak or 0, self.high - self.base)
+        return False
+
+
+class _NullStage:
+    """What ``stage`` returns while recording is disabled."""
+
+    __slots__ = ()
+
+    def add_rows(self, n):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL = _NullStage()
+
+
+def stage(name, rows=None):
+    """Context manager timing a block as stage ``name``; ``rows`` (or
+    ``add_rows`` on the returned object) counts the rows it handled."""
+    if not _enabled:
+        return _NULL
+    return _Stage(name, rows)
+
+
+def _length(value):
+    if isinstance(value, (bytes, bytearray, memoryview, str)):
+        return 0
+    try:
+        return len(value)
+    except TypeError:
+        return 0
+
+
+def instrumented(name, rows=0):
+    """Decorator recording every call of a function as stage ``name``.
+
+    The rows of a call are the length of positional argument number
+    ``rows``, or of the return value with ``rows='result'``.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            counted = 0
+            if rows != 'result' and len(args) > rows:
+                counted = _length(args[rows])
+            with _Stage(name, counted) as running:
+                result = func(*args, **kwargs)
+                if rows == 'result':
+                    running.rows = _length(result)
+            return result
+        return wrapper
+    return decorate
+
+
+def enable(memory=False):
+    """Start recording; ``memory=True`` also tracks peak memory per stage
+    (starting ``tracemalloc`` if it is not already running)."""
+    global _enabled, _memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _enabled = True
+    _memory = memory and tracemalloc.is_tracing()
+
+
+def disable():
+    """Stop recording; the totals so far are kept until ``reset``."""
+    global _enabled, _memory
+    _enabled = False
+    _memory = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """Discard the recorded totals."""
+    _stages.clear()
+
+
+def report():
+    """The recorded totals as a JSON-serializable dict."""
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'memory': _memory,
+        'stages': [s.to_dict() for s in
+                   sorted(_stages.values(), key=lambda s: -s.wall)],
+    }
+
+
+def format_report(data=None):
+    """A text table of ``report()`` (or an earlier report dict)."""
+    data = report() if data is None else data
+    lines = ['{:<24} {:>7} {:>13} {:>10} {:>10} {:>13} {:>10}'.format(
+        'stage', 'calls', 'rows', 'wall s', 'cpu s', 'rows/s', 'peak MB')]
+    for s in data['stages']:
+        lines.append('{:<24} {:>7,} {:>13,} {:>10.4f} {:>10.4f} {:>13} {:>10}'
+                     .format(s['stage'], s['calls'], s['rows'],
+                             s['wall_seconds'], s['cpu_seconds'],
+                             '' if not s['rows_per_second'] else
+                             '{:,.0f}'.format(s['rows_per_second']),
+                             '' if s['peak_bytes'] is None else
+                             '{:.1f}'.format(s['peak_bytes'] / 1e6)))
+    if 'wall_seconds' in data:
+        lines.append('{:<24} {:>7} {:>13} {:>10.4f} {:>10.4f}'.format(
+            'whole run', '', '', data['wall_seconds'], data['cpu_seconds']))
+    return '\n'.join(lines)
+
+
+def write_report(prefix, data=None):
+    """Write ``<prefix>.json`` and ``<prefix>.txt``; returns both paths."""
+    data = report() if data is None else data
+    paths = (prefix + '.json', prefix + '.txt')
+    with open(paths[0], 'w') as f:
+        json.dump(data, f, indent=1)
+    with open(paths[1], 'w') as f:
+        f.write(format_report(data) + '\n')
+    return paths
+
+
+class Recording:
+    """One instrumented run, used as a context manager: entering resets the
+    totals and enables recording; leaving disables it and keeps the report
+    in ``data``."""
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.data = None
+        self._started_tracing = False
+
+    def __enter__(self):
+        reset()
+        self._started_tracing = self.memory and not tracemalloc.is_tracing()
+        enable(self.memory)
+        self._cpu = time.process_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.data = report()
+        self.data['wall_seconds'] = time.perf_counter() - self._wall
+        self.data['cpu_seconds'] = time.process_time() - self._cpu
+        disable()
+        if self._started_tracing:
+            tracemalloc.stop()
+        return False
+
+    def text(self):
+        return format_report(self.data)
+
+    def write(self, prefix):
+        return write_report(prefix, self.data)
+
+
+def recording(memory=False):
+    """``with recording() as run: ...`` records one run; ``memory=True``
+    also tracks peak memory per stage."""
+    return Recording(memory)
@@ -0,0 +1,131 @@
+"""Interval index over trips for "in progress at" and overlap queries.
+
+With ``onebike_datetimes`` as a list of start/end dicts, finding the trips
+in progress at a given moment means checking every trip. ``IntervalIndex``
+answers it from sorted endpoints instead.
+
+Counts need only two sorted arrays: the trips in progress at ``t`` are the
+ones started by ``t`` minus the ones ended by ``t``. To list them, trips
+are grouped by duration into power-of-two classes and each class is sorted
+by start; a trip in a class with durations below ``2**L`` can only be in
+progress at ``t`` if it started in ``(t - 2**L, t]``, so each class is
+searched with two binary searches and only that slice is checked.
+
+A trip is in progress at ``t`` when ``start <= t < end`` and overlaps the
+window ``[a, b)`` when ``start < b`` and ``end > a``. Trips whose end is
+before their start, or that have a missing (``NAT``) end, are not indexed.
+"""
+
+import numpy as np
+
+from ._civil import NAT
+from .sorting import argsort_dates
+
+
+def _expand(lo, hi):
+    """Flatten the ranges ``[lo[i], hi[i])`` into ``(query, position)``."""
+    sizes = np.maximum(hi - lo, 0)
+    query = np.repeat(np.arange(len(lo)), sizes)
+    first = np.cumsum(sizes) - sizes
+    position = np.arange(sizes.sum()) - np.repeat(first - lo, sizes)
+    return query, position
+
+
+class IntervalIndex:
+    """Index of ``[start, end)`` intervals such as trips.
+
+    Query results are positions into the ``start``/``end`` arrays the index
+    was built from (rows of the ``TripTable``), in ascending order.
+    """
+
+    def __init__(self, start, end):
+        start = np.asarray(start, dtype=np.int64)
+        end = np.asarray(end, dtype=np.int64)
+        if start.shape != end.shape:
+            raise ValueError("start and end must have the same length")
+        valid = (start != NAT) & (end != NAT) & (end >= start)
+        rows = np.flatnonzero(valid)
+        start, end = start[rows], end[rows]
+        self.size = len(start)
+        self.skipped = len(valid) - len(rows)
+        self._starts = start[argsort_dates(start)]
+        self._ends = end[argsort_dates(end)]
+
+        # Duration class L holds durations below 2**L
+        level = np.zeros(len(rows), dtype=np.int64)
+        duration = end - start
+        positive = duration > 0
+        level[positive] = np.floor(np.log2(duration[positive])).astype(
+            np.int64) + 1
+        self._levels = []
+        for L in np.unique(level).tolist():
+            members = np.flatnonzero(level == L)
+            members = members[argsort_dates(start[members])]
+            self._levels.append((1 << L, start[members], end[members],
+                                 rows[members]))
+
+    @classmethod
+    def from_trips(cls, trips):
+        """Index the trips of a ``TripTable``."""
+        return cls(trips.start, trips.end)
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        return '<IntervalIndex: %d intervals in %d duration classes>' % (
+            self.size, len(self._levels))
+
+    def count_active(self, times):
+        """Number of intervals in progress at each of ``times``."""
+        times = np.asarray(times, dtype=np.int64)
+        return (np.searchsorted(self._starts, times, side='right')
+                - np.searchsorted(self._ends, times, side='right'))
+
+    def count_overlapping(self, low, high):
+        """Number of intervals overlapping each ``[low, high)`` window."""
+        low = np.asarray(low, dtype=np.int64)
+        high = np.asarray(high, dtype=np.int64)
+        count = (np.searchsorted(self._starts, high, side='left')
+                 - np.searchsorted(self._ends, low, side='right'))
+        return np.where(high > low, count, 0)
+
+    def _query(self, low, last):
+        """``(query, row)`` pairs of intervals with ``start <= last`` and
+        ``end > low``."""
+        queries, rows = [], []
+        for width, starts, ends, ids in self._levels:
+            # Anything starting by low - width has ended before low
+            lo = np.searchsorted(starts, low - width, side='right')
+            hi = np.searchsorted(starts, last, side='right')
+            query, position = _expand(lo, hi)
+            hit = ends[position] > low[query]
+            queries.append(query[hit])
+            rows.append(ids[position[hit]])
+        if not queries:
+            return np.empty(0, np.int64), np.empty(0, np.int64)
+        query = np.concatenate(queries)
+        row = np.concatenate(rows)
+        order = np.lexsort((row, query))
+        return query[order], row[order]
+
+    def stab_many(self, times):
+        """Intervals in progress at each of ``times``.
+
+        Returns ``(query, row)`` arrays: ``row[i]`` is in progress at
+        ``times[query[i]]``. Pairs are sorted by query, then row.
+        """
+        times = np.atleast_1d(np.asarray(times, dtype=np.int64))
+        return self._query(times, times)
+
+    def stab(self, time):
+        """Rows of the intervals in progress at ``time``."""
+        return self.stab_many([time])[1]
+
+    def overlapping(self, low, high):
+        """Rows of the intervals overlapping ``[low, high)``."""
+        if high <= low:
+            return np.empty(0, np.int64)
+        # start < high is start <= high - 1 for integer seconds
+        return self._query(np.array([low], dtype=np.int64),
+                           np.array([high - 1], dtype=np.int64))[1]
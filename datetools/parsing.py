@@ -0,0 +1,137 @@
+"""Batch parsing of fixed-layout timestamp strings.
+
+The notebook turns ``onebike_datetime_strings`` into datetimes with one
+``datetime.strptime`` call per value. For a column in a known fixed layout
+such as ``"%Y-%m-%d %H:%M:%S"`` every field sits at the same byte offsets, so
+the whole column can be decoded at once as a matrix of ASCII digits. Rows
+that do not fit the layout exactly (extra whitespace, unpadded fields,
+out-of-range values) are handed to ``strptime`` one by one, so the result is
+always what the per-row loop would have produced.
+
+Formats are compiled once through ``datetools.formats.compile_format``; when
+no format is given it is inferred from the first rows of the column.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from ._civil import NAT, SECONDS_PER_DAY, days_from_civil, days_in_month
+from .formats import compile_format, infer_format
+from .instrument import instrumented
+
+_UNIX_EPOCH = datetime(1970, 1, 1)
+
+
+def _as_byte_matrix(values, width):
+    """Return a ``(n, width + 1)`` uint8 matrix of the input strings.
+
+    The extra column catches strings longer than the layout; any row where
+    it is non-zero cannot be a match.
+    """
+    dtype = 'S%d' % (width + 1)
+    if isinstance(values, np.ndarray) and values.dtype.kind == 'S':
+        arr = values.astype(dtype)
+    else:
+        try:
+            arr = np.array(values, dtype=dtype)
+        except UnicodeEncodeError:
+            arr = np.array([v.encode('ascii', 'replace') if isinstance(v, str)
+                            else v for v in values], dtype=dtype)
+    return arr.reshape(-1).view(np.uint8).reshape(-1, width + 1)
+
+
+def _field(digits, offset, width):
+    value = digits[:, offset].astype(np.int64)
+    for k in range(offset + 1, offset + width):
+        value = value * 10 + digits[:, k]
+    return value
+
+
+def _to_seconds(dt):
+    """Seconds since the epoch for a naive or aware datetime, floored."""
+    if dt.tzinfo is not None:
+        dt = dt.replace(tzinfo=None) - dt.utcoffset()
+    return (dt - _UNIX_EPOCH) // timedelta(seconds=1)
+
+
+def _decode_text(value):
+    if isinstance(value, (bytes, bytearray, np.bytes_)):
+        return bytes(value).decode('ascii', 'replace')
+    return str(value)
+
+
+@instrumented('parse', rows='result')
+def parse_timestamps(values, fmt=None, errors='raise', sample_size=32):
+    """Parse a column of timestamp strings into int64 epoch seconds.
+
+    ``values`` can be any sequence of ``str``/``bytes``, a numpy string array
+    or a newline-separated bytes buffer. Naive values are read as wall-clock
+    seconds since 1970-01-01; aware values (``%z`` formats, which always take
+    the ``strptime`` path) are converted to UTC. Microseconds are dropped.
+    Without ``fmt`` the format is inferred from the first ``sample_size``
+    values (with ``errors='coerce'``, from those that parse).
+
+    With ``errors='raise'`` a row that ``strptime`` rejects raises its
+    ``ValueError``; with ``errors='coerce'`` it becomes ``NAT``. The result
+    can be viewed as ``datetime64[s]`` with ``.view('datetime64[s]')``.
+    """
+    if errors not in ('raise', 'coerce'):
+        raise ValueError("errors must be 'raise' or 'coerce'")
+
+    if isinstance(values, (bytes, bytearray, memoryview)):
+        values = bytes(values).splitlines()
+    elif not isinstance(values, (list, tuple, np.ndarray)):
+        # Rows are looked up by position below, whatever the index of a
+        # pandas Series
+        values = np.asarray(values, dtype=object)
+    if fmt is None:
+        fmt = infer_format(values[:sample_size], errors=errors)
+
+    compiled = compile_format(fmt)
+    if compiled.layout is None:
+        out = np.empty(len(values), dtype=np.int64)
+        bad = np.ones(len(values), dtype=bool)
+    else:
+        width = compiled.layout[0]
+        out, bad = _parse_fixed(_as_byte_matrix(values, width),
+                                *compiled.layout)
+
+    for i in np.flatnonzero(bad):
+        try:
+            out[i] = _to_seconds(compiled.parse(_decode_text(values[i])))
+        except ValueError:
+            if errors == 'raise':
+                raise
+            out[i] = NAT
+    return out
+
+
+def _parse_fixed(raw, width, fields, literals):
+    """Decode every row of ``raw`` that matches the layout exactly."""
+    digits = raw[:, :width] - np.uint8(ord('0'))
+    ok = raw[:, width] == 0
+    for directive, (offset, size) in fields.items():
+        ok &= (digits[:, offset:offset + size] <= 9).all(axis=1)
+    for offset, byte in literals:
+        ok &= raw[:, offset] == byte
+
+    def get(directive, default):
+        if directive in fields:
+            return _field(digits, *fields[directive])
+        return np.full(len(raw), default, dtype=np.int64)
+
+    year = get('Y', 1900)
+    month = get('m', 1)
+    day = get('d', 1)
+    hour = get('H', 0)
+    minute = get('M', 0)
+    second = get('S', 0)
+
+    ok &= (year >= 1) & (month >= 1) & (month <= 12) & (day >= 1)
+    ok &= day <= days_in_month(year, month)
+    ok &= (hour <= 23) & (minute <= 59) & (second <= 59)
+
+    out = (days_from_civil(year, month, day) * SECONDS_PER_DAY
+           + hour * 3600 + minute * 60 + second)
+    return out, ~ok
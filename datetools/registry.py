@@ -0,0 +1,279 @@
+"""Process-wide registry of compiled time zones.
+
+The notebook calls ``tz.gettz('America/New_York')``, ``'Europe/London'``,
+``'Asia/Kolkata'`` and ``'Pacific/Apia'`` again and again, and every worker
+process of a pool repeats the cold lookups. ``compile_zone`` serves tables
+from one ``ZoneRegistry`` per process:
+
+* zones listed in ``preload`` (or, for the default registry, in the
+  ``DATETOOLS_ZONES`` environment variable, comma-separated) are compiled
+  up front and never evicted;
+* other zones are compiled on first use and kept in a least-recently-used
+  cache of ``maxsize`` tables;
+* ``publish`` copies compiled tables into one ``multiprocessing``
+  shared-memory block, and ``attach`` (or a ``DATETOOLS_SHARED_ZONES``
+  environment variable naming the block, which spawned workers inherit)
+  turns that block into ``ZoneTable`` objects whose arrays are views of the
+  shared memory, so workers neither read tzdata nor copy the tables.
+
+Shared block layout: 8-byte magic, little-endian uint64 length of a JSON
+index, the index, then the arrays at 8-byte aligned offsets. The index maps
+each zone name to its abbreviations, its tzdata ``key`` and the offset and
+length of its ``transitions`` and ``offsets`` (int64), ``is_dst`` (uint8)
+and ``abbr_codes`` (int16) arrays.
+"""
+
+import json
+import os
+import struct
+from collections import OrderedDict
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .zones import ZoneTable, _compile_zone
+
+# The zones the notebook looks up
+NOTEBOOK_ZONES = ('America/New_York', 'Europe/London', 'Asia/Kolkata',
+                  'Pacific/Apia')
+
+PRELOAD_ENV = 'DATETOOLS_ZONES'
+SHARED_ENV = 'DATETOOLS_SHARED_ZONES'
+
+MAGIC = b'DTZONES1'
+_LENGTH = struct.Struct('<Q')
+_ARRAYS = (('transitions', np.int64), ('offsets', np.int64),
+           ('is_dst', np.uint8), ('abbr_codes', np.int16))
+
+
+def _align(n):
+    return (n + 7) & ~7
+
+
+class _AttachedMemory(shared_memory.SharedMemory):
+    """An attached block whose arrays may outlive it at interpreter exit."""
+
+    def __del__(self):
+        try:
+            self.close()
+        except BufferError:
+            # Zone tables still view the mapping; the OS unmaps it at exit
+            pass
+
+
+def _open_shared(name):
+    """Attach to an existing block without letting this process's resource
+    tracker unlink it at exit (it belongs to the publisher)."""
+    try:
+        return _AttachedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    # Python < 3.13 registers every attached block with the resource
+    # tracker. Workers started by multiprocessing share the publisher's
+    # tracker, where the registration is harmless (and must stay, the
+    # publisher unregisters it on unlink); a tracker of our own would
+    # unlink the block when this process exits.
+    #
+    # Whether the tracker is inherited shows in the private ``_fd`` of the
+    # module's tracker, which fork and spawn children get before any block
+    # is opened. The attribute is in CPython 3.8 to 3.12 (tested on 3.11;
+    # 3.13+ takes the ``track=False`` path above). If it is gone, assume a
+    # tracker of our own: unregistering from a shared one costs only a
+    # KeyError report from the publisher's tracker when it unlinks.
+    from multiprocessing import resource_tracker
+    tracker = getattr(resource_tracker, '_resource_tracker', None)
+    shared_tracker = getattr(tracker, '_fd', None) is not None
+    shm = _AttachedMemory(name=name)
+    if not shared_tracker:
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    return shm
+
+
+class SharedZones:
+    """A published shared-memory block of zone tables.
+
+    The publishing process owns the block: ``close()`` (or leaving a
+    ``with`` block) releases and unlinks it, after which workers can no
+    longer attach.
+    """
+
+    def __init__(self, shm, names):
+        self._shm = shm
+        self.name = shm.name
+        self.zones = names
+
+    def __repr__(self):
+        return '<SharedZones %s: %d zones, %d bytes>' % (
+            self.name, len(self.zones), self._shm.size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+class ZoneRegistry:
+    """Compiled zones by name: pinned preloads plus a bounded LRU cache."""
+
+    def __init__(self, maxsize=64, preload=()):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._pinned = {}
+        self._cache = OrderedDict()
+        self._attached = []
+        self.preload(preload)
+
+    def __repr__(self):
+        return '<ZoneRegistry: %d pinned, %d cached of %d>' % (
+            len(self._pinned), len(self._cache), self.maxsize)
+
+    def __contains__(self, name):
+        return name in self._pinned or name in self._cache
+
+    def __len__(self):
+        return len(self._pinned) + len(self._cache)
+
+    def names(self):
+        return list(self._pinned) + list(self._cache)
+
+    def get(self, name):
+        """The ``ZoneTable`` for ``name``, compiling it on a miss."""
+        table = self._pinned.get(name)
+        if table is not None:
+            self.hits += 1
+            return table
+        table = self._cache.get(name)
+        if table is not None:
+            self.hits += 1
+            self._cache.move_to_end(name)
+            return table
+        self.misses += 1
+        table = _compile_zone(name)
+        self._cache[name] = table
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return table
+
+    def preload(self, names):
+        """Compile ``names`` now and keep them for the life of the
+        registry."""
+        for name in names:
+            if name not in self._pinned:
+                table = self._cache.pop(name, None)
+                self._pinned[name] = table or _compile_zone(name)
+        return self
+
+    def clear(self):
+        """Drop the cached (not the preloaded) tables."""
+        self._cache.clear()
+
+    def publish(self, names=None):
+        """Copy the tables for ``names`` (default: every zone held) into a
+        new shared-memory block and return its ``SharedZones`` handle."""
+        names = list(self.names() if names is None else names)
+        tables = [self.get(name) for name in names]
+        index = {}
+        position = 0
+        for name, table in zip(names, tables):
+            entry = {'abbrevs': table.abbrevs.tolist(), 'key': table.key}
+            for field, dtype in _ARRAYS:
+                size = len(getattr(table, field)) * np.dtype(dtype).itemsize
+                entry[field] = [position, len(getattr(table, field))]
+                position = _align(position + size)
+            index[name] = entry
+        header = json.dumps(index).encode()
+        start = _align(len(MAGIC) + _LENGTH.size + len(header))
+
+        shm = shared_memory.SharedMemory(create=True,
+                                         size=max(start + position, 1))
+        buf = shm.buf
+        buf[:len(MAGIC)] = MAGIC
+        _LENGTH.pack_into(buf, len(MAGIC), len(header))
+        buf[len(MAGIC) + _LENGTH.size:len(MAGIC) + _LENGTH.size
+            + len(header)] = header
+        for name, table in zip(names, tables):
+            for field, dtype in _ARRAYS:
+                offset, count = index[name][field]
+                target = np.frombuffer(buf, dtype=dtype, count=count,
+                                       offset=start + offset)
+                target[:] = getattr(table, field)
+                del target
+        return SharedZones(shm, names)
+
+    def attach(self, name):
+        """Pin every zone of the shared block ``name`` without copying it.
+
+        Returns the zone names. The block stays mapped for the life of the
+        registry.
+        """
+        shm = _open_shared(name)
+        buf = shm.buf
+        if bytes(buf[:len(MAGIC)]) != MAGIC:
+            shm.close()
+            raise ValueError("shared memory %r is not a zone block" % name)
+        (length,) = _LENGTH.unpack_from(buf, len(MAGIC))
+        head = len(MAGIC) + _LENGTH.size
+        index = json.loads(bytes(buf[head:head + length]))
+        start = _align(head + length)
+        for zone, entry in index.items():
+            arrays = {}
+            for field, dtype in _ARRAYS:
+                offset, count = entry[field]
+                arrays[field] = np.frombuffer(buf, dtype=dtype, count=count,
+                                              offset=start + offset)
+            table = ZoneTable(zone, arrays['transitions'], arrays['offsets'],
+                              arrays['is_dst'].view(bool),
+                              arrays['abbr_codes'], entry['abbrevs'],
+                              entry.get('key'))
+            self._cache.pop(zone, None)
+            self._pinned[zone] = table
+        self._attached.append(shm)
+        return list(index)
+
+
+_default = None
+
+
+def default_registry():
+    """The process-wide registry behind ``compile_zone``.
+
+    Created on first use; it preloads the zones in ``DATETOOLS_ZONES`` and
+    attaches the block named in ``DATETOOLS_SHARED_ZONES``, if set.
+    """
+    global _default
+    if _default is None:
+        registry = ZoneRegistry()
+        shared = os.environ.get(SHARED_ENV)
+        if shared:
+            registry.attach(shared)
+        preload = os.environ.get(PRELOAD_ENV, '')
+        registry.preload(n.strip() for n in preload.split(',') if n.strip())
+        _default = registry
+    return _default
+
+
+def preload_zones(names=NOTEBOOK_ZONES):
+    """Pin ``names`` in the process-wide registry."""
+    return default_registry().preload(names)
+
+
+def publish_zones(names=None):
+    """Publish zones of the process-wide registry to shared memory; see
+    ``ZoneRegistry.publish``."""
+    return default_registry().publish(names)
+
+
+def attach_zones(name):
+    """Attach the process-wide registry to a published block. Suitable as
+    a pool ``initializer``, e.g.
+    ``ProcessPoolExecutor(initializer=attach_zones, initargs=(shared.name,))``.
+    """
+    return default_registry().attach(name)
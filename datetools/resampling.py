@@ -0,0 +1,374 @@
+"""Fixed-bin resampling of epoch arrays without pandas.
+
+The notebook bins rides with ``rides.resample('D', on='Start date')`` and
+``resample('M', ...)``. ``resample`` does the same binning on an int64
+array of epoch seconds: every timestamp maps to an integer bin number
+(hour, day, Monday-to-Sunday week or calendar month), and counts and sums
+per bin are ``np.bincount`` calls. The array is processed in blocks, so
+the only full-size allocation is the input itself, and ``Resampler``
+takes the blocks one at a time from a chunked reader.
+
+Bins and labels follow pandas: ``'h'`` and ``'D'`` bins are labelled with
+their start, ``'W'`` bins with the Sunday that ends the week, and ``'M'``
+bins with the last day of the month. Every bin from the first timestamp's
+to the last one's is present; empty bins have a count and sum of 0 and a
+mean of NaN. ``NAT`` timestamps are ignored.
+
+``group_resample`` is ``groupby(...).resample(...)``: each row's group code
+and bin number combine into one integer key, so counts, sums and means for
+every (group, bin) pair come from the same ``np.bincount`` calls, and exact
+medians from one counting sort of the keys plus ``np.partition`` per pair.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from ._civil import (NAT, SECONDS_PER_DAY, as_float, as_seconds,
+                     civil_from_days, days_from_civil)
+from .instrument import instrumented
+
+# Accepted spellings of each bin width
+FREQUENCIES = {
+    'h': 'h', 'H': 'h',
+    'D': 'D',
+    'W': 'W', 'W-SUN': 'W',
+    'M': 'M', 'ME': 'M',
+}
+
+_BLOCK = 1 << 20
+
+
+class Resampled(NamedTuple):
+    """Per-bin results of ``resample``."""
+    labels: np.ndarray   # datetime64[s], one per bin
+    count: np.ndarray
+    sum: np.ndarray      # None if no values were given
+    mean: np.ndarray     # None if no values were given
+
+    def to_frame(self):
+        """The results as a pandas DataFrame indexed by label."""
+        import pandas as pd
+        columns = {'count': self.count}
+        if self.sum is not None:
+            columns.update(sum=self.sum, mean=self.mean)
+        return pd.DataFrame(columns, index=pd.DatetimeIndex(self.labels))
+
+
+def _freq(freq):
+    try:
+        return FREQUENCIES[freq]
+    except KeyError:
+        raise ValueError("freq must be one of %s"
+                         % ', '.join(sorted(FREQUENCIES))) from None
+
+
+def bin_numbers(times, freq):
+    """Integer bin of each epoch second: hours, days, weeks (counted from
+    the Monday before the epoch) or months (``year * 12 + month - 1``)."""
+    freq = _freq(freq)
+    times = np.asarray(times, dtype=np.int64)
+    if freq == 'h':
+        return times // 3600
+    days = times // SECONDS_PER_DAY
+    if freq == 'D':
+        return days
+    if freq == 'W':
+        # 1970-01-01 was a Thursday; day -3 was a Monday
+        return (days + 3) // 7
+    if np.ndim(days) and len(days) > 1024:
+        # Rows usually cover far fewer days than there are rows: convert
+        # each day in the range once and look the rows up
+        low, high = int(days.min()), int(days.max())
+        if high - low < len(days) // 4:
+            return bin_numbers(np.arange(low, high + 1) * SECONDS_PER_DAY,
+                               'M')[days - low]
+    year, month, _ = civil_from_days(days)
+    return year * 12 + month - 1
+
+
+def bin_labels(first, last, freq):
+    """``datetime64[s]`` labels of bins ``first`` to ``last``."""
+    freq = _freq(freq)
+    bins = np.arange(first, last + 1, dtype=np.int64)
+    if freq == 'h':
+        seconds = bins * 3600
+    elif freq == 'D':
+        seconds = bins * SECONDS_PER_DAY
+    elif freq == 'W':
+        # Week bins start on a Monday; label with the Sunday six days on
+        seconds = (bins * 7 + 3) * SECONDS_PER_DAY
+    else:
+        # The day before the first of the next month
+        following = bins + 1
+        seconds = (days_from_civil(following // 12, following % 12 + 1, 1)
+                   - 1) * SECONDS_PER_DAY
+    return seconds.astype('datetime64[s]')
+
+
+class Resampler:
+    """``resample`` one block at a time, keeping only per-bin totals.
+
+    ``update(times, values)`` adds a block of rows (with ``weighted=True``
+    every block comes with values, as for ``resample``) and ``result()``
+    returns the ``Resampled`` totals so far. The bins start at the first
+    block's range and grow as later blocks reach earlier or later bins,
+    so a file read in chunks never needs all its rows in memory.
+    """
+
+    def __init__(self, freq='D', weighted=False):
+        self.freq = _freq(freq)
+        self.weighted = weighted
+        self.first = self.last = None
+        self._count = self._total = self._counted = None
+
+    def __repr__(self):
+        bins = 0 if self.first is None else self.last - self.first + 1
+        return '<Resampler %s: %d bins>' % (self.freq, bins)
+
+    def _cover(self, low, high):
+        """Widen the bins to take bin numbers ``low`` to ``high``."""
+        if self.first is None:
+            size = high - low + 1
+            self.first, self.last = low, high
+            self._count = np.zeros(size, dtype=np.int64)
+            self._total = np.zeros(size, dtype=np.float64)
+            self._counted = np.zeros(size, dtype=np.int64)
+        elif low < self.first or high > self.last:
+            pad = (self.first - min(self.first, low),
+                   max(self.last, high) - self.last)
+            self._count, self._total, self._counted = (
+                np.pad(a, pad) for a in (self._count, self._total,
+                                         self._counted))
+            self.first, self.last = min(self.first, low), max(self.last, high)
+
+    def update(self, times, values=None):
+        """Add epoch seconds or ``datetime64`` ``times`` and their
+        ``values``; ``NAT`` times are ignored."""
+        times = as_seconds(times)
+        if (values is not None) != self.weighted:
+            raise ValueError("values must be given exactly when the "
+                             "Resampler is weighted")
+        if values is not None:
+            values = as_float(values)
+            if values.shape != times.shape:
+                raise ValueError("values must have the same length as times")
+        for i in range(0, len(times), _BLOCK):
+            block = times[i:i + _BLOCK]
+            keep = block != NAT
+            bins = bin_numbers(block[keep], self.freq)
+            if not len(bins):
+                continue
+            self._cover(int(bins.min()), int(bins.max()))
+            size = len(self._count)
+            # Bin numbers become indexes in place; no other full-size copy
+            index = bins
+            index -= self.first
+            self._count += np.bincount(index, minlength=size)
+            if values is not None:
+                weights = values[i:i + _BLOCK][keep]
+                # NaN values are left out of the sum and mean, as in pandas
+                valid = ~np.isnan(weights)
+                self._total += np.bincount(index[valid], weights[valid],
+                                           minlength=size)
+                self._counted += np.bincount(index[valid], minlength=size)
+        return self
+
+    def result(self):
+        """The ``Resampled`` counts (and sums and means) so far."""
+        if self.first is None:
+            empty = np.empty(0, dtype=np.float64)
+            return Resampled(np.empty(0, 'datetime64[s]'),
+                             np.empty(0, dtype=np.int64),
+                             empty if self.weighted else None,
+                             empty if self.weighted else None)
+        labels = bin_labels(self.first, self.last, self.freq)
+        if not self.weighted:
+            return Resampled(labels, self._count.copy(), None, None)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = self._total / self._counted
+        return Resampled(labels, self._count.copy(), self._total.copy(),
+                         mean)
+
+
+@instrumented('resample')
+def resample(times, freq='D', values=None):
+    """Count (and, with ``values``, sum and average) per time bin.
+
+    ``times`` are epoch seconds such as a ``TripTable`` start column or a
+    ``datetime64`` column; ``values`` is an optional numeric array of the
+    same length, e.g. durations, in which NaN and ``NAT`` (a missing
+    ``TripTable.durations()`` entry) are left out of sums and means.
+    ``resample(start, 'M').count`` is
+    ``rides.resample('M', on='Start date').size()``; ``Resampler`` does
+    the same a block at a time.
+    """
+    resampler = Resampler(freq, weighted=values is not None)
+    return resampler.update(times, values).result()
+
+
+class GroupedResampled(NamedTuple):
+    """Per-(group, bin) results of ``group_resample``.
+
+    ``count``, ``sum``, ``mean`` and ``median`` have one row per group and
+    one column per bin; ``sum``, ``mean`` and ``median`` are None if no
+    values were given.
+    """
+    groups: np.ndarray   # group labels
+    labels: np.ndarray   # datetime64[s], one per bin
+    count: np.ndarray
+    sum: np.ndarray
+    mean: np.ndarray
+    median: np.ndarray
+
+    @property
+    def share(self):
+        """Each group's fraction of the rows in each bin (NaN for empty
+        bins), like ``value_counts() / size()`` on a resample."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.count / self.count.sum(axis=0)
+
+    def shares(self):
+        """``share`` as a DataFrame with a row per bin and a column per
+        group, like ``RideSummary.monthly_member_shares``."""
+        import pandas as pd
+        return pd.DataFrame(self.share.T, columns=list(self.groups),
+                            index=pd.DatetimeIndex(self.labels))
+
+    def to_frame(self, names=('group', 'time')):
+        """The results as a DataFrame indexed by ``(group, bin label)``.
+
+        As with ``groupby(...).resample(...)``, each group covers the bins
+        from its own first row to its last, empty bins in between included.
+        """
+        import pandas as pd
+        rows = []
+        for g, counts in enumerate(self.count):
+            present = np.flatnonzero(counts)
+            if len(present):
+                rows.append((g, np.arange(present[0], present[-1] + 1)))
+        group = np.concatenate([np.full(len(b), g) for g, b in rows]
+                               + [np.empty(0, np.intp)])
+        bins = np.concatenate([b for _, b in rows] + [np.empty(0, np.intp)])
+        columns = {'count': self.count[group, bins],
+                   'share': self.share[group, bins]}
+        if self.sum is not None:
+            columns.update(sum=self.sum[group, bins],
+                           mean=self.mean[group, bins],
+                           median=self.median[group, bins])
+        index = pd.MultiIndex.from_arrays(
+            [self.groups[group], pd.DatetimeIndex(self.labels[bins])],
+            names=list(names))
+        return pd.DataFrame(columns, index=index)
+
+
+def _medians(keys, values, counted):
+    """Exact median of ``values`` for each key, NaN where a key has none.
+
+    The values are grouped by key with a stable counting sort of the small
+    integer keys (numpy's radix sort for 8- and 16-bit keys), then each
+    group's middle element(s) are found with ``np.partition``, so no group
+    is ever fully sorted.
+    """
+    median = np.full(len(counted), np.nan)
+    if not len(values):
+        return median
+    grouped = values[np.argsort(keys, kind='stable')]
+    ends = np.cumsum(counted)
+    for key in np.flatnonzero(counted).tolist():
+        m = int(counted[key])
+        part = grouped[ends[key] - m:ends[key]]
+        half = m // 2
+        if m % 2:
+            median[key] = np.partition(part, half)[half]
+        else:
+            part = np.partition(part, (half - 1, half))
+            median[key] = (part[half - 1] + part[half]) / 2
+    return median
+
+
+def _key_dtype(size):
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if size <= np.iinfo(dtype).max + 1:
+            return dtype
+    return np.int64
+
+
+@instrumented('group_resample', rows=1)
+def group_resample(groups, times, freq='M', values=None, labels=None):
+    """Count, share, sum, mean and exact median per (group, time bin).
+
+    ``groups`` holds a category per row (e.g. member types), or integer
+    codes into ``labels`` (negative codes are left out); ``times`` and
+    ``values`` are as for ``resample`` (NaN and ``NAT`` values are
+    missing). One pass assigns every row a
+    combined ``(group, bin)`` key, and counts and sums are ``np.bincount``
+    over it; the rows need not be sorted. With a ``TripTable``::
+
+        codes, labels = trips.codes('member_type')
+        group_resample(codes, trips.start, 'M', trips.durations(), labels)
+
+    gives ``rides.groupby('Member type').resample('M', on='Start date')``'s
+    ``size()`` and ``['Duration'].mean()`` / ``.median()``, and ``share``
+    the notebook's ``value_counts() / size()`` on the monthly resample.
+    """
+    freq = _freq(freq)
+    times = as_seconds(times)
+    if labels is None:
+        groups = np.asarray(groups)
+        if groups.dtype == object:
+            # Much faster to sort as fixed-width strings
+            groups = groups.astype(str)
+        labels, codes = np.unique(groups, return_inverse=True)
+        codes = codes.reshape(-1)
+    else:
+        labels = np.asarray(labels, dtype=object)
+        codes = np.asarray(groups)
+    if codes.shape != times.shape:
+        raise ValueError("groups must have the same length as times")
+    if values is not None:
+        values = as_float(values)
+        if values.shape != times.shape:
+            raise ValueError("values must have the same length as times")
+
+    keep = (times != NAT) & (codes >= 0)
+    if not keep.all():
+        times, codes = times[keep], codes[keep]
+        if values is not None:
+            values = values[keep]
+    n_groups = len(labels)
+    if not len(times):
+        empty = np.empty((n_groups, 0))
+        return GroupedResampled(
+            np.asarray(labels, dtype=object), np.empty(0, 'datetime64[s]'),
+            np.empty((n_groups, 0), dtype=np.int64),
+            *(None if values is None else empty,) * 3)
+
+    bins = bin_numbers(times, freq)
+    first, last = int(bins.min()), int(bins.max())
+    size = last - first + 1
+    cells = n_groups * size
+    keys = bins - first
+    keys += np.multiply(codes, size, dtype=np.int64)
+    keys = keys.astype(_key_dtype(cells))
+    count = np.bincount(keys, minlength=cells)
+    shape = (n_groups, size)
+    if values is None:
+        return GroupedResampled(np.asarray(labels, dtype=object),
+                                bin_labels(first, last, freq),
+                                count.reshape(shape), None, None, None)
+
+    # NaN (and NAT) values are left out of the sum, mean and median, as
+    # in pandas
+    valid = ~np.isnan(values)
+    if not valid.all():
+        keys, values = keys[valid], values[valid]
+    counted = np.bincount(keys, minlength=cells)
+    total = np.bincount(keys, values, minlength=cells)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / counted
+    median = _medians(keys, values, counted)
+    return GroupedResampled(np.asarray(labels, dtype=object),
+                            bin_labels(first, last, freq),
+                            count.reshape(shape), total.reshape(shape),
+                            mean.reshape(shape), median.reshape(shape))
@@ -0,0 +1,165 @@
+"""Chunked reading of bike_share.csv-style files.
+
+``pd.read_csv('bike_share.csv', parse_dates=[...])`` holds the whole file in
+memory. ``iter_rides`` reads the same file a fixed number of rows at a time,
+parsing the date columns with ``parse_timestamps`` (the format is inferred
+once from the first chunk). ``RideSummary`` consumes those chunks and keeps
+the notebook's ride analyses as running totals whose size depends on the
+number of days covered, not the number of rides.
+"""
+
+import numpy as np
+
+from ._civil import NAT, SECONDS_PER_DAY, civil_from_days
+from .formats import infer_format
+from .instrument import instrumented, stage
+from .parsing import parse_timestamps
+from .stats import DurationStats
+
+DATE_COLUMNS = ('Start date', 'End date')
+
+
+def iter_rides(path, chunksize=100000, date_columns=DATE_COLUMNS, fmt=None,
+               **read_csv_kwargs):
+    """Yield DataFrames of at most ``chunksize`` rides from ``path``.
+
+    The ``date_columns`` come back as ``datetime64[s]`` columns, exactly as
+    ``parse_dates`` would have produced them; empty or unparseable cells
+    become ``NaT``. Extra keyword arguments go to ``pandas.read_csv``.
+    """
+    import pandas as pd
+
+    dtype = dict.fromkeys(date_columns, str)
+    dtype.update(read_csv_kwargs.pop('dtype', {}))
+    reader = pd.read_csv(path, chunksize=chunksize, dtype=dtype,
+                         **read_csv_kwargs)
+    with reader:
+        while True:
+            with stage('read_csv') as reading:
+                chunk = next(reader, None)
+                if chunk is not None:
+                    reading.add_rows(len(chunk))
+            if chunk is None:
+                break
+            for column in date_columns:
+                values = chunk[column].to_numpy()
+                if fmt is None:
+                    # Empty cells come back as NaN; infer from the others
+                    present = values[pd.notna(values)][:32]
+                    if not len(present):
+                        chunk[column] = np.full(len(values), NAT).view(
+                            'datetime64[s]')
+                        continue
+                    fmt = infer_format(present, errors='coerce')
+                chunk[column] = parse_timestamps(
+                    values, fmt, errors='coerce').view('datetime64[s]')
+            yield chunk
+
+
+class RideSummary:
+    """Running totals for the notebook's ride analyses.
+
+    Feed it chunks from ``iter_rides`` with ``update``; it keeps the ride
+    count, duration total/min/max, joyride count and duration, and per-day
+    and per-month ride counts (overall and per member type). ``durations``
+    is a ``DurationStats`` with the variance, histogram and median estimate.
+    """
+
+    def __init__(self):
+        self.rides = 0
+        self.total_duration = 0.0
+        self.min_duration = None
+        self.max_duration = None
+        self.joyrides = 0
+        self.joyride_duration = 0.0
+        self.durations = DurationStats()
+        self._daily = {}
+        self._monthly = {}
+        self._monthly_members = {}
+
+    @instrumented('ride_summary', rows=1)
+    def update(self, chunk):
+        """Add one DataFrame chunk of rides."""
+        start = chunk['Start date'].to_numpy().astype('datetime64[s]')
+        end = chunk['End date'].to_numpy().astype('datetime64[s]')
+        valid = ~(np.isnat(start) | np.isnat(end))
+        start_s = start[valid].astype(np.int64)
+        duration = (end[valid].astype(np.int64) - start_s).astype(np.float64)
+
+        self.rides += len(duration)
+        self.durations.update(duration)
+        if len(duration):
+            self.total_duration += float(duration.sum())
+            low, high = float(duration.min()), float(duration.max())
+            self.min_duration = low if self.min_duration is None \
+                else min(self.min_duration, low)
+            self.max_duration = high if self.max_duration is None \
+                else max(self.max_duration, high)
+
+        if 'Start station' in chunk and 'End station' in chunk:
+            joy = (chunk['Start station'] == chunk['End station']).to_numpy()
+            joy = joy[valid]
+            self.joyrides += int(joy.sum())
+            self.joyride_duration += float(duration[joy].sum())
+
+        days = start_s // SECONDS_PER_DAY
+        year, month, _ = civil_from_days(days)
+        months = year * 12 + month - 1
+        _add_counts(self._daily, days)
+        _add_counts(self._monthly, months)
+        if 'Member type' in chunk:
+            members = chunk['Member type'].to_numpy()[valid].astype(str)
+            for member in np.unique(members):
+                counts = self._monthly_members.setdefault(member, {})
+                _add_counts(counts, months[members == member])
+        return self
+
+    @property
+    def mean_duration(self):
+        return self.total_duration / self.rides if self.rides else float('nan')
+
+    def daily_counts(self):
+        """Rides per day as a Series, like ``resample('D').size()``."""
+        import pandas as pd
+        if not self._daily:
+            return pd.Series(dtype=np.int64)
+        first, last = min(self._daily), max(self._daily)
+        days = np.arange(first, last + 1)
+        counts = [self._daily.get(int(d), 0) for d in days]
+        index = pd.DatetimeIndex(
+            (days * SECONDS_PER_DAY).astype('datetime64[s]'), name='Start date')
+        return pd.Series(counts, index=index, dtype=np.int64)
+
+    def monthly_counts(self, member_type=None):
+        """Rides per month, labelled with the month end like ``resample('M')``."""
+        import pandas as pd
+        counts = self._monthly if member_type is None \
+            else self._monthly_members.get(member_type, {})
+        if not self._monthly:
+            return pd.Series(dtype=np.int64)
+        months = np.arange(min(self._monthly), max(self._monthly) + 1)
+        index = pd.DatetimeIndex(
+            [_month_end(m) for m in months], name='Start date')
+        return pd.Series([counts.get(int(m), 0) for m in months],
+                         index=index, dtype=np.int64)
+
+    def monthly_member_shares(self):
+        """Share of each member type per month, like the notebook's
+        ``value_counts() / size()`` on the monthly resample."""
+        import pandas as pd
+        total = self.monthly_counts()
+        shares = {member: self.monthly_counts(member) / total
+                  for member in sorted(self._monthly_members)}
+        return pd.DataFrame(shares)
+
+
+def _add_counts(counts, keys):
+    values, n = np.unique(keys, return_counts=True)
+    for key, count in zip(values.tolist(), n.tolist()):
+        counts[key] = counts.get(key, 0) + count
+
+
+def _month_end(month_index):
+    import pandas as pd
+    year, month = divmod(int(month_index), 12)
+    return pd.Timestamp(year, month + 1, 1) + pd.offsets.MonthEnd(0)
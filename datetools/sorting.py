@@ -0,0 +1,176 @@
+"""Sorting date ordinals and epoch timestamps without comparisons.
+
+The notebook puts ``dates_scrambled`` back in order with ``sorted()``, a
+comparison sort over ``date`` objects. Dates held as integers span a small
+range -- a century is under 2**16 days, a year under 2**25 seconds -- so
+they can be sorted by their digits instead: ``argsort_dates`` subtracts the
+minimum and runs a least-significant-digit radix sort over 16-bit digits,
+each pass being numpy's stable (radix) argsort of a ``uint16`` array. The
+permutation reorders companion columns too. (When only the sorted values
+are needed, ``np.sort`` is already faster than a counting sort.)
+``SortedDates`` keeps an array sorted while late values keep arriving.
+"""
+
+import numpy as np
+
+_DIGIT_BITS = 16
+# More passes than this and numpy's own stable sort is faster
+_MAX_PASSES = 3
+# Late values collected unsorted before SortedDates sorts them into a run
+_BUFFER = 1024
+
+
+def _as_integers(values):
+    values = np.asarray(values)
+    if values.dtype.kind == 'M':
+        return values.view(np.int64)
+    if values.dtype.kind not in 'iu':
+        raise TypeError("expected integer ordinals, epochs or datetime64")
+    return values
+
+
+def _passes(span):
+    return max(1, (int(span).bit_length() + _DIGIT_BITS - 1) // _DIGIT_BITS)
+
+
+def argsort_dates(values):
+    """Stable sorting permutation of date ordinals or epoch values.
+
+    ``values[perm]`` is sorted and ``column[perm]`` reorders any companion
+    column the same way. Runs in linear time when the values span fewer
+    than 2**48 units, which covers epoch seconds over thousands of years.
+    """
+    values = _as_integers(values)
+    if len(values) < 2:
+        return np.arange(len(values))
+    low = int(values.min())
+    span = int(values.max()) - low
+    passes = _passes(span)
+    if passes > _MAX_PASSES:
+        return np.argsort(values, kind='stable')
+    offset = (values.astype(np.int64) - low).view(np.uint64)
+    perm = None
+    for k in range(passes):
+        digit = (offset >> np.uint64(k * _DIGIT_BITS)).astype(np.uint16)
+        if perm is None:
+            perm = np.argsort(digit, kind='stable')
+        else:
+            perm = perm[np.argsort(digit[perm], kind='stable')]
+    return perm
+
+
+def _merge_sorted(values, order, late, late_order):
+    """Merge the sorted run ``late`` into the sorted run ``values`` in one
+    linear pass; ties go after the existing values."""
+    n, k = len(values), len(late)
+    # Final position of each late value
+    at = np.searchsorted(values, late, side='right') + np.arange(k)
+    merged = np.empty(n + k, dtype=np.int64)
+    merged_order = np.empty(n + k, dtype=np.int64)
+    keep = np.ones(n + k, dtype=bool)
+    keep[at] = False
+    merged[at] = late
+    merged_order[at] = late_order
+    merged[keep] = values
+    merged_order[keep] = order
+    return merged, merged_order
+
+
+class SortedDates:
+    """A sorted array of dates that accepts late inserts.
+
+    New values are appended, unsorted, to a small buffer; a full buffer
+    (or a query) is sorted into a side run, and runs of similar size are
+    merged, so the side runs stay few and each value is moved a
+    logarithmic number of times. Queries consult the
+    runs together with the main array, and the runs are merged into the
+    main array in one linear pass once they grow past a fraction of it, so
+    a trickle of inserts -- even one value at a time -- never triggers a
+    full re-sort. ``order`` gives, for each sorted position, the index at
+    which the value was added, for reordering companion columns.
+    """
+
+    def __init__(self, values=(), merge_fraction=0.125):
+        values = np.asarray(_as_integers(values), dtype=np.int64)
+        perm = argsort_dates(values)
+        self._values = values[perm]
+        self._order = perm.astype(np.int64)
+        # Sorted side runs, oldest and largest first
+        self._runs = []
+        self._buffer = []
+        self._buffered = 0
+        self._added = len(values)
+        self.merge_fraction = merge_fraction
+
+    def __len__(self):
+        return len(self._values) + self._pending() + self._buffered
+
+    def __repr__(self):
+        return '<SortedDates: %d values>' % len(self)
+
+    def _pending(self):
+        return sum(len(run) for run, _ in self._runs)
+
+    def add(self, values):
+        """Insert one value or an array of values."""
+        values = np.asarray(_as_integers(np.atleast_1d(values)), dtype=np.int64)
+        self._buffer.append(values)
+        self._added += len(values)
+        self._buffered += len(values)
+        if self._buffered >= _BUFFER:
+            self._flush()
+            if self._pending() > max(_BUFFER, self.merge_fraction
+                                     * len(self._values)):
+                self._merge()
+        return self
+
+    def _flush(self):
+        """Sort the buffer into a side run."""
+        if not self._buffered:
+            return
+        values = np.concatenate(self._buffer)
+        order = np.arange(self._added - len(values), self._added)
+        perm = argsort_dates(values)
+        self._buffer = []
+        self._buffered = 0
+        self._runs.append((values[perm], order[perm]))
+        # Keep each run more than twice the size of the next
+        while (len(self._runs) > 1
+               and len(self._runs[-2][0]) <= 2 * len(self._runs[-1][0])):
+            late = self._runs.pop()
+            self._runs[-1] = _merge_sorted(*self._runs[-1], *late)
+
+    def _merge(self):
+        self._flush()
+        if not self._runs:
+            return
+        run = self._runs.pop()
+        while self._runs:
+            run = _merge_sorted(*self._runs.pop(), *run)
+        self._values, self._order = _merge_sorted(self._values, self._order,
+                                                  *run)
+
+    @property
+    def values(self):
+        """All values in sorted order."""
+        self._merge()
+        return self._values
+
+    @property
+    def order(self):
+        """Insertion index of the value at each sorted position."""
+        self._merge()
+        return self._order
+
+    def searchsorted(self, values, side='left'):
+        """Positions in ``values`` order, as ``np.searchsorted`` would give
+        on the fully merged array."""
+        self._flush()
+        at = np.searchsorted(self._values, values, side=side)
+        for run, _ in self._runs:
+            at = at + np.searchsorted(run, values, side=side)
+        return at
+
+    def count_between(self, low, high):
+        """Number of values ``v`` with ``low <= v < high``."""
+        return self.searchsorted(high) - self.searchsorted(low)
@@ -0,0 +1,146 @@
+"""Streaming statistics of trip durations.
+
+The notebook appends every ``total_seconds()`` to ``onebike_durations`` just
+to compute ``sum(...) / len(...)``, ``min`` and ``max``, and the pandas part
+takes ``.median()`` of a whole column. ``DurationStats`` consumes durations
+one chunk at a time and keeps only a fixed amount of state: count, mean and
+the sum of squared deviations (Welford's method, with Chan's formula for
+combining a whole chunk at once), min, max, and a histogram with a fixed
+number of logarithmic bins from which quantiles such as the median are
+estimated.
+"""
+
+import math
+
+import numpy as np
+
+from ._civil import as_float
+
+# Histogram bins per doubling of the duration; quantile estimates are
+# within a factor of 2 ** (1 / BINS_PER_OCTAVE) (about 9%) of the truth
+BINS_PER_OCTAVE = 8
+# Durations from 1 second up to 2 ** 40 seconds get their own bins
+OCTAVES = 40
+
+
+class DurationStats:
+    """Count, mean, variance, min, max and log histogram of durations.
+
+    Bin 0 holds durations in ``[0, 1)``; bin ``k`` holds
+    ``[2 ** ((k - 1) / b), 2 ** (k / b))`` with ``b = BINS_PER_OCTAVE``,
+    the last bin also taking anything longer. Negative durations (such as
+    an uncorrected trip across a daylight saving change) are counted in
+    ``negative`` instead of a bin. NaN and ``NAT`` (a missing duration in
+    ``TripTable.durations()``) are skipped.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = None
+        self.max = None
+        self.negative = 0
+        self._bins = np.zeros(1 + OCTAVES * BINS_PER_OCTAVE, dtype=np.int64)
+
+    def __repr__(self):
+        return '<DurationStats: %d durations, mean %.1f s>' % (self.count,
+                                                               self.mean)
+
+    def add(self, duration):
+        """Add one duration in seconds."""
+        return self.update(np.array([duration]))
+
+    def update(self, durations):
+        """Add an array (or any iterable) of durations in seconds."""
+        if not isinstance(durations, np.ndarray):
+            durations = np.fromiter(durations, dtype=np.float64)
+        x = as_float(durations).ravel()
+        x = x[~np.isnan(x)]
+        n = len(x)
+        if not n:
+            return self
+        mean = float(x.mean())
+        m2 = float(np.square(x - mean).sum())
+        self._combine(n, mean, m2, float(x.min()), float(x.max()))
+
+        self.negative += int(np.count_nonzero(x < 0))
+        x = x[x >= 0]
+        index = np.zeros(len(x), dtype=np.intp)
+        longer = x >= 1
+        index[longer] = np.minimum(
+            np.floor(np.log2(x[longer]) * BINS_PER_OCTAVE).astype(np.intp) + 1,
+            len(self._bins) - 1)
+        self._bins += np.bincount(index, minlength=len(self._bins))
+        return self
+
+    def _combine(self, n, mean, m2, low, high):
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+
+    def merge(self, other):
+        """Add the durations summarized by another ``DurationStats``."""
+        if other.count:
+            self._combine(other.count, other.mean, other._m2, other.min,
+                          other.max)
+            self.negative += other.negative
+            self._bins += other._bins
+        return self
+
+    def variance(self, ddof=1):
+        """Variance; ``ddof=1`` (the default) matches ``Series.var()``."""
+        if self.count <= ddof:
+            return float('nan')
+        return self._m2 / (self.count - ddof)
+
+    def std(self, ddof=1):
+        return math.sqrt(self.variance(ddof))
+
+    def histogram(self):
+        """``(edges, counts)``: bin ``i`` covers ``edges[i]`` to
+        ``edges[i + 1]`` seconds."""
+        edges = np.concatenate([[0.0], 2.0 ** (np.arange(len(self._bins))
+                                               / BINS_PER_OCTAVE)])
+        edges[-1] = np.inf
+        return edges, self._bins.copy()
+
+    def quantile(self, q):
+        """Estimate of the ``q`` quantile from the histogram, interpolated
+        geometrically within its bin and clamped to ``[min, max]``."""
+        if not self.count:
+            return float('nan')
+        rank = q * (self.count - 1)
+        if rank < self.negative:
+            # Only min is known for negative durations
+            return float(self.min)
+        cumulative = np.cumsum(self._bins) + self.negative
+        k = int(np.searchsorted(cumulative, rank, side='right'))
+        k = min(k, len(self._bins) - 1)
+        before = cumulative[k - 1] if k else self.negative
+        inside = (rank - before + 0.5) / self._bins[k]
+        if k == 0:
+            value = inside
+        else:
+            value = 2.0 ** ((k - 1 + inside) / BINS_PER_OCTAVE)
+        return float(min(max(value, self.min), self.max))
+
+    def median(self):
+        """Estimated median, the streaming stand-in for ``.median()``."""
+        return self.quantile(0.5)
+
+    def summary(self):
+        """The statistics as a plain dict, e.g. for a daily report."""
+        return {
+            'count': self.count,
+            'mean': self.mean if self.count else float('nan'),
+            'std': self.std(),
+            'min': self.min,
+            'max': self.max,
+            'median': self.median(),
+            'negative': self.negative,
+        }
@@ -0,0 +1,376 @@
+"""Seeded synthetic rides and date catalogs at any scale.
+
+The notebook's data is one bike's 290 trips and a pickle of a few hundred
+hurricane dates. The generators here write files of the same shape with as
+many rows as needed (10^3 to 10^9), so the rest of the package can be
+exercised at production scale:
+
+* ``write_rides`` writes a bike_share.csv-compatible file: rides follow a
+  weekday commute / weekend midday pattern in local time, members and
+  casual riders have their own duration distributions, and stations have
+  skewed popularity (with a few joyrides back to the starting station).
+  Station names all have the same length, so every row has the same width
+  and a block of rows is rendered as one byte matrix.
+* ``write_date_catalog`` writes a date catalog (see ``catalog``) with
+  dates concentrated in the Atlantic hurricane season.
+* ``write_start_times`` writes one ride start time per line, as input for
+  ``parse_timestamps``.
+
+Ride times are drawn as UTC instants and written as wall-clock times in
+``zone``, so trips across the fall-back change already come out as in the
+notebook. On top of that, a fraction ``edge_rate`` of rows of each kind is
+injected: trips that start before the repeated hour and end in it (wall
+end before wall start), trips with a wall time in a skipped spring-forward
+hour, and plain end-before-start data errors.
+
+Output depends only on the arguments and ``seed``. Rows are produced in
+blocks of about ``2 ** 20`` and rendered straight to bytes, so memory use is
+bounded whatever the size of the file.
+"""
+
+from datetime import date
+
+import numpy as np
+
+from ._civil import EPOCH_ORDINAL, SECONDS_PER_DAY
+from .ambiguity import problem_intervals
+from .catalog import write_catalog_blocks
+from .formatting import format_timestamps, write_timestamps
+from .trips import TripTable
+from .zones import get_zone
+
+CSV_HEADER = (b'Start date,End date,Start station number,Start station,'
+              b'End station number,End station,Bike number,Member type\n')
+CSV_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Default range: the notebook's October-December 2017 rides, extended to
+# April 2018 so it contains a spring-forward change as well
+FIRST_DAY = date(2017, 10, 1)
+LAST_DAY = date(2018, 4, 1)
+ZONE = 'America/New_York'
+
+MEMBER_TYPES = np.array(['Casual', 'Member'], dtype=object)
+# Probability that a ride is by a casual rider, on weekdays and weekends
+CASUAL_SHARE = np.array([0.15, 0.35])
+# Median and log-spread of ride durations in seconds, casual and member
+DURATION_MEDIAN = np.array([1500.0, 660.0])
+DURATION_SIGMA = np.array([0.8, 0.6])
+JOYRIDE_SHARE = 0.02
+FLEET_SIZE = 5000
+
+# Relative ride volume Monday..Sunday
+WEEKDAY_WEIGHTS = np.array([1.0, 1.0, 1.0, 1.0, 0.95, 0.8, 0.7])
+# Relative ride volume per local hour: commute peaks on weekdays, a broad
+# midday peak at weekends
+HOUR_WEIGHTS = np.array([
+    [1, 0.5, 0.3, 0.2, 0.3, 1, 3, 8, 12, 7, 4, 4,
+     5, 5, 4, 5, 8, 13, 10, 6, 4, 3, 2, 1.5],
+    [2, 1.5, 1, 0.5, 0.3, 0.3, 0.6, 1.5, 3, 5, 7, 8,
+     9, 9, 9, 8, 7, 6, 5, 4, 3, 2.5, 2, 1.5],
+])
+
+# Peak of the hurricane season (day of the year) and its spread in days
+SEASON_PEAK = 245
+SEASON_SPREAD = 28
+
+EDGE_KINDS = ('fall_back', 'spring_forward', 'end_before_start')
+
+_BLOCK = 1 << 20
+# Rows rendered at a time when writing, small enough to stay in cache
+_WRITE_ROWS = 1 << 14
+
+
+def _station_names(count, rng):
+    """``count`` distinct street-corner names of equal length, sorted."""
+    numbers = ['%d%s St' % (k, 'th' if 10 <= k % 100 < 20 else
+                            {1: 'st', 2: 'nd', 3: 'rd'}.get(k % 10, 'th'))
+               for k in range(10, 100)]
+    letters = ['%s St' % c for c in 'ABCDEFGHIKLMNOPQRSTUVW']
+    quadrants = ['NW', 'NE', 'SW', 'SE']
+    total = len(numbers) * len(letters) * len(quadrants)
+    if count > total:
+        raise ValueError("at most %d stations are supported" % total)
+    picks = rng.choice(total, size=count, replace=False)
+    names = []
+    for k in picks.tolist():
+        k, q = divmod(k, len(quadrants))
+        n, c = divmod(k, len(letters))
+        names.append('%s & %s %s' % (numbers[n], letters[c], quadrants[q]))
+    return np.array(sorted(names), dtype=object)
+
+
+class _RideModel:
+    """Everything about a synthetic ride file except the rows themselves."""
+
+    def __init__(self, n, seed, first, last, zone, stations, edge_rate):
+        self.seed = seed
+        self.zone = get_zone(zone)
+        rng = np.random.default_rng([seed, 0])
+
+        self.station_names = _station_names(stations, rng)
+        # Station popularity falls off as a power of its rank; stations
+        # are drawn through a lookup table of 2 ** 16 slots
+        popularity = rng.permutation(1.0 / np.arange(1, stations + 1) ** 0.8)
+        slots = np.floor(np.cumsum(popularity) / popularity.sum() * (1 << 16))
+        self.station_table = np.repeat(
+            np.arange(stations, dtype=np.int16),
+            np.diff(np.concatenate([[0], slots])).astype(np.intp))
+
+        # One cell per UTC hour from local midnight of first to that of last
+        wall_first = (first.toordinal() - EPOCH_ORDINAL) * SECONDS_PER_DAY
+        wall_last = (last.toordinal() - EPOCH_ORDINAL) * SECONDS_PER_DAY
+        self.utc_first = int(self.zone.to_utc(wall_first))
+        cells = max(1, int(self.zone.to_utc(wall_last) - self.utc_first)
+                    // 3600)
+        middle = self.zone.to_local(self.utc_first
+                                    + 3600 * np.arange(cells) + 1800)
+        days = middle // SECONDS_PER_DAY
+        weekday = (days + 3) % 7
+        hour = (middle - days * SECONDS_PER_DAY) // 3600
+        weights = WEEKDAY_WEIGHTS[weekday] * HOUR_WEIGHTS[
+            (weekday >= 5).astype(np.intp), hour]
+
+        self.edges = self._edge_rows(n, edge_rate, wall_first, wall_last,
+                                     cells)
+        natural = n - len(self.edges['start'])
+        self.cell_counts = rng.multinomial(natural, weights / weights.sum())
+
+    def _edge_rows(self, n, edge_rate, wall_first, wall_last, cells):
+        rng = np.random.default_rng([self.seed, 1])
+        per_kind = 0
+        if edge_rate > 0:
+            per_kind = min(max(1, round(n * edge_rate)), n // len(EDGE_KINDS))
+        starts, ends, repeated = problem_intervals(self.zone)
+        inside = (starts >= wall_first) & (ends <= wall_last)
+        counts = dict.fromkeys(EDGE_KINDS, 0)
+        rows = []   # (sort key in UTC, wall start, wall end)
+
+        folds = np.flatnonzero(inside & repeated)
+        if len(folds) and per_kind:
+            pick = folds[rng.integers(0, len(folds), per_kind)]
+            length = ends[pick] - starts[pick]
+            # First instant after the change; trips shorter than the
+            # repeated hour that cross it end at an earlier wall time
+            change = self.zone.to_utc(starts[pick], 1)
+            start = change - rng.integers(60, length * 5 // 6)
+            end = start + rng.integers(change - start + 1, length)
+            rows.append((start, self.zone.to_local(start),
+                         self.zone.to_local(end)))
+            counts['fall_back'] = per_kind
+
+        gaps = np.flatnonzero(inside & ~repeated)
+        if len(gaps) and per_kind:
+            pick = gaps[rng.integers(0, len(gaps), per_kind)]
+            wall = rng.integers(starts[pick], ends[pick])
+            rows.append((self.zone.to_utc(wall), wall,
+                         wall + rng.integers(300, 2400, per_kind)))
+            counts['spring_forward'] = per_kind
+
+        if per_kind:
+            start = self.utc_first + rng.integers(0, cells * 3600, per_kind)
+            wall = self.zone.to_local(start)
+            rows.append((start, wall, wall - rng.integers(60, 3600, per_kind)))
+            counts['end_before_start'] = per_kind
+
+        self.edge_counts = counts
+        if not rows:
+            empty = np.empty(0, dtype=np.int64)
+            return {'key': empty, 'start': empty, 'end': empty, 'cell': empty}
+        key, start, end = (np.concatenate(parts) for parts in zip(*rows))
+        order = np.argsort(key, kind='stable')
+        key = key[order]
+        cell = np.clip((key - self.utc_first) // 3600, 0, cells - 1)
+        return {'key': key, 'start': start[order], 'end': end[order],
+                'cell': cell}
+
+    def _cell_blocks(self):
+        """Runs of consecutive cells holding about ``_BLOCK`` rows each."""
+        total = np.cumsum(self.cell_counts)
+        first = 0
+        while first < len(total):
+            done = total[first - 1] if first else 0
+            last = int(np.searchsorted(total, done + _BLOCK, side='left')) + 1
+            last = min(max(last, first + 1), len(total))
+            yield first, last
+            first = last
+
+    def _rows(self, rng, start, utc):
+        """Member type, end and stations for rows starting at wall time
+        ``start``; ``utc`` (the true start instant) is given for natural
+        rows and None for injected ones, whose end is already known."""
+        size = len(start)
+        days = start // SECONDS_PER_DAY
+        weekend = ((days + 3) % 7 >= 5).astype(np.intp)
+        member = (rng.random(size, dtype=np.float32)
+                  >= CASUAL_SHARE[weekend]).astype(np.int8)
+        rows = {'start': start, 'member_type': member}
+        if utc is not None:
+            duration = np.exp(np.log(DURATION_MEDIAN)[member]
+                              + DURATION_SIGMA[member]
+                              * rng.standard_normal(size, dtype=np.float32))
+            duration = np.clip(duration, 60, SECONDS_PER_DAY).astype(np.int64)
+            rows['end'] = self.zone.to_local(utc + duration)
+        draws = rng.integers(0, len(self.station_table), (2, size),
+                             dtype=np.uint16)
+        rows['start_station'] = self.station_table[draws[0]]
+        end_station = self.station_table[draws[1]]
+        joyride = rng.random(size, dtype=np.float32) < JOYRIDE_SHARE
+        end_station[joyride] = rows['start_station'][joyride]
+        rows['end_station'] = end_station
+        rows['bike'] = rng.integers(0, FLEET_SIZE, size, dtype=np.int16)
+        return rows
+
+    def blocks(self):
+        """Yield dicts of row arrays, in start-time order."""
+        edges = self.edges
+        for first, last in self._cell_blocks():
+            rng = np.random.default_rng([self.seed, 2, first])
+            counts = self.cell_counts[first:last]
+            cells = np.repeat(np.arange(first, last), counts)
+            utc = np.sort(self.utc_first + cells * 3600
+                          + rng.integers(0, 3600, len(cells)))
+            rows = self._rows(rng, self.zone.to_local(utc), utc)
+
+            lo, hi = np.searchsorted(edges['cell'], [first, last])
+            if hi > lo:
+                injected = self._rows(rng, edges['start'][lo:hi], None)
+                injected['end'] = edges['end'][lo:hi]
+                at = np.searchsorted(utc, edges['key'][lo:hi], side='right')
+                rows = {name: np.insert(values, at, injected[name])
+                        for name, values in rows.items()}
+            if len(rows['start']):
+                yield rows
+
+
+def generate_trips(n, seed=0, first=FIRST_DAY, last=LAST_DAY, zone=ZONE,
+                   stations=400, edge_rate=1e-4):
+    """Yield the rows ``write_rides`` would write, as ``TripTable`` blocks
+    with station and member type columns."""
+    model = _RideModel(n, seed, first, last, zone, stations, edge_rate)
+    dtype = np.int8 if stations <= 127 else np.int32
+    labels = {'start_station': model.station_names,
+              'end_station': model.station_names,
+              'member_type': MEMBER_TYPES}
+    for block in model.blocks():
+        codes = {name: block[name].astype(dtype) for name in
+                 ('start_station', 'end_station')}
+        codes['member_type'] = block['member_type']
+        yield TripTable._from_codes(block['start'], block['end'], codes,
+                                    labels)
+
+
+def _text_table(texts):
+    """Equal-length strings (or a bytes array) as rows of a uint8 matrix."""
+    if not isinstance(texts, np.ndarray):
+        texts = np.array([t.encode('ascii') for t in texts])
+    return texts.view(np.uint8).reshape(len(texts), -1)
+
+
+def write_rides(path, n, seed=0, first=FIRST_DAY, last=LAST_DAY, zone=ZONE,
+                stations=400, edge_rate=1e-4):
+    """Write ``n`` synthetic rides to a bike_share.csv-compatible file.
+
+    Rides start on or after local midnight of ``first`` and before that of
+    ``last`` in ``zone`` (edge-case rows aside). Returns a dict with the
+    number of ``rows`` and ``bytes`` written and the number of injected
+    rows of each kind in ``EDGE_KINDS``.
+    """
+    model = _RideModel(n, seed, first, last, zone, stations, edge_rate)
+    station_text = _text_table('%d,%s,' % (31000 + i, name) for i, name
+                               in enumerate(model.station_names.tolist()))
+    bike_text = _text_table('W%05d,' % (20000 + i) for i in range(FLEET_SIZE))
+    member_text = _text_table('%s\n' % m for m in MEMBER_TYPES)
+    # Clock times are looked up in a table of all 86400 of them, dates in
+    # a table of the days each block covers
+    clock_text = _text_table(
+        format_timestamps(np.arange(SECONDS_PER_DAY), '%H:%M:%S'))
+
+    # Every field has a fixed width, so a block of rows is a byte matrix
+    columns = np.cumsum([0, 11, 8, 1, 11, 8, 1, station_text.shape[1],
+                         station_text.shape[1], bike_text.shape[1],
+                         member_text.shape[1]])
+    matrix = np.empty((_WRITE_ROWS, columns[-1]), dtype=np.uint8)
+    matrix[:, columns[2]] = matrix[:, columns[5]] = ord(',')
+    written = 0
+    with open(path, 'wb') as f:
+        f.write(CSV_HEADER)
+        written += len(CSV_HEADER)
+        for block in model.blocks():
+            days = {name: block[name] // SECONDS_PER_DAY
+                    for name in ('start', 'end')}
+            first_day = min(int(d.min()) for d in days.values())
+            last_day = max(int(d.max()) for d in days.values())
+            day_text = _text_table(format_timestamps(
+                np.arange(first_day, last_day + 1) * SECONDS_PER_DAY,
+                '%Y-%m-%d '))
+            for i in range(0, len(block['start']), _WRITE_ROWS):
+                rows = slice(i, i + _WRITE_ROWS)
+                m = matrix[:len(block['start'][rows])]
+                for k, name in ((0, 'start'), (3, 'end')):
+                    day = days[name][rows]
+                    m[:, columns[k]:columns[k + 1]] = day_text[day - first_day]
+                    m[:, columns[k + 1]:columns[k + 2]] = clock_text[
+                        block[name][rows] - day * SECONDS_PER_DAY]
+                for k, name in ((6, 'start_station'), (7, 'end_station')):
+                    m[:, columns[k]:columns[k + 1]] = station_text[
+                        block[name][rows]]
+                m[:, columns[8]:columns[9]] = bike_text[block['bike'][rows]]
+                m[:, columns[9]:] = member_text[block['member_type'][rows]]
+                f.write(memoryview(m))
+                written += m.nbytes
+    result = {'rows': n, 'bytes': written}
+    result.update(model.edge_counts)
+    return result
+
+
+def write_start_times(path, n, seed=0, fmt=CSV_FORMAT, **kwargs):
+    """Write the start times of ``n`` synthetic rides, one per line, with
+    ``write_timestamps``. Extra keyword arguments go to ``generate_trips``.
+    Returns the number of bytes written."""
+    written = 0
+    with open(path, 'wb') as f:
+        for table in generate_trips(n, seed, **kwargs):
+            written += write_timestamps(f, table.start, fmt)
+    return written
+
+
+def generate_dates(n, seed=0, first_year=1950, last_year=2017, sort=False):
+    """Yield arrays of ``n`` date ordinals in total, drawn from the years
+    ``first_year..last_year`` with most dates in August to October.
+
+    Dates come in random order, or in date order with ``sort=True``.
+    """
+    first = date(first_year, 1, 1).toordinal()
+    ordinals = np.arange(first, date(last_year + 1, 1, 1).toordinal(),
+                         dtype=np.int32)
+    days = (ordinals - EPOCH_ORDINAL).astype('datetime64[D]')
+    day_of_year = (days - days.astype('datetime64[Y]')).astype(np.int64) + 1
+    weights = (np.exp(-0.5 * ((day_of_year - SEASON_PEAK) / SEASON_SPREAD)
+                      ** 2) + 0.002)
+    weights /= weights.sum()
+    if sort:
+        counts = np.random.default_rng([seed, 3]).multinomial(n, weights)
+        total = np.cumsum(counts)
+        start = 0
+        while start < len(counts):
+            done = total[start - 1] if start else 0
+            stop = int(np.searchsorted(total, done + _BLOCK, side='left')) + 1
+            stop = min(max(stop, start + 1), len(counts))
+            if total[stop - 1] > done:
+                yield np.repeat(ordinals[start:stop], counts[start:stop])
+            start = stop
+        return
+    # Unsorted dates are drawn through a lookup table of 2 ** 18 slots
+    slots = np.floor(np.cumsum(weights) * (1 << 18)).astype(np.intp)
+    table = np.repeat(ordinals, np.diff(np.concatenate([[0], slots])))
+    for i in range(0, n, _BLOCK):
+        rng = np.random.default_rng([seed, 4, i // _BLOCK])
+        yield table[rng.integers(0, len(table), min(_BLOCK, n - i),
+                                 dtype=np.uint32)]
+
+
+def write_date_catalog(path, n, seed=0, **kwargs):
+    """Write ``n`` synthetic event dates to a date catalog at ``path``.
+    Keyword arguments go to ``generate_dates``. Returns the number of
+    dates."""
+    return write_catalog_blocks(path, generate_dates(n, seed, **kwargs))
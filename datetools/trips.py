@@ -0,0 +1,216 @@
+"""Columnar storage for bike trips.
+
+The notebook keeps trips as ``onebike_datetimes``, a list of
+``{'start': datetime, 'end': datetime}`` dicts, and answers every question
+with a ``for trip in ...`` loop. ``TripTable`` holds the same trips as a
+struct of arrays: start and end are int64 wall-clock epoch seconds, and the
+optional station and member columns are stored as small integer codes into a
+label array. Durations, the AM/PM split and filtering are array expressions.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from ._civil import NAT, SECONDS_PER_DAY
+from .parsing import _to_seconds, parse_timestamps
+
+_UNIX_EPOCH = datetime(1970, 1, 1)
+
+# Optional categorical columns, in the order they appear in bike_share.csv
+CATEGORY_COLUMNS = ('start_station', 'end_station', 'member_type')
+
+# bike_share.csv header for each TripTable column
+CSV_COLUMNS = {
+    'start': 'Start date',
+    'end': 'End date',
+    'start_station': 'Start station',
+    'end_station': 'End station',
+    'member_type': 'Member type',
+}
+
+
+def _encode(values):
+    """Return ``(codes, labels)`` for an array of category values."""
+    labels, codes = np.unique(np.asarray(values).astype(str),
+                              return_inverse=True)
+    dtype = np.int8 if len(labels) <= 127 else np.int32
+    return codes.astype(dtype).reshape(-1), labels.astype(object)
+
+
+class TripTable:
+    """Trips as parallel arrays.
+
+    ``start`` and ``end`` are int64 seconds since 1970-01-01 in wall-clock
+    time (no time zone is attached, as in the notebook's naive datetimes).
+    Category columns are passed as arrays of labels and can be read back
+    with ``column(name)``.
+
+    Missing dates (``NaT`` in a frame) are kept as ``NAT`` rather than
+    dropped, so rows stay aligned with their source; the analysis methods
+    mask them out, and so do ``DurationStats``, ``resample`` and
+    ``group_resample`` when given ``durations()``.
+    """
+
+    def __init__(self, start, end, **categories):
+        self.start = np.ascontiguousarray(start, dtype=np.int64)
+        self.end = np.ascontiguousarray(end, dtype=np.int64)
+        if self.start.shape != self.end.shape or self.start.ndim != 1:
+            raise ValueError("start and end must be 1-d arrays of equal length")
+        self._codes = {}
+        self._labels = {}
+        for name, values in categories.items():
+            if name not in CATEGORY_COLUMNS:
+                raise TypeError("unknown column %r" % name)
+            if values is None:
+                continue
+            codes, labels = _encode(values)
+            if len(codes) != len(self.start):
+                raise ValueError("column %r has the wrong length" % name)
+            self._codes[name] = codes
+            self._labels[name] = labels
+
+    @classmethod
+    def _from_codes(cls, start, end, codes, labels):
+        table = cls(start, end)
+        table._codes = codes
+        table._labels = labels
+        return table
+
+    @classmethod
+    def concat(cls, tables):
+        """Stack tables end to end.
+
+        Category columns are kept if every table has them; their labels are
+        merged and the codes renumbered.
+        """
+        tables = list(tables)
+        if not tables:
+            return cls(np.empty(0, np.int64), np.empty(0, np.int64))
+        names = [n for n in tables[0]._codes
+                 if all(n in t._codes for t in tables)]
+        codes = {}
+        labels = {}
+        for name in names:
+            merged = np.unique(np.concatenate(
+                [t._labels[name] for t in tables]).astype(str))
+            dtype = np.int8 if len(merged) <= 127 else np.int32
+            codes[name] = np.concatenate(
+                [np.searchsorted(merged, t._labels[name].astype(str))
+                 [t._codes[name]].astype(dtype) for t in tables])
+            labels[name] = merged.astype(object)
+        return cls._from_codes(np.concatenate([t.start for t in tables]),
+                               np.concatenate([t.end for t in tables]),
+                               codes, labels)
+
+    @classmethod
+    def from_records(cls, records):
+        """Build a table from the notebook's list of start/end dicts.
+
+        Aware datetimes keep their wall-clock time; the tzinfo is dropped.
+        """
+        n = len(records)
+        start = np.fromiter((_to_seconds(r['start'].replace(tzinfo=None))
+                             for r in records), dtype=np.int64, count=n)
+        end = np.fromiter((_to_seconds(r['end'].replace(tzinfo=None))
+                           for r in records), dtype=np.int64, count=n)
+        return cls(start, end)
+
+    @classmethod
+    def from_strings(cls, pairs, fmt="%Y-%m-%d %H:%M:%S"):
+        """Build a table from ``(start, end)`` string pairs such as
+        ``onebike_datetime_strings``."""
+        starts = [p[0] for p in pairs]
+        ends = [p[1] for p in pairs]
+        return cls(parse_timestamps(starts, fmt), parse_timestamps(ends, fmt))
+
+    @classmethod
+    def from_frame(cls, frame):
+        """Build a table from a bike_share.csv DataFrame (or chunk)."""
+        def seconds(column):
+            return frame[column].to_numpy().astype('datetime64[s]') \
+                .astype(np.int64)
+        categories = {name: frame[column].to_numpy()
+                      for name, column in CSV_COLUMNS.items()
+                      if name in CATEGORY_COLUMNS and column in frame}
+        return cls(seconds('Start date'), seconds('End date'), **categories)
+
+    def to_records(self):
+        """Return the notebook's ``[{'start': ..., 'end': ...}]`` form."""
+        return [{'start': _UNIX_EPOCH + timedelta(seconds=s),
+                 'end': _UNIX_EPOCH + timedelta(seconds=e)}
+                for s, e in zip(self.start.tolist(), self.end.tolist())]
+
+    def __len__(self):
+        return len(self.start)
+
+    def __repr__(self):
+        columns = ', '.join(('start', 'end') + tuple(self._codes))
+        return '<TripTable: %d trips (%s)>' % (len(self), columns)
+
+    def __getitem__(self, index):
+        """Slice, boolean mask or integer index array -> new TripTable."""
+        if isinstance(index, (int, np.integer)):
+            index = slice(index, index + 1 if index != -1 else None)
+        return self._from_codes(
+            self.start[index], self.end[index],
+            {name: codes[index] for name, codes in self._codes.items()},
+            dict(self._labels))
+
+    def filter(self, mask):
+        """Return the trips where ``mask`` is True."""
+        return self[np.asarray(mask, dtype=bool)]
+
+    @property
+    def columns(self):
+        return ('start', 'end') + tuple(self._codes)
+
+    @property
+    def nbytes(self):
+        return (self.start.nbytes + self.end.nbytes
+                + sum(c.nbytes for c in self._codes.values()))
+
+    def codes(self, name):
+        """Integer codes and labels of a category column."""
+        return self._codes[name], self._labels[name]
+
+    def column(self, name):
+        """Values of a column; category columns come back as labels."""
+        if name in ('start', 'end'):
+            return getattr(self, name)
+        return self._labels[name][self._codes[name]]
+
+    def missing(self):
+        """True where the start or end is ``NAT``."""
+        return (self.start == NAT) | (self.end == NAT)
+
+    def durations(self):
+        """Seconds from start to end of each trip (wall-clock difference);
+        ``NAT`` where either end is missing."""
+        duration = self.end - self.start
+        missing = self.missing()
+        if missing.any():
+            duration[missing] = NAT
+        return duration
+
+    def start_hours(self):
+        """Hour of day (0-23) each trip started; -1 where it is missing."""
+        hours = (self.start % SECONDS_PER_DAY) // 3600
+        hours[self.start == NAT] = -1
+        return hours
+
+    def am_pm_counts(self):
+        """The notebook's ``trip_counts``: trips starting before/after noon.
+
+        Trips with a missing start or end are not counted, as in
+        ``RideSummary``.
+        """
+        hours = self.start_hours()[~self.missing()]
+        am = int(np.count_nonzero(hours < 12))
+        return {'AM': am, 'PM': len(hours) - am}
+
+    def is_joyride(self):
+        """True where the trip ended at the station it started from."""
+        start_codes, start_labels = self.codes('start_station')
+        end_codes, end_labels = self.codes('end_station')
+        return start_labels[start_codes] == end_labels[end_codes]
@@ -0,0 +1,381 @@
+"""Time-zone offset tables compiled from tzdata.
+
+``dateutil`` resolves ``utcoffset()`` one datetime at a time. A
+``ZoneTable`` holds a zone's whole history as sorted arrays -- the UTC
+instants at which the offset changes and the offset, DST flag and
+abbreviation in force from each of them -- so the offsets for an entire
+array of instants come from one ``np.searchsorted``. The same transitions
+expressed in wall-clock time give the reverse lookup, so whole arrays can
+be localized (wall time to UTC) and converted between zones.
+
+Tables are compiled from the binary TZif files that ``zoneinfo`` and
+``dateutil`` also read (``zoneinfo.TZPATH``, then the ``tzdata`` package).
+Transitions beyond the last one listed in the file are generated from the
+file's POSIX TZ footer up to ``HORIZON_YEAR``.
+"""
+
+import os
+import re
+import struct
+import zoneinfo
+from datetime import timedelta, timezone
+
+import numpy as np
+
+from ._civil import (SECONDS_PER_DAY, as_seconds, civil_from_days,
+                     days_from_civil, days_in_month)
+from .instrument import instrumented
+
+# Footer rules are expanded up to the end of this year
+HORIZON_YEAR = 2100
+
+# Before the first transition; far enough that searchsorted never sees it
+_MIN_INSTANT = np.iinfo(np.int64).min // 2
+
+
+class ZoneTable:
+    """A compiled time zone.
+
+    ``transitions[i]`` is the UTC instant (epoch seconds) from which
+    ``offsets[i]``, ``is_dst[i]`` and ``abbrevs[abbr_codes[i]]`` apply; the
+    first entry is a sentinel covering all earlier time. ``key`` is the
+    tzdata zone the table was compiled from, or None for fixed offsets and
+    other tables whose ``name`` is only a label (``'CET'`` from a
+    ``tzname()`` is not the tzdata zone ``CET``).
+    """
+
+    def __init__(self, name, transitions, offsets, is_dst, abbr_codes, abbrevs,
+                 key=None):
+        self.name = name
+        self.key = key
+        self.transitions = np.asarray(transitions, dtype=np.int64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.is_dst = np.asarray(is_dst, dtype=bool)
+        self.abbr_codes = np.asarray(abbr_codes, dtype=np.int16)
+        self.abbrevs = np.asarray(abbrevs, dtype=object)
+
+    def __repr__(self):
+        return '<ZoneTable %s: %d transitions>' % (self.name,
+                                                    len(self.transitions) - 1)
+
+    def __reduce__(self):
+        return (ZoneTable, (self.name, self.transitions, self.offsets,
+                            self.is_dst, self.abbr_codes, self.abbrevs,
+                            self.key))
+
+    def _index(self, utc):
+        return np.searchsorted(self.transitions, as_seconds(utc),
+                               side='right') - 1
+
+    def utc_offsets(self, utc):
+        """UTC offset in seconds in force at each UTC epoch second."""
+        return self.offsets[self._index(utc)]
+
+    def to_local(self, utc):
+        """Wall-clock epoch seconds for UTC epoch seconds."""
+        utc = as_seconds(utc)
+        return utc + self.utc_offsets(utc)
+
+    def abbreviations(self, utc):
+        """Zone abbreviation (``'EST'``, ``'EDT'``, ...) at each instant."""
+        return self.abbrevs[self.abbr_codes[self._index(utc)]]
+
+    def wall_transitions(self, fold=0):
+        """Transition times in wall-clock seconds, for looking up wall times.
+
+        Each transition is placed at the later (``fold=0``) or earlier
+        (``fold=1``) of the two wall times it happens at, which gives the
+        PEP 495 reading also used by ``zoneinfo``: a repeated wall time
+        resolves to its first or second occurrence, and a skipped one is
+        read with the offset before (``fold=0``) or after (``fold=1``) the
+        change.
+        """
+        cache = self.__dict__.setdefault('_wall_cache', {})
+        if fold not in cache:
+            before = np.concatenate([self.offsets[:1], self.offsets[:-1]])
+            pick = np.minimum if fold else np.maximum
+            wall = self.transitions + pick(before, self.offsets)
+            wall[0] = self.transitions[0]
+            cache[fold] = wall
+        return cache[fold]
+
+    def _wall_index(self, wall, fold):
+        wall = as_seconds(wall)
+        if np.ndim(fold) == 0:
+            return np.searchsorted(self.wall_transitions(int(bool(fold))),
+                                   wall, side='right') - 1
+        return np.where(np.asarray(fold, dtype=bool),
+                        self._wall_index(wall, 1), self._wall_index(wall, 0))
+
+    def wall_offsets(self, wall, fold=0):
+        """UTC offset for each wall-clock epoch second in this zone."""
+        return self.offsets[self._wall_index(wall, fold)]
+
+    def to_utc(self, wall, fold=0):
+        """UTC epoch seconds for wall-clock epoch seconds in this zone.
+
+        ``fold`` (a scalar or an array) picks the first (0) or second (1)
+        occurrence of a repeated wall time, like ``datetime.fold``.
+        """
+        wall = as_seconds(wall)
+        return wall - self.wall_offsets(wall, fold)
+
+
+def fixed_zone(offset, name=None):
+    """A ``ZoneTable`` with a single fixed offset (seconds or timedelta)."""
+    if isinstance(offset, timedelta):
+        offset = offset // timedelta(seconds=1)
+    if name is None:
+        name = str(timezone(timedelta(seconds=offset)))
+    return ZoneTable(name, [_MIN_INSTANT], [offset], [False], [0], [name])
+
+
+def get_zone(zone):
+    """Return a ``ZoneTable`` for an IANA name, a ``ZoneTable``, a
+    ``zoneinfo``/``dateutil.tz.gettz`` zone, or a fixed-offset ``tzinfo``
+    such as ``timezone(timedelta(hours=-4))``."""
+    if isinstance(zone, ZoneTable):
+        return zone
+    if isinstance(zone, str):
+        return compile_zone(zone)
+    if zone is not None:
+        key = getattr(zone, 'key', None) or _dateutil_key(zone)
+        if key:
+            return compile_zone(key)
+        offset = zone.utcoffset(None)
+        if offset is not None:
+            return fixed_zone(offset, zone.tzname(None))
+    raise TypeError("cannot build a zone table from %r" % (zone,))
+
+
+def _dateutil_key(zone):
+    """Zone name behind a ``dateutil.tz.gettz()`` object, if it has one."""
+    filename = getattr(zone, '_filename', None)
+    if not isinstance(filename, str):
+        return None
+    for root in zoneinfo.TZPATH:
+        if filename.startswith(root + os.sep):
+            return filename[len(root) + 1:]
+    return filename if not os.path.isabs(filename) else None
+
+
+# -- TZif files ----------------------------------------------------------
+
+def _find_tzfile(name):
+    if os.path.isabs(name) or '..' in name.split('/'):
+        raise ValueError("invalid zone name %r" % name)
+    for root in zoneinfo.TZPATH:
+        path = os.path.join(root, name)
+        if os.path.isfile(path):
+            with open(path, 'rb') as f:
+                return f.read()
+    try:
+        from importlib import resources
+        package, _, resource = ('tzdata.zoneinfo/' + name).rpartition('/')
+        return resources.files(package.replace('/', '.')) \
+            .joinpath(resource).read_bytes()
+    except (ImportError, FileNotFoundError, ModuleNotFoundError):
+        raise zoneinfo.ZoneInfoNotFoundError("no time zone found with key %s"
+                                             % name) from None
+
+
+_TZIF_HEADER = struct.Struct('>4sc15x6l')
+
+
+def _read_tzif(data):
+    """Parse TZif bytes into ``(transitions, type_idx, types, abbrs, footer)``."""
+    magic, version, *counts = _TZIF_HEADER.unpack_from(data)
+    if magic != b'TZif':
+        raise ValueError("not a TZif file")
+    isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = counts
+    pos = _TZIF_HEADER.size
+    time_size = 4
+    if version >= b'2':
+        # Skip the 32-bit block and read the 64-bit one that follows
+        pos += (timecnt * 5 + typecnt * 6 + charcnt + leapcnt * 8
+                + isstdcnt + isutcnt)
+        magic, version, *counts = _TZIF_HEADER.unpack_from(data, pos)
+        isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = counts
+        pos += _TZIF_HEADER.size
+        time_size = 8
+
+    transitions = np.frombuffer(data, dtype='>i%d' % time_size, count=timecnt,
+                                offset=pos).astype(np.int64)
+    pos += timecnt * time_size
+    type_idx = np.frombuffer(data, dtype=np.uint8, count=timecnt, offset=pos)
+    pos += timecnt
+    types = [struct.unpack_from('>lBB', data, pos + 6 * i)
+             for i in range(typecnt)]
+    pos += typecnt * 6
+    chars = data[pos:pos + charcnt]
+    pos += charcnt + leapcnt * (time_size + 4) + isstdcnt + isutcnt
+
+    def abbr(index):
+        return chars[index:chars.index(b'\0', index)].decode('ascii')
+
+    abbrs = [abbr(t[2]) for t in types]
+    footer = ''
+    if time_size == 8:
+        rest = data[pos:].split(b'\n')
+        if len(rest) >= 2:
+            footer = rest[1].decode('ascii')
+    return transitions, type_idx.astype(np.int64), types, abbrs, footer
+
+
+# -- POSIX TZ footers ----------------------------------------------------
+
+_NAME = r'(<[^>]*>|[A-Za-z]{3,})'
+_OFFSET = r'([+-]?\d{1,3}(?::\d{1,2}){0,2})'
+_FOOTER = re.compile(r'^%s%s(?:%s%s?)?(?:,([^,]+),([^,]+))?$'
+                     % (_NAME, _OFFSET, _NAME, _OFFSET))
+
+
+def _hms(text):
+    sign = -1 if text.startswith('-') else 1
+    parts = [int(p) for p in text.lstrip('+-').split(':')]
+    parts += [0] * (3 - len(parts))
+    return sign * (parts[0] * 3600 + parts[1] * 60 + parts[2])
+
+
+def _parse_rule(rule):
+    """``'M3.2.0/2'`` -> (kind, a, b, c, seconds after local midnight)."""
+    date_part, _, time_part = rule.partition('/')
+    seconds = _hms(time_part) if time_part else 7200
+    if date_part.startswith('M'):
+        month, week, weekday = (int(x) for x in date_part[1:].split('.'))
+        return ('M', month, week, weekday, seconds)
+    if date_part.startswith('J'):
+        return ('J', int(date_part[1:]), 0, 0, seconds)
+    return ('N', int(date_part), 0, 0, seconds)
+
+
+def _rule_day(rule, year):
+    """Days since 1970-01-01 of the rule's date in ``year``."""
+    kind, a, b, c, _ = rule
+    jan1 = int(days_from_civil(year, 1, 1))
+    if kind == 'J':
+        leap = int(days_in_month(year, 2)) == 29
+        return jan1 + a - 1 + (1 if leap and a >= 60 else 0)
+    if kind == 'N':
+        return jan1 + a
+    first = int(days_from_civil(year, a, 1))
+    weekday_first = (first + 4) % 7          # 1970-01-01 was a Thursday
+    day = first + (c - weekday_first) % 7 + 7 * (b - 1)
+    while day - first >= int(days_in_month(year, a)):
+        day -= 7
+    return day
+
+
+def _parse_footer(footer):
+    """Return ``(std, dst, start_rule, end_rule)``; dst parts may be None.
+
+    ``std`` and ``dst`` are ``(utc_offset_seconds, abbreviation)``.
+    """
+    match = _FOOTER.match(footer)
+    if match is None:
+        raise ValueError("unsupported TZ footer %r" % footer)
+    std_name, std_off, dst_name, dst_off, start, end = match.groups()
+    # POSIX offsets are west-positive
+    std = (-_hms(std_off), std_name.strip('<>'))
+    if dst_name is None:
+        return std, None, None, None
+    dst = (-_hms(dst_off) if dst_off else std[0] + 3600, dst_name.strip('<>'))
+    if start is None:
+        start, end = 'M3.2.0', 'M11.1.0'
+    return std, dst, _parse_rule(start), _parse_rule(end)
+
+
+def _footer_transitions(footer, first_year, last_year):
+    """Yield ``(utc_instant, offset, is_dst, abbr)`` from a TZ footer."""
+    std, dst, start, end = _parse_footer(footer)
+    out = []
+    if dst is None:
+        return out
+    for year in range(first_year, last_year + 1):
+        # DST starts at a wall time in standard time and ends at a wall
+        # time in daylight time
+        on = _rule_day(start, year) * SECONDS_PER_DAY + start[4] - std[0]
+        off = _rule_day(end, year) * SECONDS_PER_DAY + end[4] - dst[0]
+        out.append((on, dst[0], True, dst[1]))
+        out.append((off, std[0], False, std[1]))
+    out.sort()
+    return out
+
+
+def _civil_year(utc):
+    return int(civil_from_days(utc // SECONDS_PER_DAY)[0])
+
+
+def compile_zone(name, horizon_year=HORIZON_YEAR):
+    """The ``ZoneTable`` for the tzdata zone ``name``.
+
+    Tables up to the default horizon come from the process-wide
+    ``registry.ZoneRegistry``, which compiles each zone once; other
+    horizons are compiled afresh on every call.
+    """
+    if horizon_year == HORIZON_YEAR:
+        from .registry import default_registry
+        return default_registry().get(name)
+    return _compile_zone(name, horizon_year)
+
+
+def _compile_zone(name, horizon_year=HORIZON_YEAR):
+    """Compile the tzdata zone ``name`` into a ``ZoneTable``."""
+    if name.upper() in ('UTC', 'Z'):
+        return fixed_zone(0, 'UTC')
+    transitions, type_idx, types, abbrs, footer = _read_tzif(_find_tzfile(name))
+
+    # Before the first transition the first non-DST type applies
+    first = next((i for i, t in enumerate(types) if not t[1]), 0)
+    rows = [(_MIN_INSTANT, types[first][0], bool(types[first][1]),
+             abbrs[first])]
+    rows += [(int(t), types[i][0], bool(types[i][1]), abbrs[i])
+             for t, i in zip(transitions.tolist(), type_idx.tolist())]
+
+    if footer:
+        # Zones without DST rules already end on their final type
+        last = rows[-1][0]
+        start_year = 1970 if last == _MIN_INSTANT else _civil_year(last)
+        rows += [row for row in
+                 _footer_transitions(footer, start_year, horizon_year)
+                 if row[0] > last]
+
+    abbrevs = sorted({r[3] for r in rows})
+    codes = {a: i for i, a in enumerate(abbrevs)}
+    return ZoneTable(name,
+                     [r[0] for r in rows],
+                     [r[1] for r in rows],
+                     [r[2] for r in rows],
+                     [codes[r[3]] for r in rows],
+                     abbrevs, key=name)
+
+
+def available_zones():
+    """Names of every zone in the installed tzdata."""
+    return sorted(zoneinfo.available_timezones())
+
+
+def compile_all(names=None):
+    """Compile every zone in ``names`` or in tzdata (only the registry's
+    most recently used zones stay cached)."""
+    return {name: compile_zone(name) for name in names or available_zones()}
+
+
+@instrumented('localize')
+def localize(wall, zone, fold=0):
+    """UTC epoch seconds for wall-clock seconds in ``zone``."""
+    return get_zone(zone).to_utc(wall, fold)
+
+
+@instrumented('to_local')
+def to_local(utc, zone):
+    """Wall-clock seconds in ``zone`` for UTC epoch seconds."""
+    return get_zone(zone).to_local(utc)
+
+
+@instrumented('convert')
+def convert(wall, from_zone, to_zone, fold=0):
+    """Re-express wall-clock seconds in ``from_zone`` as wall-clock seconds
+    in ``to_zone`` -- the array form of ``.replace(tzinfo=a).astimezone(b)``.
+    """
+    return get_zone(to_zone).to_local(get_zone(from_zone).to_utc(wall, fold))